@@ -1,16 +1,19 @@
 import abc
-import copy
 import gc
 import time
-from typing import Any, Callable, Union, Dict, Tuple, Iterable
+from functools import partial
+from typing import Any, Callable, Union, Dict, Tuple, Iterable, List, Sequence
 
 import gym
 import joblib
 import numpy as np
 
+from rlk.agents.components.evaluation.async_evaluator import AsyncEvaluator
 from rlk.agents.components.helpers.env_builder import EnvBuilder
+from rlk.agents.components.helpers.scheduler import Scheduler
 from rlk.agents.components.helpers.tqdm_handler import TQDMHandler
 from rlk.agents.components.history.episode_report import EpisodeReport
+from rlk.agents.components.history.metrics_sink import MetricsSink
 from rlk.agents.components.history.training_history import TrainingHistory
 
 
@@ -28,40 +31,85 @@ class AgentBase(abc.ABC):
 
     training_history: TrainingHistory
     _tqdm = TQDMHandler()
+    # Attributes that can't be pickled with the agent, see ._pickle_compatible_getstate
+    _unpicklable: Tuple[str, ...] = ()
 
     @property
     def env(self) -> gym.Env:
         return self.env_builder.env
 
+    def __getattr__(self, name: str) -> Any:
+        """
+        Materialize attributes set with ._set_lazy on first access. Only called if normal lookup fails.
+
+        Normal lookup also fails if a property raises an AttributeError internally (eg. .env with no env_builder). In
+        that case the property is called again so the original error is raised, rather than a generic missing attribute.
+        """
+        lazy_loaders = self.__dict__.get('_lazy_loaders', {})
+        if name in lazy_loaders:
+            value = lazy_loaders[name]()
+            del lazy_loaders[name]
+            setattr(self, name, value)
+            return value
+
+        descriptor = getattr(type(self), name, None)
+        if isinstance(descriptor, property):
+            return descriptor.fget(self)
+
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def _set_lazy(self, name: str, loader: Callable[[], Any]) -> None:
+        """Set an attribute to be loaded by calling loader when it's first accessed, eg. when loading checkpoints."""
+        self.__dict__.pop(name, None)
+        self.__dict__.setdefault('_lazy_loaders', {})[name] = loader
+
     def _pickle_compatible_getstate(self) -> Dict[str, Any]:
         """
-        Prepare agent with a keras model object for pickling.
+        Get the state to pickle, without deep copying, modifying this object, or writing anything to disk.
 
-        Calls .unready to prepare this object for pickling, and .check_ready to put it back how it was after pickling.
-        In addition to what's defined in the unready method, it avoids trying to copy the env. We can't copy this,
-        but we also don't want to make a new one (like we can with the models). This would cause a new render window
-        per episode...
+        Components define their own pickle state where they need to, for example EnvBuilder excludes the env, which is
+        rebuilt from the spec when next accessed. Attributes listed in ._unpicklable, such as compiled Keras models, are
+        replaced by their picklable state from ._get_unpicklable_state (eg. the current weights as arrays), which are
+        pickled as references rather than copied. The returned state is marked as unready, and .check_ready rebuilds
+        them from that state after unpickling. If the agent isn't ready, they were saved by .unready and .check_ready
+        reloads them from there.
 
-        The default unready method in AgentBase does nothing. The GPU models should modify .unready and .check_ready to
-        handle complied Keras, which also can't be pickled.
+        The returned dict is a shallow copy of __dict__, so getting it doesn't duplicate the history, epsilon, etc. in
+        memory, and the models and env in use aren't touched.
 
         Object that need to use this should implement their own __getstate__:
         def __getstate__(self) -> Dict[str, Any]:
             return self._pickle_compatible_getstate()
-        It's not implemented in AgentBase as the standard __getstate__ is required by the deepcopy below.
         """
+        object_state_dict = dict(self.__dict__)
+        object_state_dict.pop('_lazy_loaders', None)
+        if getattr(self, 'ready', False):
+            object_state_dict['_unpicklable_state'] = self._get_unpicklable_state()
+        object_state_dict.update({k: None for k in self._unpicklable})
+        object_state_dict['ready'] = False
 
-        # Remove things
-        self.unready()
+        return object_state_dict
 
-        # Get object spec to pickle, everything left except env_builder references
-        # This is dodgy. Can end up with recursion errors depending on how deepcopy behaves...
-        object_state_dict = copy.deepcopy({k: v for k, v in self.__dict__.items()})
+    def _get_unpicklable_state(self) -> Dict[str, Any]:
+        """Picklable state of the attributes in ._unpicklable, eg. model weights. Default nothing to pickle."""
+        return {}
 
-        # Put this object back how it was
-        self.check_ready()
+    def _set_unpicklable_state(self, state: Dict[str, Any]) -> None:
+        """Rebuild the attributes in ._unpicklable from the state from ._get_unpicklable_state."""
+        pass
 
-        return object_state_dict
+    def _restore_unpicklable(self) -> bool:
+        """
+        Rebuild the ._unpicklable attributes from the state pickled with the agent, if there is one.
+
+        :return: True if restored. False if the agent was pickled when unready, so they should be loaded from disk.
+        """
+        state = self.__dict__.pop('_unpicklable_state', None)
+        if state is None:
+            return False
+
+        self._set_unpicklable_state(state)
+        return True
 
     def check_ready(self) -> None:
         """
@@ -70,13 +118,12 @@ class AgentBase(abc.ABC):
         If super is used, should be at end of overloading method.
 
         Default implementation:
-         - Check _env is set (most models?)
+         - Set a new env builder, the env itself is built when first accessed
         Example of other model specific steps that might need doing:
          - For Keras models, check model is ready, for example if it needs recompiling after loading.
         """
         self.env_builder = EnvBuilder(env_spec=self.env_spec, env_wrappers=self.env_wrappers,
                                       env_kwargs=self.env_kwargs, **self.env_builder_kwargs)
-        self.env_builder.set_env()
         self.ready = True
         gc.collect()
 
@@ -87,7 +134,7 @@ class AgentBase(abc.ABC):
         If super is used, should be at end of overloading method.
         """
         if self.env_builder is not None:
-            self.env_builder.env.close()
+            self.env_builder.close()
             self.env_builder = None
         self.ready = False
         gc.collect()
@@ -140,6 +187,14 @@ class AgentBase(abc.ABC):
         """
         pass
 
+    def get_actions(self, ss: Sequence[Any], training: bool = False) -> np.ndarray:
+        """
+        Get an action for each of a batch of states, eg. one from each env of a vector env.
+
+        Default calls .get_action for each state. Agents with models override this to predict the batch in one call.
+        """
+        return np.array([self.get_action(s, training=training) for s in ss])
+
     @abc.abstractmethod
     def _play_episode(self, max_episode_steps: int = 500,
                       training: bool = False, render: bool = True) -> Tuple[float, int]:
@@ -172,8 +227,59 @@ class AgentBase(abc.ABC):
                              time_taken=np.round(t1 - t0, 3),
                              epsilon_used=getattr(self, 'eps', None))
 
+    def play_vector_episodes(self, vector_env: gym.vector.VectorEnv, n_episodes_per_env: int = 1,
+                             max_episode_steps: int = 500) -> List[EpisodeReport]:
+        """
+        Play greedy episodes on all the envs of a vector env (eg. RemoteVectorEnv) at once, eg. for evaluation.
+
+        Each step, the actions for all envs are picked together with .get_actions. Experience isn't used for training,
+        as agent buffers expect consecutive steps to be from the same env.
+
+        :param vector_env: Vector env, which resets envs when they're done (as gym's vector envs and RemoteVectorEnv).
+        :param n_episodes_per_env: Number of episodes to play in each env. Each env plays the same number, so short
+                                   episodes aren't over represented.
+        :param max_episode_steps: Maximum steps per episode. Vector envs with .set_max_episode_steps (eg.
+                                  RemoteVectorEnv) end episodes there themselves. Otherwise episodes are cut here, and
+                                  the rest of the cut episode is stepped through (and ignored) until the env resets.
+        :return: Reports of the episodes, in the order they finished.
+        """
+        n_envs = vector_env.num_envs
+        if hasattr(vector_env, 'set_max_episode_steps'):
+            vector_env.set_max_episode_steps(max_episode_steps)
+        total_rewards = np.zeros(n_envs)
+        frames = np.zeros(n_envs, dtype=np.int64)
+        n_finished = np.zeros(n_envs, dtype=np.int64)
+        # Envs with an episode that was cut at max_episode_steps, until they reset
+        cut = np.zeros(n_envs, dtype=bool)
+        t0 = np.full(n_envs, time.time())
+
+        episode_reports = []
+        obs = vector_env.reset()
+        while np.any(n_finished < n_episodes_per_env):
+            obs, rewards, dones, _ = vector_env.step(self.get_actions(obs, training=False))
+            dones = np.asarray(dones, dtype=bool)
+            total_rewards += rewards
+            frames += 1
+
+            t1 = time.time()
+            ended = ~cut & (dones | (frames >= max_episode_steps))
+            for env_i in np.flatnonzero(ended):
+                if n_finished[env_i] < n_episodes_per_env:
+                    # Reported frames is the index of the last frame, as for .play_episode
+                    episode_reports.append(EpisodeReport(total_reward=float(total_rewards[env_i]),
+                                                         frames=int(frames[env_i]) - 1,
+                                                         time_taken=np.round(t1 - t0[env_i], 3)))
+                n_finished[env_i] += 1
+
+            cut = (cut | ended) & ~dones
+            total_rewards[dones], frames[dones], t0[dones] = 0, 0, t1
+
+        return episode_reports
+
     def train(self, n_episodes: int = 10000, max_episode_steps: int = 500, verbose: bool = True, render: bool = True,
-              checkpoint_every: Union[bool, int] = 0, update_every: Union[bool, int] = 1) -> None:
+              checkpoint_every: Union[bool, int] = 0, update_every: Union[bool, int] = 1,
+              evaluator: Union[None, AsyncEvaluator] = None, evaluate_every: Union[bool, int] = 0,
+              metrics_sink: Union[None, MetricsSink] = None) -> None:
         """
         Run the default training loop
 
@@ -183,12 +289,17 @@ class AgentBase(abc.ABC):
         :param render: Bool to indicate whether or not to call env.render() each training step.
         :param checkpoint_every: Save the model every n steps while training. Set to 0 or false to turn off.
         :param update_every: Run the _after_episode_update() step every n episodes.
+        :param evaluator: A started AsyncEvaluator to send weight snapshots to. Finished evaluations are added to the
+                          training history as they become available. Optional.
+        :param evaluate_every: Send a weight snapshot to the evaluator every n episodes. Set to 0 or false to turn off.
+        :param metrics_sink: A started MetricsSink to send episode reports to. If set, printing and plotting is handled
+                             by the sink in the background rather than by the training history. Optional.
         """
         self._tqdm.set_tqdm(verbose)
 
         for ep in self._tqdm.tqdm_runner(range(n_episodes)):
             episode_report = self.play_episode(max_episode_steps=max_episode_steps, training=True, render=render)
-            self._update_history(episode_report, verbose)
+            self._update_history(episode_report, verbose, metrics_sink=metrics_sink)
 
             if (update_every > 0) and not (ep % update_every):
                 # Run the after-episode update step
@@ -197,6 +308,90 @@ class AgentBase(abc.ABC):
             if (checkpoint_every > 0) and (ep > 0) and (not ep % checkpoint_every):
                 self.save()
 
+            if evaluator is not None:
+                if (evaluate_every > 0) and not (ep % evaluate_every):
+                    evaluator.submit(self.get_weights(), trained_frames=self.training_history.total_frames)
+                evaluator.collect(self.training_history)
+
+        self.training_history.close_log()
+
+    def train_steps(self, total_frames: int = 100000, max_episode_steps: int = 500, verbose: bool = True,
+                    render: bool = False, schedule: Union[None, Dict[str, Dict[str, float]]] = None,
+                    metrics_sink: Union[None, MetricsSink] = None) -> Scheduler:
+        """
+        Run a training loop with a budget of frames rather than episodes.
+
+        Periodic tasks are run by a Scheduler on frame count and/or wall-clock triggers, rather than every n episodes.
+        This keeps their cadence comparable across envs where episode lengths are very different. Available tasks are:
+         - 'update': Run the _after_episode_update() step (eg. target model sync for DQN, MC update for REINFORCE).
+         - 'checkpoint': Save the agent.
+         - 'evaluate': Play a greedy episode and add the result to the training history evaluations.
+         - 'history': Print the last episode and plot the training history (depending on it's own settings).
+
+        Triggers are checked after each episode, so tasks run at the end of the first episode after they become due.
+
+        Eg.
+        >>> agent.train_steps(total_frames=1000000,
+        >>>                   schedule={'update': {'every_frames': 10000}, 'checkpoint': {'every_seconds': 1800},
+        >>>                             'evaluate': {'every_frames': 50000}, 'history': {'every_seconds': 30}})
+
+        :param total_frames: Number of frames to train for. The final episode is shortened to fit.
+        :param max_episode_steps: Max steps before stopping, overrides any time limit set by Gym.
+        :param verbose: If False, the 'history' task doesn't print or plot.
+        :param render: Bool to indicate whether or not to call env.render() each training step.
+        :param schedule: Dict of task name -> trigger kwargs ('every_frames' and/or 'every_seconds', 0 is off). Tasks
+                         not included aren't run. Default runs 'update' and 'history' after every episode ('history'
+                         is left out if metrics_sink is set).
+        :param metrics_sink: A started MetricsSink to send episode reports to, as in .train. Optional.
+        :return: The Scheduler used, .costs contains the time spent on each task and playing episodes.
+        """
+        if schedule is None:
+            schedule = {'update': {'every_frames': 1}}
+            if metrics_sink is None:
+                schedule['history'] = {'every_frames': 1}
+
+        callbacks = self._scheduled_callbacks(max_episode_steps=max_episode_steps, verbose=verbose)
+        scheduler = Scheduler()
+        for name, trigger in schedule.items():
+            if name not in callbacks:
+                raise ValueError(f"Unknown scheduled task {name}. Pick from {tuple(callbacks.keys())}.")
+            scheduler.add(name, callbacks[name], **trigger)
+
+        while scheduler.frame < total_frames:
+            episode_report = self.play_episode(max_episode_steps=min(max_episode_steps, total_frames - scheduler.frame),
+                                               training=True, render=render)
+            # Printing and plotting are scheduled tasks here, so only the sink (if set) reports every episode
+            self._update_history(episode_report, verbose=False, metrics_sink=metrics_sink)
+            scheduler.log_cost('play_episode', episode_report.time_taken)
+
+            # Reported frames is the index of the last frame
+            scheduler.advance(n_frames=episode_report.frames + 1)
+
+        self.training_history.close_log()
+
+        return scheduler
+
+    def _scheduled_callbacks(self, max_episode_steps: int = 500, verbose: bool = True) -> Dict[str, Callable[[], Any]]:
+        """Tasks that can be run by the scheduler in .train_steps."""
+        return {'update': self._after_episode_update,
+                'checkpoint': self.save,
+                'evaluate': partial(self._evaluate, max_episode_steps=max_episode_steps),
+                'history': partial(self._flush_history, verbose=verbose)}
+
+    def _evaluate(self, max_episode_steps: int = 500) -> EpisodeReport:
+        """Play a greedy episode and add it to the training history evaluations."""
+        episode_report = self.play_episode(max_episode_steps=max_episode_steps, training=False, render=False)
+        self.training_history.append_evaluation(episode_report, trained_frames=self.training_history.total_frames)
+
+        return episode_report
+
+    def _flush_history(self, verbose: bool = True) -> None:
+        """Print the last episode and plot the training history, if turned on in history settings."""
+        if verbose and (self.training_history.n_episodes > 0):
+            print(f"{self.name}: {self.training_history.history[-1]}")
+            if self.training_history.plotting_on:
+                self.training_history.plot(metrics=["total_reward", "frames"])
+
     def _after_episode_update(self) -> None:
         """
         Run an update step after an episode completes.
@@ -215,17 +410,21 @@ class AgentBase(abc.ABC):
         """
         pass
 
-    def _update_history(self, episode_report: EpisodeReport, verbose: bool = True) -> None:
+    def _update_history(self, episode_report: EpisodeReport, verbose: bool = True,
+                        metrics_sink: Union[None, MetricsSink] = None) -> None:
         """
         Add an episodes reward to history and maybe plot depending on history settings.
 
         :param episode_report: Episode report to add to history.
         :param verbose: If verbose, print the last episode and run the history plot. The history plot will display
                         depending on it's own settings. Verbose = False will turn it off totally.
+        :param metrics_sink: If set, the episode report is sent to this instead of printing and plotting here.
         """
         self.training_history.append(episode_report)
 
-        if verbose:
+        if metrics_sink is not None:
+            metrics_sink.put(episode_report)
+        elif verbose:
             print(f"{self.name}: {episode_report}")
             self.training_history.training_plot()
 
@@ -0,0 +1,150 @@
+import multiprocessing as mp
+import queue
+from typing import Any, Callable, Dict, Union
+
+from rlk.agents.components.history.training_history import TrainingHistory
+
+
+def _evaluation_worker(agent_class: Callable, agent_config: Dict[str, Any], n_episodes: int, max_episode_steps: int,
+                       gpu_memory: int, snapshots: mp.Queue, results: mp.Queue) -> None:
+    """
+    Build a separate copy of the agent (with its own env), then play greedy episodes for each weight snapshot received.
+
+    Runs until a None snapshot is received, then puts a None result to indicate it's finished.
+    """
+    from rlk.agents.components.helpers.virtual_gpu import VirtualGPU
+
+    VirtualGPU(gpu_memory)
+    agent = agent_class(**agent_config)
+
+    while True:
+        snapshot = snapshots.get()
+        if snapshot is None:
+            break
+
+        weights, trained_frames = snapshot
+        agent.set_weights(weights)
+        for _ in range(n_episodes):
+            episode_report = agent.play_episode(max_episode_steps=max_episode_steps, training=False, render=False)
+            results.put((trained_frames, episode_report))
+
+    agent.env.close()
+    results.put(None)
+
+
+class AsyncEvaluator:
+    """
+    Evaluates snapshots of an agent's weights in a separate process, without pausing training.
+
+    The worker process builds its own agent from the config (and so its own env via EnvBuilder), and runs n_episodes
+    greedy episodes each time it receives a set of weights. Results are collected without blocking and added to the
+    evaluations in a TrainingHistory. The agent class must implement .get_weights and .set_weights.
+
+    Snapshots are dropped rather than queued if the worker falls too far behind, so submitting is always cheap.
+
+    Example
+    >>> evaluator = AsyncEvaluator(agent_class=DeepQAgent, agent_config=PongConfig(agent_type='dqn').build())
+    >>> evaluator.start()
+    >>> agent.train(n_episodes=1000, evaluator=evaluator, evaluate_every=20)
+    >>> evaluator.close(agent.training_history)
+    """
+
+    def __init__(self, agent_class: Callable, agent_config: Dict[str, Any], n_episodes: int = 5,
+                 max_episode_steps: int = 500, gpu_memory: int = 256, max_pending: int = 2) -> None:
+        """
+        :param agent_class: Class of agent to evaluate.
+        :param agent_config: Config dict used to build the agent, eg. from ConfigBase.build().
+        :param n_episodes: Number of greedy episodes to play per snapshot.
+        :param max_episode_steps: Max steps per evaluation episode.
+        :param gpu_memory: Memory to allocate to the worker's VirtualGPU, if on GPU.
+        :param max_pending: Max number of snapshots waiting to be evaluated, further snapshots are dropped.
+        """
+        self.agent_class = agent_class
+        self.agent_config = agent_config
+        self.n_episodes = n_episodes
+        self.max_episode_steps = max_episode_steps
+        self.gpu_memory = gpu_memory
+        self.max_pending = max_pending
+
+        # TF isn't fork safe
+        self._context = mp.get_context('spawn')
+        self._snapshots: Union[None, mp.Queue] = None
+        self._results: Union[None, mp.Queue] = None
+        self._process: Union[None, mp.Process] = None
+        self.n_dropped: int = 0
+
+    @property
+    def running(self) -> bool:
+        return (self._process is not None) and self._process.is_alive()
+
+    def start(self) -> None:
+        self._snapshots = self._context.Queue(maxsize=self.max_pending)
+        self._results = self._context.Queue()
+        self._process = self._context.Process(target=_evaluation_worker, daemon=True,
+                                              args=(self.agent_class, self.agent_config, self.n_episodes,
+                                                    self.max_episode_steps, self.gpu_memory,
+                                                    self._snapshots, self._results))
+        self._process.start()
+
+    def submit(self, weights: Any, trained_frames: int) -> bool:
+        """
+        Send a weight snapshot to the worker, without waiting.
+
+        :param weights: Weights, as returned by agent.get_weights().
+        :param trained_frames: Number of training frames run when the snapshot was taken.
+        :return: True if queued, False if dropped because the worker is behind.
+        """
+        try:
+            self._snapshots.put_nowait((weights, trained_frames))
+            return True
+        except queue.Full:
+            self.n_dropped += 1
+            return False
+
+    def collect(self, training_history: Union[None, TrainingHistory] = None, block: bool = False) -> int:
+        """
+        Add any finished evaluation episodes to the training history.
+
+        :param training_history: History to add evaluations to. If None, results are discarded.
+        :param block: Wait for the worker to finish (after .close has sent the stop signal).
+        :return: Number of evaluation episodes collected.
+        """
+        n = 0
+        while True:
+            try:
+                result = self._results.get(block=block, timeout=1 if block else None)
+            except queue.Empty:
+                if block and self.running:
+                    # Still working
+                    continue
+                break
+
+            if result is None:
+                break
+
+            if training_history is not None:
+                trained_frames, episode_report = result
+                training_history.append_evaluation(episode_report, trained_frames=trained_frames)
+            n += 1
+
+        return n
+
+    def close(self, training_history: Union[None, TrainingHistory] = None) -> int:
+        """
+        Finish evaluating pending snapshots, collect the results, and stop the worker.
+
+        :param training_history: History to add remaining evaluations to.
+        :return: Number of evaluation episodes collected.
+        """
+        if self._process is None:
+            return 0
+
+        n = 0
+        if self.running:
+            self._snapshots.put(None)
+            # Need to empty the results queue before joining, otherwise the worker can't exit
+            n = self.collect(training_history, block=True)
+        self._process.join()
+        self._process = None
+
+        return n
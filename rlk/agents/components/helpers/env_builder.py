@@ -1,13 +1,39 @@
 from functools import reduce
-from typing import Union, Callable, Iterable, Dict, Any
+from typing import Union, Callable, Iterable, Dict, Any, Tuple
 
 import gym
 
+# (Observation space, action space) of each env (spec, kwargs and wrappers) built so far in this process. Filled only
+# by building an env, see EnvBuilder.spaces.
+_SPACES_CACHE: Dict[Tuple[Any, ...], Tuple[gym.Space, gym.Space]] = {}
+
 
 class EnvBuilder:
+    """
+    Builds an env from a spec and wrappers, when it's first accessed.
+
+    Building is deferred as it can be slow (eg. wrappers that fit preprocessing on startup) and often isn't needed, for
+    example when copying or loading agents. The observation and action spaces can be checked without building the env,
+    after the first time an env with the same spec and wrappers has been built in this process.
+    """
+
     def __init__(self, env_spec: str, env_kwargs: Union[None, Dict[str, Any]] = None,
                  env_wrappers: Iterable[Callable] = None, remote: bool = False,
-                 ip: Union[None, str] = None, port: int = 8000):
+                 ip: Union[None, str] = None, port: int = 8000,
+                 remote_name: Union[None, str] = None, remote_pickle: bool = False):
+        """
+        :param env_spec: Gym spec of the env.
+        :param env_kwargs: Kwargs for gym.make.
+        :param env_wrappers: Wrappers to apply to the env, in order.
+        :param remote: Use an env on a server (the external GFootball server for GFootball specs, otherwise an rlk
+                       EnvServer, see RemoteEnv).
+        :param ip: Server address, if remote.
+        :param port: Server port, if remote.
+        :param remote_name: Name of the EnvServer's env_builders to create an env with wrappers from. Default None uses
+                            env_spec.
+        :param remote_pickle: Send the wrappers to the EnvServer in a pickled builder instead of using a named one.
+                              The server must be started with allow_pickle.
+        """
 
         self.env_spec = env_spec
         self.env_kwargs = env_kwargs
@@ -15,6 +41,8 @@ class EnvBuilder:
         self.remote = remote
         self.ip = ip
         self.port = port
+        self.remote_name = remote_name
+        self.remote_pickle = remote_pickle
 
         self._env: Union[None, gym.Env] = None
         if self.env_wrappers is None:
@@ -24,15 +52,29 @@ class EnvBuilder:
             self.env_kwargs = {}
 
         self._register_other_envs()
-        self.set_env()
 
-    @staticmethod
-    def _register_other_envs() -> None:
-        """Try and import supported envs (may not be installed). Need to do this to register them with gym."""
-        try:
-            import vizdoomgym
-        except ImportError:
-            pass
+    def __getstate__(self) -> Dict[str, Any]:
+        """The env itself isn't pickled, it's rebuilt from the spec when next accessed."""
+        state = dict(self.__dict__)
+        state['_env'] = None
+
+        return state
+
+    def _register_other_envs(self) -> None:
+        """
+        Try and import supported envs (may not be installed). Need to do this to register them with gym.
+
+        Only done for the relevant spec, as importing these is slow.
+        """
+        if self.env_spec.startswith('Vizdoom'):
+            try:
+                import vizdoomgym
+            except ImportError:
+                pass
+
+        if self.env_spec.startswith('GFootball'):
+            from rlk.environments.gfootball.register_environments import register_all
+            register_all()
 
     def set_env(self, env: Union[None, gym.Env] = None) -> None:
         """
@@ -44,19 +86,62 @@ class EnvBuilder:
             self._env = env
         else:
             if self._env is None:
-                if self.remote:
-                    # No general remote wrapper yet, this is the only one
+                if self.remote and self.env_spec.startswith('GFootball'):
+                    # Served by the external GFootball env server
                     from rlk.environments.gfootball.environment_processing.gf_remote_wrapper import GFRemoteWrapper
                     self._env = GFRemoteWrapper(self.env_spec, ip=self.ip, port=self.port)
+                elif self.remote:
+                    # Built on an rlk EnvServer, see rlk.environments.remote.env_server
+                    from rlk.environments.remote.remote_env import RemoteEnv
+                    self._env = RemoteEnv(self.env_spec, env_kwargs=self.env_kwargs, env_wrappers=self.env_wrappers,
+                                          ip=self.ip, port=self.port, builder_name=self.remote_name,
+                                          send_pickle=self.remote_pickle)
                 else:
                     # Make the gym environment and apply the wrappers one by one
                     self._env = reduce(lambda inner_env, wrapper: wrapper(inner_env),
                                        self.env_wrappers,
                                        gym.make(self.env_spec, **self.env_kwargs))
 
+    @property
+    def _spaces_key(self) -> Tuple[Any, ...]:
+        return (self.env_spec, self.remote, self.remote_name, repr(sorted(self.env_kwargs.items())),
+                tuple(repr(w) for w in self.env_wrappers))
+
+    @property
+    def spaces(self) -> Tuple[gym.Space, gym.Space]:
+        """
+        Observation and action spaces of the env.
+
+        Gym only sets the spaces when an env is constructed, so they can't be resolved from the spec alone. If an env
+        with the same spec, kwargs and wrappers has already been built in this process, its cached spaces are returned
+        without building this builder's env. Otherwise this builds the env (without resetting or stepping it).
+        """
+        if self._env is not None:
+            return self._env.observation_space, self._env.action_space
+
+        key = self._spaces_key
+        if key not in _SPACES_CACHE:
+            _SPACES_CACHE[key] = self.env.observation_space, self.env.action_space
+
+        return _SPACES_CACHE[key]
+
+    @property
+    def observation_space(self) -> gym.Space:
+        return self.spaces[0]
+
+    @property
+    def action_space(self) -> gym.Space:
+        return self.spaces[1]
+
     @property
     def env(self) -> gym.Env:
         """Use to access env, if not ready also makes it ready."""
         self.set_env()
 
         return self._env
+
+    def close(self) -> None:
+        """Close and detach the env, if it's been built."""
+        if self._env is not None:
+            self._env.close()
+            self._env = None
@@ -0,0 +1,32 @@
+import importlib
+import types
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stands in for a module, and imports it the first time one of its attributes is used.
+
+    This keeps importing rlk modules cheap where heavy dependencies (TensorFlow, sklearn, matplotlib, etc.) are only
+    needed by some methods. Eg.
+    >>> keras = LazyModule('tensorflow.keras')
+    >>> keras.layers.Dense  # TensorFlow is imported here
+
+    Annotations referencing a lazy module are evaluated at import, so should be strings, eg. -> "keras.Model".
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._module: types.ModuleType = None
+
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+
+        return self._module
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
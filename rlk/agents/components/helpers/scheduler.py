@@ -0,0 +1,101 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+
+@dataclass
+class ScheduledTask:
+    """
+    A callback to run on a frame count and/or wall-clock trigger, and its accumulated cost.
+
+    :param callback: Function to run, takes no args.
+    :param every_frames: Run after this many frames have passed since the last run. Set to 0 to turn off.
+    :param every_seconds: Run after this many seconds have passed since the last run. Set to 0 to turn off.
+    """
+    callback: Callable[[], Any]
+    every_frames: int = 0
+    every_seconds: float = 0
+
+    def __post_init__(self) -> None:
+        self.n_calls: int = 0
+        self.time_taken: float = 0.0
+        self.reset_clock()
+
+    def reset_clock(self, frame: int = 0) -> None:
+        self._last_frame = frame
+        self._last_time = time.time()
+
+    def due(self, frame: int, now: float) -> bool:
+        frames_due = (self.every_frames > 0) and (frame - self._last_frame >= self.every_frames)
+        time_due = (self.every_seconds > 0) and (now - self._last_time >= self.every_seconds)
+
+        return frames_due or time_due
+
+    def run(self, frame: int) -> Any:
+        """Run the callback, log its cost, and restart the trigger."""
+        t0 = time.time()
+        output = self.callback()
+        t1 = time.time()
+
+        self.n_calls += 1
+        self.time_taken += t1 - t0
+        self.reset_clock(frame)
+
+        return output
+
+
+class Scheduler:
+    """
+    Runs named tasks when their frame or wall-clock triggers are due, and tracks how much time each one costs.
+
+    The scheduler doesn't run anything itself between calls to .advance, so tasks fire at the first call to .advance
+    after they become due. Other activities that aren't scheduled (eg. playing episodes) can be included in the cost
+    breakdown using .log_cost.
+
+    Example
+    >>> scheduler = Scheduler()
+    >>> scheduler.add('checkpoint', agent.save, every_seconds=600)
+    >>> scheduler.add('update', agent._after_episode_update, every_frames=1000)
+    >>> scheduler.advance(n_frames=200)
+    """
+
+    def __init__(self) -> None:
+        self.frame: int = 0
+        self.tasks: Dict[str, ScheduledTask] = {}
+        self._other_costs: Dict[str, Dict[str, float]] = {}
+
+    def add(self, name: str, callback: Callable[[], Any], every_frames: int = 0, every_seconds: float = 0) -> None:
+        task = ScheduledTask(callback=callback, every_frames=every_frames, every_seconds=every_seconds)
+        task.reset_clock(self.frame)
+        self.tasks[name] = task
+
+    def advance(self, n_frames: int) -> Dict[str, Any]:
+        """
+        Move the frame count on and run any tasks that are now due, in the order they were added.
+
+        :param n_frames: Number of frames run since the last call.
+        :return: Dict containing the outputs of tasks that ran, indexed by task name.
+        """
+        self.frame += n_frames
+        now = time.time()
+
+        return {name: task.run(self.frame) for name, task in self.tasks.items() if task.due(self.frame, now)}
+
+    def log_cost(self, name: str, time_taken: float) -> None:
+        """Add time spent on something other than a scheduled task to the cost breakdown."""
+        cost = self._other_costs.setdefault(name, {'n_calls': 0, 'time_taken': 0.0})
+        cost['n_calls'] += 1
+        cost['time_taken'] += time_taken
+
+    @property
+    def costs(self) -> Dict[str, Dict[str, float]]:
+        """Number of calls and total time taken in seconds for each task and logged activity."""
+        costs = {name: {'n_calls': task.n_calls, 'time_taken': task.time_taken} for name, task in self.tasks.items()}
+        costs.update({name: dict(cost) for name, cost in self._other_costs.items()})
+
+        return costs
+
+    def __str__(self) -> str:
+        total = sum([c['time_taken'] for c in self.costs.values()]) + 1e-9
+        return "\n".join([f"{name}: {c['n_calls']} calls in {c['time_taken']:.3f} s "
+                          f"({100 * c['time_taken'] / total:.1f}%)" for name, c in self.costs.items()])
@@ -0,0 +1,175 @@
+import os
+import struct
+import time
+from typing import Iterator, Union
+
+import numpy as np
+
+
+class EpisodeLog:
+    """
+    Append-only binary log of episode records, written as training runs.
+
+    The file is a small header followed by fixed size records (see .record_dtype), so it can be memory mapped as a
+    structured array without parsing, and can be read while it's being written. A partially written final record (eg.
+    after a crash) is ignored by readers and removed when the log is next opened for writing. Complete records are
+    never removed unless asked for explicitly.
+
+    Writing is normally done by TrainingHistory (see TrainingHistory.log_path). Reading doesn't need the agent:
+    >>> records = EpisodeLog.read('agent/episodes.log')
+    >>> records['total_reward'].mean()
+
+    Or follow a running job:
+    >>> for record in EpisodeLog.tail('agent/episodes.log'):
+    >>>     print(record['frames'], record['total_reward'])
+    """
+    record_dtype = np.dtype([('frames', '<i8'), ('time_taken', '<f8'), ('total_reward', '<f8'), ('epsilon', '<f8')])
+    _magic = b'RLKEPLOG'
+    _version = 1
+    # (magic, version, record size)
+    _header = struct.Struct('<8sII')
+
+    def __init__(self, path: str, fsync_every: int = 100) -> None:
+        """
+        :param path: Path of the log file.
+        :param fsync_every: Fsync the file after this many records, so they survive a crash of the machine. Records
+                            are written to the file (visible to readers) immediately regardless.
+        """
+        self.path = path
+        self.fsync_every = fsync_every
+
+        self._file = None
+        self._unsynced: int = 0
+
+    @classmethod
+    def _check_header(cls, header: bytes) -> None:
+        magic, version, record_size = cls._header.unpack(header)
+        if (magic != cls._magic) or (version != cls._version) or (record_size != cls.record_dtype.itemsize):
+            raise ValueError(f"Not a compatible episode log (version {version}).")
+
+    @classmethod
+    def n_records(cls, path: str) -> int:
+        """Number of complete records in the log at path, 0 if it doesn't exist."""
+        if not os.path.exists(path):
+            return 0
+
+        return max(0, (os.path.getsize(path) - cls._header.size) // cls.record_dtype.itemsize)
+
+    def open(self, truncate_to: Union[None, int] = None) -> int:
+        """
+        Open the log for appending.
+
+        Existing records are kept; only a partially written final record (eg. from a crash) is removed. Records are
+        only dropped if truncate_to is set explicitly, see TrainingHistory.from_log with resume=True.
+
+        :param truncate_to: Keep only the first truncate_to records. Default None keeps all records.
+        :return: Number of records in the log.
+        """
+        if os.path.dirname(self.path) != '':
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        n_records = self.n_records(self.path)
+        if os.path.exists(self.path) and (os.path.getsize(self.path) >= self._header.size):
+            with open(self.path, 'rb') as f:
+                self._check_header(f.read(self._header.size))
+            if truncate_to is not None:
+                n_records = min(n_records, truncate_to)
+            size = self._header.size + n_records * self.record_dtype.itemsize
+            if os.path.getsize(self.path) != size:
+                os.truncate(self.path, size)
+            self._file = open(self.path, 'ab', buffering=0)
+        else:
+            n_records = 0
+            self._file = open(self.path, 'wb', buffering=0)
+            self._file.write(self._header.pack(self._magic, self._version, self.record_dtype.itemsize))
+
+        return n_records
+
+    def rotate(self) -> Union[None, str]:
+        """
+        Move the existing log file (if any) to the first free path of path.1, path.2, etc., so a new log can be started
+        at path without losing the old records.
+
+        :return: Path the old log was moved to, None if there wasn't one.
+        """
+        if self._file is not None:
+            raise ValueError("Can't rotate an open log, close it first.")
+        if not os.path.exists(self.path):
+            return None
+
+        i = 1
+        while os.path.exists(f"{self.path}.{i}"):
+            i += 1
+        os.rename(self.path, f"{self.path}.{i}")
+
+        return f"{self.path}.{i}"
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def write(self, records: np.ndarray) -> None:
+        """Append records (a structured array with .record_dtype, or anything that can be cast to it)."""
+        self._file.write(np.ascontiguousarray(records, dtype=self.record_dtype).tobytes())
+        self._unsynced += len(records)
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    @classmethod
+    def read(cls, path: str, mmap: bool = True) -> np.ndarray:
+        """
+        Read the complete records in the log.
+
+        :param path: Path of the log file.
+        :param mmap: Memory map the file (read only) rather than reading it into memory.
+        """
+        n = cls.n_records(path)
+        with open(path, 'rb') as f:
+            cls._check_header(f.read(cls._header.size))
+            if n == 0:
+                return np.zeros(0, dtype=cls.record_dtype)
+            if not mmap:
+                return np.frombuffer(f.read(n * cls.record_dtype.itemsize), dtype=cls.record_dtype)
+
+        return np.memmap(path, dtype=cls.record_dtype, mode='r', offset=cls._header.size, shape=(n,))
+
+    @classmethod
+    def tail(cls, path: str, start: int = 0, poll_interval: float = 1.0,
+             timeout: Union[None, float] = None) -> Iterator[np.void]:
+        """
+        Yield records as they're added to the log, eg. by a running job.
+
+        :param path: Path of the log file. It doesn't need to exist yet.
+        :param start: Index of the first record to yield.
+        :param poll_interval: Seconds to wait between checks for new records.
+        :param timeout: Stop after this many seconds without new records. Default None follows indefinitely.
+        """
+        next_record = start
+        last_new = time.time()
+        while True:
+            n = cls.n_records(path)
+            if n > next_record:
+                # Only read the new records
+                with open(path, 'rb') as f:
+                    f.seek(cls._header.size + next_record * cls.record_dtype.itemsize)
+                    new_records = np.frombuffer(f.read((n - next_record) * cls.record_dtype.itemsize),
+                                                dtype=cls.record_dtype)
+                for record in new_records:
+                    yield record
+                next_record = n
+                last_new = time.time()
+            elif (timeout is not None) and (time.time() - last_new > timeout):
+                return
+            else:
+                time.sleep(poll_interval)
@@ -0,0 +1,133 @@
+import queue
+import threading
+from typing import List, Union
+
+from rlk.agents.components.history.episode_report import EpisodeReport
+from rlk.agents.components.history.training_history import TrainingHistory
+
+
+class MetricsSink:
+    """
+    Handles reporting of training progress on a background thread, so training doesn't wait on it.
+
+    EpisodeReports are put on a queue by the training loop (see AgentBase.train and .train_steps). The consumer thread
+    adds them to its own TrainingHistory (.stats, without a log or plotting) for the rolling reward and totals and,
+    depending on settings:
+     - Prints a summary every print_every episodes.
+     - Appends each episode to a csv log file.
+     - Redraws the rolling average reward plot and saves it to plot_path every plot_every episodes. The figure is
+       created once and reused, and is drawn without pyplot, which isn't thread safe.
+
+    Example
+    >>> sink = MetricsSink(agent_name=agent.name, print_every=10, log_path='log.csv', plot_path='training.png')
+    >>> sink.start()
+    >>> agent.train(n_episodes=1000, metrics_sink=sink)
+    >>> sink.close()
+    """
+
+    def __init__(self, agent_name: str = 'Unnamed agent', rolling_average: int = 10, print_every: int = 1,
+                 log_path: Union[None, str] = None, plot_path: Union[None, str] = None,
+                 plot_every: int = 50) -> None:
+        """
+        :param agent_name: Name to use in summaries and plot titles.
+        :param rolling_average: Window size for rolling average reward.
+        :param print_every: Print a summary every n episodes. Set to 0 to turn off.
+        :param log_path: Path of csv file to append episodes to. Optional.
+        :param plot_path: Path to save the plot to. Optional, plotting is off if not set.
+        :param plot_every: Redraw the plot every n episodes.
+        """
+        self.agent_name = agent_name
+        self.print_every = print_every
+        self.log_path = log_path
+        self.plot_path = plot_path
+        self.plot_every = plot_every
+
+        self.stats = TrainingHistory(agent_name=agent_name, rolling_average=rolling_average)
+        self._rolling_rewards: List[float] = []
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Union[None, threading.Thread] = None
+        self._figure = None
+        self._line = None
+
+    @property
+    def running(self) -> bool:
+        return (self._thread is not None) and self._thread.is_alive()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._consume, daemon=True)
+        self._thread.start()
+
+    def put(self, episode_report: EpisodeReport) -> None:
+        """Add an episode to be reported, without waiting."""
+        self._queue.put_nowait(episode_report)
+
+    def close(self) -> None:
+        """Finish reporting queued episodes and stop the thread."""
+        if self.running:
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "MetricsSink":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _consume(self) -> None:
+        log_file = open(self.log_path, 'a') if self.log_path is not None else None
+        try:
+            while True:
+                episode_report = self._queue.get()
+                if episode_report is None:
+                    break
+                self._report(episode_report, log_file)
+        finally:
+            if log_file is not None:
+                log_file.close()
+
+        if (self.plot_path is not None) and (self.stats.n_episodes > 0):
+            self._plot()
+
+    def _report(self, episode_report: EpisodeReport, log_file=None) -> None:
+        self.stats.append(episode_report)
+        self._rolling_rewards.append(self.stats.rolling_mean)
+
+        if log_file is not None:
+            log_file.write(f"{self.stats.n_episodes},{episode_report.frames},{episode_report.time_taken},"
+                           f"{episode_report.total_reward}\n")
+            log_file.flush()
+
+        if (self.print_every > 0) and not (self.stats.n_episodes % self.print_every):
+            print(f"{self.agent_name}: {self._summary()}")
+
+        if (self.plot_path is not None) and not (self.stats.n_episodes % self.plot_every):
+            self._plot()
+
+    def _summary(self) -> str:
+        fps = self.stats.total_frames / max(1e-9, self.stats.total_time)
+        window = min(self.stats.n_episodes, self.stats.rolling_average)
+
+        return f"{self.stats.n_episodes} episodes, {self.stats.total_frames} frames ({fps:.0f} f/s). " \
+               f"Mean reward over last {window}: {self.stats.rolling_mean:.3f}"
+
+    def _plot(self) -> None:
+        """Update the line data on the (reused) figure and save it."""
+        if self._figure is None:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            self._figure = Figure()
+            FigureCanvasAgg(self._figure)
+            ax = self._figure.add_subplot(1, 1, 1)
+            self._line, = ax.plot([], [], label='total_reward')
+            ax.set_xlabel('N Episodes', fontweight='bold')
+            ax.set_ylabel(f'total_reward (rolling {self.stats.rolling_average})', fontweight='bold')
+            ax.set_title(self.agent_name, fontweight='bold')
+
+        self._line.set_data(range(len(self._rolling_rewards)), self._rolling_rewards)
+        ax = self._figure.axes[0]
+        ax.relim()
+        ax.autoscale_view()
+        self._figure.savefig(self.plot_path)
@@ -1,45 +1,346 @@
-from dataclasses import dataclass
-from typing import List, Tuple, Any
+import warnings
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from typing import List, Tuple, Any, Union, Iterable, Dict
 
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
 
+from rlk.agents.components.helpers.lazy_import import LazyModule
+from rlk.agents.components.history.episode_log import EpisodeLog
 from rlk.agents.components.history.episode_report import EpisodeReport
+from rlk.agents.q_learning.exploration.epsilon_base import EpsilonBase
+
+plt = LazyModule('matplotlib.pyplot')
+sns = LazyModule('seaborn')
+
+
+class EpisodeHistoryView(Sequence):
+    """
+    Read-only sequence of EpisodeReports over the columns of a TrainingHistory.
+
+    Reports are created on access, so indexing and len are cheap without keeping an object per episode.
+    """
+
+    def __init__(self, training_history: "TrainingHistory") -> None:
+        self._th = training_history
+
+    def __len__(self) -> int:
+        return self._th.n_episodes
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[EpisodeReport, List[EpisodeReport]]:
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        if idx < 0:
+            idx += len(self)
+        if not (0 <= idx < len(self)):
+            raise IndexError("Episode index out of range")
+
+        return EpisodeReport(frames=int(self._th._frames[idx]), time_taken=float(self._th._time_taken[idx]),
+                             total_reward=float(self._th._total_reward[idx]),
+                             epsilon_used=self._th.epsilon_used)
 
 
 @dataclass
 class TrainingHistory:
+    """
+    History of training episodes, stored as typed columns of metrics that grow as episodes are added.
+
+    Rolling mean/std of total_reward over the last rolling_average episodes and the cumulative frames and time are
+    updated as episodes are added, so .current_performance and .total_frames don't depend on the length of the
+    history. .history gives a sequence of EpisodeReports, and .get_metric gives a column as an array.
+
+    If log_path is set, episodes are also appended to an EpisodeLog file as they're added, so they're available if the
+    job crashes between checkpoints and can be read (or tailed) without loading the agent; see .from_log. Existing
+    records in the log are never dropped, unless resuming from it with .from_log. If the log has more episodes than
+    the history writing to it (eg. a history loaded from a checkpoint taken before a crash), the old log is moved to
+    log_path.1 (etc.) and a new log is started.
+    """
     plotting_on: bool = False
     plot_every: int = 50
     agent_name: str = 'Unnamed agents'
     rolling_average: int = 10
+    log_path: Union[None, str] = None
+    log_fsync_every: int = 100
+
+    # Columns and their dtypes. epsilon is eps_current at the end of the episode (nan if no epsilon used).
+    _column_dtypes = (('frames', np.int64), ('time_taken', np.float64), ('total_reward', np.float64),
+                      ('epsilon', np.float64))
+    # EpisodeReport fields saved by .save_columns
+    _columns = ('frames', 'time_taken', 'total_reward')
+    _initial_capacity = 64
 
     def __post_init__(self) -> None:
-        sns.set()
-        self.history: List[EpisodeReport] = []
+        self.n_episodes: int = 0
+        self._capacity: int = self._initial_capacity
+        for metric, dtype in self._column_dtypes:
+            setattr(self, f"_{metric}", np.zeros(self._capacity, dtype=dtype))
+        # Most recent epsilon object used, set on EpisodeReports from .history (usually the agent's eps)
+        self.epsilon_used: Union[None, EpsilonBase] = None
+        self._reset_totals()
+        self._log = EpisodeLog(self.log_path, fsync_every=self.log_fsync_every) if self.log_path is not None else None
+        # Set by .from_log with resume=True, the log is truncated to this history when it's opened
+        self._resume_log: bool = False
+
+        # (Number of training frames run at time of evaluation, evaluation episode report)
+        self.evaluation_history: List[Tuple[int, EpisodeReport]] = []
+
+    def _reset_totals(self) -> None:
+        """Recalculate cumulative totals and rolling sums from the columns."""
+        self._frames_sum = int(self._frames[:self.n_episodes].sum())
+        self._time_sum = float(self._time_taken[:self.n_episodes].sum())
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        n = self.n_episodes
+        window = self._total_reward[max(0, n - self.rolling_average):n]
+        self._window_sum = float(window.sum())
+        self._window_sq_sum = float(np.square(window).sum())
+
+    def _grow(self, n_required: int) -> None:
+        if n_required <= self._capacity:
+            return
+
+        self._capacity = max(n_required, self._capacity * 2)
+        for metric, _ in self._column_dtypes:
+            column = getattr(self, f"_{metric}")
+            grown = np.zeros(self._capacity, dtype=column.dtype)
+            grown[:self.n_episodes] = column[:self.n_episodes]
+            setattr(self, f"_{metric}", grown)
+
+    @property
+    def history(self) -> EpisodeHistoryView:
+        return EpisodeHistoryView(self)
 
     def append(self, episode_report: EpisodeReport) -> None:
-        self.history.append(episode_report)
+        self._grow(self.n_episodes + 1)
+        n = self.n_episodes
+        self._frames[n] = episode_report.frames
+        self._time_taken[n] = episode_report.time_taken
+        self._total_reward[n] = episode_report.total_reward
+        if episode_report.epsilon_used is not None:
+            self.epsilon_used = episode_report.epsilon_used
+            self._epsilon[n] = episode_report.epsilon_used.eps_current
+        else:
+            self._epsilon[n] = np.nan
+        self.n_episodes += 1
+
+        # Update totals and rolling window sums with the new episode, removing the one leaving the window
+        self._frames_sum += int(episode_report.frames)
+        self._time_sum += float(episode_report.time_taken)
+        self._window_sum += float(episode_report.total_reward)
+        self._window_sq_sum += float(episode_report.total_reward) ** 2
+        if self.n_episodes > self.rolling_average:
+            leaving = float(self._total_reward[self.n_episodes - self.rolling_average - 1])
+            self._window_sum -= leaving
+            self._window_sq_sum -= leaving ** 2
+        if not self.n_episodes % self.rolling_average:
+            # Recalculate each time the window turns over, so floating point error doesn't accumulate
+            self._reset_window()
+
+        self._write_log(self.n_episodes - 1)
+
+    def _write_log(self, start: int) -> None:
+        """Append episodes from start onwards to the log, if set."""
+        if self._log is None:
+            return
+
+        if not self._log.is_open:
+            # Any episodes missing from the log are written
+            start = min(start, self._open_log(n_logged=start))
+
+        records = np.zeros(self.n_episodes - start, dtype=EpisodeLog.record_dtype)
+        for metric, _ in self._column_dtypes:
+            records[metric] = getattr(self, f"_{metric}")[start:self.n_episodes]
+        self._log.write(records)
+
+    def _open_log(self, n_logged: int) -> int:
+        """
+        Open the log, for a history whose first n_logged episodes should already be in it.
+
+        :return: Number of records in the opened log.
+        """
+        if self._resume_log:
+            self._resume_log = False
+            return self._log.open(truncate_to=n_logged)
+
+        if EpisodeLog.n_records(self.log_path) > n_logged:
+            rotated_path = self._log.rotate()
+            warnings.warn(f"Episode log {self.log_path} has episodes that aren't in this history, it's been moved to "
+                          f"{rotated_path} and a new log started.")
+
+        return self._log.open()
+
+    def without_log(self) -> "TrainingHistory":
+        """
+        Copy of this history, including its episodes, that doesn't write to a log. For example, for workers whose
+        episodes are logged by the main history when they're merged into it.
+        """
+        state = self.__getstate__()
+        state.update({'log_path': None, '_log': None, '_resume_log': False,
+                      'evaluation_history': list(self.evaluation_history)})
+        history = type(self).__new__(type(self))
+        history.__setstate__(state)
 
-    def extend(self, episode_report: List[EpisodeReport]) -> None:
-        self.history.extend(episode_report)
+        return history
 
-    def get_metric(self, metric: str = "total_reward") -> List[Any]:
-        return [getattr(ep, metric) for ep in self.history]
+    def close_log(self) -> None:
+        """Sync and close the log file, if open. It's reopened if more episodes are added."""
+        if self._log is not None:
+            self._log.close()
 
-    def plot(self, metrics: List[str], show: bool = True) -> Tuple[plt.Figure, plt.Axes]:
+    @classmethod
+    def from_log(cls, log_path: str, resume: bool = False, n_episodes: Union[None, int] = None,
+                 **kwargs) -> "TrainingHistory":
+        """
+        Create a history from an EpisodeLog, eg. to analyse a run without loading the agent, or to resume it.
+
+        Episodes are copied from the log into the new history. The new history doesn't write to the log unless resuming
+        (or log_path is also passed in kwargs).
+
+        :param log_path: Path of the log file.
+        :param resume: Continue writing to the log at log_path. Any records after the first n_episodes are removed
+                       from the log when it's next written to.
+        :param n_episodes: Only load the first n_episodes episodes, eg. to resume from an earlier point than the end of
+                           the log. Default None loads all of them.
+        :param kwargs: Other settings for the TrainingHistory.
+        """
+        # Not memory mapped if resuming, as the file may be truncated
+        records = EpisodeLog.read(log_path, mmap=not resume)
+        if n_episodes is not None:
+            records = records[:n_episodes]
+        if resume:
+            kwargs['log_path'] = log_path
+        history = cls(**kwargs)
+        history._resume_log = resume
+        history._grow(len(records))
+        for metric, _ in cls._column_dtypes:
+            getattr(history, f"_{metric}")[:len(records)] = records[metric]
+        history.n_episodes = len(records)
+        history._reset_totals()
+        if history._log is not None:
+            history._write_log(history.n_episodes)
+
+        return history
+
+    def append_evaluation(self, episode_report: EpisodeReport, trained_frames: int) -> None:
+        self.evaluation_history.append((trained_frames, episode_report))
+
+    def extend(self, episode_reports: Union["TrainingHistory", Iterable[EpisodeReport]]) -> None:
+        """
+        Add multiple episodes at once.
+
+        :param episode_reports: Another TrainingHistory (eg. from a worker), which is merged column-wise, or an
+                                iterable of EpisodeReports.
+        """
+        if not isinstance(episode_reports, TrainingHistory):
+            for episode_report in episode_reports:
+                self.append(episode_report)
+            return
+
+        other = episode_reports
+        n, m = self.n_episodes, other.n_episodes
+        self._grow(n + m)
+        for metric, _ in self._column_dtypes:
+            getattr(self, f"_{metric}")[n:n + m] = getattr(other, f"_{metric}")[:m]
+        if other.epsilon_used is not None:
+            self.epsilon_used = other.epsilon_used
+        self.n_episodes += m
+        self._reset_totals()
+        self._write_log(n)
+
+    def save_columns(self, fn: str) -> None:
+        """
+        Save the history as columns of metrics in a .npz file.
+
+        Epsilon objects aren't saved, they're usually the same object as the agent's eps; see .load_columns.
+        """
+        evaluations = [report for _, report in self.evaluation_history]
+        np.savez(fn,
+                 **{metric: self.get_metric(metric) for metric, _ in self._column_dtypes},
+                 **{f"evaluation_{metric}": np.array([getattr(ep, metric) for ep in evaluations], dtype=float)
+                    for metric in self._columns},
+                 evaluation_trained_frames=np.array([f for f, _ in self.evaluation_history], dtype=int))
+
+    def load_columns(self, fn: str, epsilon_used: Union[None, EpsilonBase] = None) -> "TrainingHistory":
+        """
+        Create a copy of this history (with the same settings) containing the history saved with .save_columns.
+
+        :param fn: Path to the .npz file.
+        :param epsilon_used: Epsilon object to set on EpisodeReports from the loaded history, eg. the agent's eps.
+        """
+        history = replace(self)
+        with np.load(fn) as columns:
+            n = len(columns['frames'])
+            history._grow(n)
+            for metric, dtype in self._column_dtypes:
+                # Files saved before the epsilon column was added don't have it
+                values = columns[metric] if metric in columns.files else np.full(n, np.nan)
+                getattr(history, f"_{metric}")[:n] = values.astype(dtype)
+            history.n_episodes = n
+            history.epsilon_used = epsilon_used
+            history._reset_totals()
+
+            history.evaluation_history = [(int(tf), EpisodeReport(frames=int(f), time_taken=float(t),
+                                                                  total_reward=float(r), epsilon_used=epsilon_used))
+                                          for tf, f, t, r in zip(columns['evaluation_trained_frames'],
+                                                                 *[columns[f"evaluation_{metric}"]
+                                                                   for metric in self._columns])]
+
+        return history
+
+    def get_metric(self, metric: str = "total_reward") -> Union[np.ndarray, List[Any]]:
+        """
+        Get a metric for all episodes.
+
+        Columns (frames, time_taken, total_reward, epsilon) are returned as a read-only array view, without copying.
+        Other EpisodeReport attributes are returned as a list.
+        """
+        if metric not in dict(self._column_dtypes):
+            return [getattr(ep, metric) for ep in self.history]
+
+        column = getattr(self, f"_{metric}")[:self.n_episodes].view()
+        column.flags.writeable = False
+
+        return column
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Trim columns to the number of episodes, so spare capacity isn't pickled. The log file is reopened on use."""
+        state = dict(self.__dict__)
+        for metric, _ in self._column_dtypes:
+            state[f"_{metric}"] = state[f"_{metric}"][:self.n_episodes].copy()
+        state['_capacity'] = self.n_episodes
+        if state.get('_log') is not None:
+            state['_log'] = EpisodeLog(self.log_path, fsync_every=self.log_fsync_every)
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        old_history = state.pop('history', None)
+        state.setdefault('log_path', None)
+        state.setdefault('log_fsync_every', 100)
+        state.setdefault('_resume_log', False)
+        self.__dict__.update(state)
+
+        if old_history is not None:
+            # Pickled before columns were used, convert the list of EpisodeReports
+            self.__post_init__()
+            self.evaluation_history = state.get('evaluation_history', [])
+            self.extend(old_history)
+
+    def plot(self, metrics: List[str], show: bool = True) -> Tuple["plt.Figure", "plt.Axes"]:
         """Plot current history."""
         return self._plot(show=show, metrics=metrics)
 
-    def training_plot(self, show: bool = True) -> Tuple[plt.Figure, plt.Axes]:
+    def training_plot(self, show: bool = True) -> Tuple["plt.Figure", "plt.Axes"]:
         """Plot if it's turned on and is a plot step."""
 
-        if self.plotting_on and (not len(self.history) % self.plot_every):
+        if self.plotting_on and (not self.n_episodes % self.plot_every):
             return self._plot(show=show, metrics=["total_reward", "frames"])
 
-    def _plot(self, metrics: List[str], show: bool = True) -> Tuple[plt.Figure, plt.Axes]:
+    def _plot(self, metrics: List[str], show: bool = True) -> Tuple["plt.Figure", "plt.Axes"]:
         """Create axes and plot. Not storing matplotlib objects to self as they cause pickle issues."""
+        sns.set()
         plt.close('all')
         fig, axs = plt.subplots(nrows=len(metrics), ncols=1)
         if not isinstance(axs, np.ndarray):
@@ -62,9 +363,28 @@ class TrainingHistory:
 
     @property
     def total_frames(self) -> int:
-        return int(np.sum(self.get_metric("frames")))
+        return self._frames_sum
+
+    @property
+    def total_time(self) -> float:
+        return self._time_sum
+
+    @property
+    def rolling_mean(self) -> float:
+        """Mean total_reward over the last rolling_average episodes (nan if there are none)."""
+        n = min(self.n_episodes, self.rolling_average)
+        return self._window_sum / n if n > 0 else np.nan
+
+    @property
+    def rolling_std(self) -> float:
+        """Standard deviation of total_reward over the last rolling_average episodes (nan if there are none)."""
+        n = min(self.n_episodes, self.rolling_average)
+        if n == 0:
+            return np.nan
+
+        return float(np.sqrt(max(0.0, self._window_sq_sum / n - self.rolling_mean ** 2)))
 
     @property
-    def current_performance(self, metric: str = "total_reward") -> float:
-        """Return average performance over the last rolling average window."""
-        return float(np.mean(self.get_metric(metric)[len(self.history) - self.rolling_average:-1]))
+    def current_performance(self) -> float:
+        """Return average total_reward over the last rolling average window."""
+        return self.rolling_mean
@@ -1,6 +1,8 @@
 import collections
+import json
+import os
 from dataclasses import dataclass
-from typing import Tuple, Any, Iterable, List
+from typing import Tuple, Any, Iterable, List, Union
 
 import numpy as np
 
@@ -55,3 +57,58 @@ class ContinuousBuffer(ReplayBufferBase):
         idxs = np.random.randint(0, self.n, n)
 
         return self.get_batch(idxs)
+
+    def save_arrays(self, path: str) -> None:
+        """
+        Save the buffer contents as .npy arrays in path, which can be memory mapped by .load_arrays.
+
+        States are written row by row into the output files, so this doesn't need to stack a copy of the buffer in
+        memory. Files are written to temp files and then moved, so a buffer currently memory mapped from path is safe.
+        """
+        os.makedirs(path, exist_ok=True)
+
+        n_rows = len(self._state_queue)
+        multi_input = (n_rows > 0) and isinstance(self._state_queue[0], (list, tuple))
+        rows = [s if multi_input else [s] for s in self._state_queue]
+        n_inputs = len(rows[0]) if n_rows > 0 else 0
+
+        for input_i in range(n_inputs):
+            first = np.asarray(rows[0][input_i])
+            out = np.lib.format.open_memmap(f"{path}/states_{input_i}.npy.tmp", mode='w+', dtype=first.dtype,
+                                            shape=(n_rows,) + first.shape)
+            for row_i, row in enumerate(rows):
+                out[row_i] = np.asarray(row[input_i])
+            out.flush()
+            del out
+            os.replace(f"{path}/states_{input_i}.npy.tmp", f"{path}/states_{input_i}.npy")
+
+        other_columns = zip(*self._other_queue) if n_rows > 0 else ([], [], [])
+        for name, values in zip(('actions', 'rewards', 'dones'), other_columns):
+            with open(f"{path}/{name}.npy.tmp", 'wb') as f:
+                np.save(f, np.array(values))
+            os.replace(f"{path}/{name}.npy.tmp", f"{path}/{name}.npy")
+
+        with open(f"{path}/buffer.json", 'w') as f:
+            json.dump({'buffer_size': self.buffer_size, 'n_inputs': n_inputs, 'multi_input': multi_input}, f)
+
+    @classmethod
+    def load_arrays(cls, path: str, mmap_mode: Union[None, str] = 'r') -> "ContinuousBuffer":
+        """
+        Load a buffer saved with .save_arrays.
+
+        :param path: Directory containing the saved arrays.
+        :param mmap_mode: Memory map mode for the state arrays, see np.load. Default 'r' means states are read from disk
+                          as they're sampled, rather than all at once. Set to None to load fully into memory.
+        """
+        with open(f"{path}/buffer.json", 'r') as f:
+            meta = json.load(f)
+
+        buffer = cls(buffer_size=meta['buffer_size'])
+        states = [np.load(f"{path}/states_{input_i}.npy", mmap_mode=mmap_mode) for input_i in range(meta['n_inputs'])]
+        actions, rewards, dones = [np.load(f"{path}/{name}.npy") for name in ('actions', 'rewards', 'dones')]
+
+        for row_i, (a, r, d) in enumerate(zip(actions, rewards, dones)):
+            s = tuple(s_i[row_i] for s_i in states) if meta['multi_input'] else states[0][row_i]
+            buffer.append((s, a, r, d))
+
+        return buffer
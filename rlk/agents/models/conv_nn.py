@@ -1,14 +1,15 @@
 from typing import Tuple
 
-from tensorflow import keras
-
+from rlk.agents.components.helpers.lazy_import import LazyModule
 from rlk.agents.models.model_base import ModelBase
 
+keras = LazyModule('tensorflow.keras')
+
 
 class ConvNN(ModelBase):
     """A convolutional NN for Pong, similar to Google paper."""
 
-    def _model_architecture(self) -> Tuple[keras.layers.Layer, keras.layers.Layer]:
+    def _model_architecture(self) -> Tuple["keras.layers.Layer", "keras.layers.Layer"]:
         n_units = 512 * self.unit_scale
 
         frame_input = keras.layers.Input(name='input', shape=self.observation_shape)
@@ -1,13 +1,14 @@
 from typing import Tuple
 
-from tensorflow import keras
-
+from rlk.agents.components.helpers.lazy_import import LazyModule
 from rlk.agents.models.model_base import ModelBase
 
+keras = LazyModule('tensorflow.keras')
+
 
 class DenseNN(ModelBase):
 
-    def _model_architecture(self) -> Tuple[keras.layers.Layer, keras.layers.Layer]:
+    def _model_architecture(self) -> Tuple["keras.layers.Layer", "keras.layers.Layer"]:
         frame_input = keras.layers.Input(name='input', shape=self.observation_shape)
 
         # This flatten handles time buffered observations; for example if obs is (115, t) rather than (115 * t).
@@ -1,13 +1,14 @@
 from typing import Tuple
 
-from tensorflow import keras
-
+from rlk.agents.components.helpers.lazy_import import LazyModule
 from rlk.agents.models.model_base import ModelBase
 
+keras = LazyModule('tensorflow.keras')
+
 
 class DenserNN(ModelBase):
 
-    def _model_architecture(self) -> Tuple[keras.layers.Layer, keras.layers.Layer]:
+    def _model_architecture(self) -> Tuple["keras.layers.Layer", "keras.layers.Layer"]:
         frame_input = keras.layers.Input(name='input', shape=self.observation_shape)
         flat = keras.layers.Flatten(name='flatten')(frame_input)
         fc1 = keras.layers.Dense(int(flat.shape[1] / 1), name='fc1', activation='tanh')(flat)
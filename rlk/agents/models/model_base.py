@@ -1,9 +1,14 @@
 import abc
 from dataclasses import dataclass
-from typing import Tuple, Union, Callable
+from typing import List, Tuple, Union, Callable
 
-from tensorflow import keras
-from tensorflow.keras import backend as K
+import numpy as np
+
+from rlk.agents.components.helpers.lazy_import import LazyModule
+
+keras = LazyModule('tensorflow.keras')
+tf = LazyModule('tensorflow')
+K = LazyModule('tensorflow.keras.backend')
 
 
 @dataclass
@@ -27,7 +32,7 @@ class ModelBase(abc.ABC):
     opt: str = 'Adam'
     dueling: bool = False
 
-    def compile(self, model_name: str = 'model', loss: Union[str, Callable] = 'mse', **kwargs) -> keras.Model:
+    def compile(self, model_name: str = 'model', loss: Union[str, Callable] = 'mse', **kwargs) -> "keras.Model":
         """
         Compile a copy of the model using the provided loss.
 
@@ -37,11 +42,13 @@ class ModelBase(abc.ABC):
         :param model_name: Name of model
         :param loss: Model loss. Default 'mse'. Can be custom callable.
         """
-        # Get optimiser
+        # Get optimiser. Agents train with eager execution disabled, which needs the optimisers that support graph mode
+        # (get_updates). From TF 2.11 these are in keras.optimizers.legacy.
+        optimizers = getattr(keras.optimizers, 'legacy', keras.optimizers)
         if self.opt.lower() == 'adam':
-            opt = keras.optimizers.Adam
+            opt = optimizers.Adam
         elif self.opt.lower() == 'rmsprop':
-            opt = keras.optimizers.RMSprop
+            opt = optimizers.RMSprop
         else:
             raise ValueError(f"Invalid optimiser {self.opt}")
 
@@ -51,12 +58,46 @@ class ModelBase(abc.ABC):
 
         return model
 
+    def compile_with_weights(self, weights: List[np.ndarray], model_name: str = 'model',
+                             loss: Union[str, Callable] = 'mse',
+                             optimizer_weights: Union[None, List[np.ndarray]] = None, **kwargs) -> "keras.Model":
+        """
+        Compile a copy of the model, as .compile, and set its weights (and optionally its optimizer's weights).
+
+        :param weights: Model weights, as from model.get_weights().
+        :param model_name: Name of model.
+        :param loss: Model loss.
+        :param optimizer_weights: Optimizer weights, as from model.optimizer.get_weights(). Default None leaves the
+                                  optimizer new.
+        """
+        model = self.compile(model_name=model_name, loss=loss, **kwargs)
+        model.set_weights(weights)
+
+        if (optimizer_weights is not None) and (len(optimizer_weights) > 0):
+            self._create_optimizer_weights(model)
+            model.optimizer.set_weights(optimizer_weights)
+
+        return model
+
+    @staticmethod
+    def _create_optimizer_weights(model: "keras.Model") -> None:
+        """Create the optimizer's weights so they can be set. Otherwise they're only created on the first train step."""
+        optimizer = model.optimizer
+        if hasattr(optimizer, 'build'):
+            # Keras >= 2.11 optimizers
+            optimizer.build(model.trainable_variables)
+        else:
+            # OptimizerV2 (including keras.optimizers.legacy) creates them when applying gradients. Zero gradients leave
+            # the model weights unchanged, and the optimizer's own weights are overwritten when set after this.
+            optimizer.apply_gradients(zip([tf.zeros_like(v) for v in model.trainable_variables],
+                                          model.trainable_variables))
+
     @abc.abstractmethod
-    def _model_architecture(self) -> Tuple[keras.layers.Layer, keras.layers.Layer]:
+    def _model_architecture(self) -> Tuple["keras.layers.Layer", "keras.layers.Layer"]:
         """Define model construction function. Should return input layer and output layer."""
         pass
 
-    def _add_output(self, input_layer: keras.layers.Layer) -> keras.layers.Layer:
+    def _add_output(self, input_layer: "keras.layers.Layer") -> "keras.layers.Layer":
         """Add the model output - either dueling or not."""
         if self.dueling:
             # Separate layers for baseline value (1 node) and action advantages (n action nodes)
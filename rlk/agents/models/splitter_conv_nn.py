@@ -1,10 +1,10 @@
 from typing import Tuple, List, Iterable
 
-from tensorflow import keras
-
-from rlk.agents.models.layers.split_layer import SplitLayer
+from rlk.agents.components.helpers.lazy_import import LazyModule
 from rlk.agents.models.model_base import ModelBase
 
+keras = LazyModule('tensorflow.keras')
+
 
 class SplitterConvNN(ModelBase):
     def __init__(self, *args, additional_dense_input_shape: Tuple[int, ...] = None, **kwargs) -> None:
@@ -12,7 +12,7 @@ class SplitterConvNN(ModelBase):
         self.additional_dense_input_shape = additional_dense_input_shape
 
     @staticmethod
-    def _build_conv_branch(frame: keras.layers.Layer, name: str) -> keras.layers.Layer:
+    def _build_conv_branch(frame: "keras.layers.Layer", name: str) -> "keras.layers.Layer":
         conv1 = keras.layers.Conv2D(16, kernel_size=(8, 8), strides=(4, 4),
                                     name=f'conv1_frame_{name}', padding='same',
                                     activation='relu')(frame)
@@ -27,7 +27,10 @@ class SplitterConvNN(ModelBase):
 
         return flatten
 
-    def _model_architecture(self) -> Tuple[List[keras.layers.Layer], keras.layers.Layer]:
+    def _model_architecture(self) -> Tuple[List["keras.layers.Layer"], "keras.layers.Layer"]:
+        # Defines a keras layer, so importing requires TensorFlow
+        from rlk.agents.models.layers.split_layer import SplitLayer
+
         n_units = 512 * self.unit_scale
 
         frames_input = keras.layers.Input(name='conv_input', shape=self.observation_shape)
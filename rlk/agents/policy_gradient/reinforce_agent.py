@@ -1,12 +1,11 @@
 import os
 from dataclasses import dataclass, field
-from typing import List, Tuple, Union, Dict, Any, Callable, Iterable
+from typing import List, Tuple, Union, Dict, Any, Callable, Iterable, Iterator
 
 import joblib
 import numpy as np
 import tensorflow as tf
 from tensorflow import keras
-from tensorflow.keras import backend as K
 
 from rlk.agents.agent_base import AgentBase
 from rlk.agents.components.helpers.env_builder import EnvBuilder
@@ -31,6 +30,10 @@ class ReinforceAgent(AgentBase):
     At the end of an episode, the current episode is moved to the backlog. This is cleared after updating model,
     which can occur less often.
 
+    By default the whole backlog is stacked and used in a single update. If update_batch_size is set, the backlog is
+    instead streamed through the model in minibatches of at most this many steps, with an optimiser step for each. This
+    keeps memory use bounded for long episodes (eg. GFootball) and/or large update_every.
+
     TODO: Move replay buffer to agents.components.replay_buffer.episodic_buffer
     """
     training_history: TrainingHistory
@@ -43,8 +46,13 @@ class ReinforceAgent(AgentBase):
     alpha: float = 0.0001
     gamma: float = 0.99
     final_reward: Union[float, None] = None
+    update_batch_size: Union[int, None] = None
+
+    _unpicklable = ('_model',)
 
     def __post_init__(self) -> None:
+        self._check_update_batch_size(self.update_batch_size)
+
         self.env_builder = EnvBuilder(env_spec=self.env_spec, env_wrappers=self.env_wrappers,
                                       env_kwargs=self.env_kwargs)
 
@@ -58,6 +66,14 @@ class ReinforceAgent(AgentBase):
     def __getstate__(self) -> Dict[str, Any]:
         return self._pickle_compatible_getstate()
 
+    def _get_unpicklable_state(self) -> Dict[str, Any]:
+        return {'model': self._model.get_weights(), 'optimizer': self._model.optimizer.get_weights()}
+
+    def _set_unpicklable_state(self, state: Dict[str, Any]) -> None:
+        self._model = self.model_architecture.compile_with_weights(state['model'], model_name='action_model',
+                                                                   loss=reinforce_loss,
+                                                                   optimizer_weights=state['optimizer'])
+
     def _save_model(self):
         if not os.path.exists(f"{self._fn}"):
             os.mkdir(f"{self._fn}")
@@ -69,6 +85,12 @@ class ReinforceAgent(AgentBase):
         self._model = keras.models.load_model(f"{self._fn}/model",
                                               custom_objects={'reinforce_loss': reinforce_loss})
 
+    def get_weights(self) -> List[np.ndarray]:
+        return self._model.get_weights()
+
+    def set_weights(self, weights: List[np.ndarray]) -> None:
+        self._model.set_weights(weights)
+
     def unready(self) -> None:
         if self.ready:
             self._save_model()
@@ -80,7 +102,8 @@ class ReinforceAgent(AgentBase):
     def check_ready(self):
 
         if not self.ready:
-            self._load_model()
+            if not self._restore_unpicklable():
+                self._load_model()
 
             super().check_ready()
 
@@ -134,6 +157,11 @@ class ReinforceAgent(AgentBase):
         return actions_probs, np.random.choice(range(self.env.action_space.n),
                                                p=actions_probs)
 
+    def get_actions(self, ss: np.ndarray, training=None) -> np.ndarray:
+        """Sample an action for each of a batch of states, with one predict call. Returns only the actions."""
+        actions_probs = self._model.predict_on_batch(ss)
+        return np.array([np.random.choice(range(self.env.action_space.n), p=p) for p in actions_probs])
+
     def update_experience(self, s: np.ndarray, a: int, r: float, a_p: np.ndarray) -> None:
         """
         Add step of experience to the buffer.
@@ -169,26 +197,88 @@ class ReinforceAgent(AgentBase):
     def _flatten_list(nested_list: List[List[Any]]) -> List[Any]:
         return [item for sublist in nested_list for item in sublist]
 
-    def update_model(self) -> None:
-        # Stack all available episodes
+    @staticmethod
+    def _check_update_batch_size(batch_size: Union[int, None]) -> None:
+        if (batch_size is not None) and (batch_size <= 0):
+            raise ValueError(f"update_batch_size must be a positive number of steps (or None), not {batch_size}.")
 
-        states = np.concatenate(list(self._buffer_states.values()))
-        disc_rewards = np.concatenate(list(self._buffer_discounted_rewards.values()))
-        actions = np.concatenate(list(self._buffer_actions.values()))
-        action_probs = np.vstack(list(self._buffer_action_probs.values()))
+    def _iter_backlog_batches(self, batch_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray,
+                                                                       np.ndarray, np.ndarray]]:
+        """
+        Iterate over the backlog in minibatches of at most batch_size steps.
 
+        Minibatches can span episodes. Only the steps in each minibatch are stacked, so the full backlog is never
+        copied into a single array.
+
+        :param batch_size: Max number of steps per minibatch.
+        :return: Generator of (states, actions, action probs, discounted rewards).
+        """
+        self._check_update_batch_size(batch_size)
+
+        slices: List[Tuple[int, int, int]] = []
+        n = 0
+        for ep, ep_actions in self._buffer_actions.items():
+            start = 0
+            while start < len(ep_actions):
+                stop = min(len(ep_actions), start + batch_size - n)
+                slices.append((ep, start, stop))
+                n += stop - start
+                start = stop
+
+                if n == batch_size:
+                    yield self._stack_backlog_slices(slices)
+                    slices, n = [], 0
+
+        if n > 0:
+            yield self._stack_backlog_slices(slices)
+
+    def _stack_backlog_slices(self, slices: List[Tuple[int, int, int]]) -> Tuple[np.ndarray, np.ndarray,
+                                                                                   np.ndarray, np.ndarray]:
+        """Stack (episode, start, stop) slices of the backlog into arrays."""
+        states = np.array([s for ep, start, stop in slices for s in self._buffer_states[ep][start:stop]])
+        actions = np.concatenate([self._buffer_actions[ep][start:stop] for ep, start, stop in slices])
+        action_probs = np.array([a_p for ep, start, stop in slices
+                                 for a_p in self._buffer_action_probs[ep][start:stop]])
+        disc_rewards = np.concatenate([self._buffer_discounted_rewards[ep][start:stop] for ep, start, stop in slices])
+
+        return states, actions, action_probs, disc_rewards
+
+    def _train_on_batch(self, states: np.ndarray, actions: np.ndarray, action_probs: np.ndarray,
+                        disc_rewards: np.ndarray) -> None:
+        """
+        Calculate the policy gradient targets and train on them.
+
+        The targets are calculated in numpy (rather than with K.one_hot etc.), so with eager execution disabled, updates
+        only ever use the model's own train function and don't add new ops to the graph each time, which otherwise grows
+        memory use and update time over long runs.
+        """
         # One hot actions
-        actions_oh = K.one_hot(actions,
-                               num_classes=self.env.action_space.n)
+        actions_oh = np.eye(action_probs.shape[1], dtype=np.float32)[actions.astype(np.int64)]
 
         # Calculate prob updates
         dlogps = (actions_oh - action_probs) * disc_rewards
-        y = action_probs + self.alpha * dlogps
+        y = (action_probs + self.alpha * dlogps).astype(np.float32)
 
         # Train
         x = self.transform(states)
         self._model.train_on_batch(x, y)
 
+    def update_model(self) -> None:
+        if self.update_batch_size is not None:
+            # Stream backlog through model, with an update step for each minibatch
+            for states, actions, action_probs, disc_rewards in self._iter_backlog_batches(self.update_batch_size):
+                self._train_on_batch(states, actions, action_probs, disc_rewards)
+            return
+
+        # Stack all available episodes
+        states = np.concatenate(list(self._buffer_states.values()))
+        disc_rewards = np.concatenate(list(self._buffer_discounted_rewards.values()))
+        actions = np.concatenate(list(self._buffer_actions.values()))
+        action_probs = np.vstack(list(self._buffer_action_probs.values()))
+
+        # Train
+        self._train_on_batch(states, actions, action_probs, disc_rewards)
+
     def _play_episode(self, max_episode_steps: int = 500,
                       training: bool = False, render: bool = True) -> Tuple[float, int]:
         self.env._max_episode_steps = max_episode_steps
@@ -1,6 +1,7 @@
+import json
 import os
 import warnings
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Dict, Any, Union, Tuple, Iterable, Callable, List
 
 import joblib
@@ -37,6 +38,10 @@ class DeepQAgent(AgentBase):
     replay_buffer_samples: int = 75
     final_reward: Union[float, None] = None
 
+    _unpicklable = ('_action_model', '_target_model', 'replay_buffer')
+    # Version of the format written by .save_checkpoint
+    _checkpoint_version = 1
+
     def __post_init__(self) -> None:
         if self.env_builder_kwargs is None:
             self.env_builder_kwargs = {}
@@ -51,6 +56,19 @@ class DeepQAgent(AgentBase):
     def __getstate__(self) -> Dict[str, Any]:
         return self._pickle_compatible_getstate()
 
+    def _get_unpicklable_state(self) -> Dict[str, Any]:
+        return {'action_model': self._action_model.get_weights(),
+                'target_model': self._target_model.get_weights(),
+                'optimizer': self._action_model.optimizer.get_weights(),
+                'replay_buffer': self.replay_buffer}
+
+    def _set_unpicklable_state(self, state: Dict[str, Any]) -> None:
+        self._action_model = self.model_architecture.compile_with_weights(
+            state['action_model'], model_name='action_model', loss='mse', optimizer_weights=state['optimizer'])
+        self._target_model = self.model_architecture.compile_with_weights(state['target_model'],
+                                                                          model_name='target_model', loss='mse')
+        self.replay_buffer = state['replay_buffer']
+
     def _save_models_and_buffer(self) -> None:
         if not os.path.exists(f"{self._fn}"):
             os.mkdir(f"{self._fn}")
@@ -84,7 +102,8 @@ class DeepQAgent(AgentBase):
     def check_ready(self):
 
         if not self.ready:
-            self._load_models_and_buffer()
+            if not self._restore_unpicklable():
+                self._load_models_and_buffer()
 
             super().check_ready()
 
@@ -154,10 +173,10 @@ class DeepQAgent(AgentBase):
         """
 
         # Check row of the inputs
-        if isinstance(ss[0], np.ndarray):
-            # Input is array, can have multiple dimensions
-            ss_array = np.array(ss)
-            ss__array = np.array(ss_)
+        if not isinstance(ss[0], (list, tuple)):
+            # Input is array (or array-like, eg. LazyFrames), can have multiple dimensions
+            ss_array = np.stack(ss)
+            ss__array = np.stack(ss_)
             stack = np.vstack((ss_array, ss__array))
 
             return ss_array, ss__array, stack
@@ -289,7 +308,7 @@ class DeepQAgent(AgentBase):
                          returns best action.
         :return: The selected action.
         """
-        action = self.eps.select(state=s, greedy_option=lambda: self.get_best_action(s),
+        action = self.eps.select(state=s, greedy_option=self.get_best_action, greedy_args=(s,),
                                  training=training)
 
         return action
@@ -302,6 +321,24 @@ class DeepQAgent(AgentBase):
         """
         self._target_model.set_weights(self._action_model.get_weights())
 
+    def get_actions(self, ss: Union[np.ndarray, List[np.ndarray]], training: bool = False) -> np.ndarray:
+        """
+        Get actions for a batch of states (eg. one from each env of a vector env), with one predict call.
+
+        If training, epsilon is decayed once for each state and the states picked by EpsilonBase.explore_mask use the
+        exploration option.
+
+        :param ss: Batch of states, or list of batches for models with multiple inputs.
+        :param training: Use epsilon greedy and decay, as .get_action.
+        :return: Array of actions.
+        """
+        actions = np.argmax(self._action_model.predict_on_batch(ss), axis=1)
+        if training:
+            for i in np.flatnonzero(self.eps.explore_mask(len(actions))):
+                actions[i] = self.eps.explore_option([s[i] for s in ss] if isinstance(ss, (list, tuple)) else ss[i])
+
+        return actions
+
     def _play_episode(self, max_episode_steps: int = 500,
                       training: bool = False, render: bool = True) -> Tuple[float, int]:
         """
@@ -387,6 +424,88 @@ class DeepQAgent(AgentBase):
 
         return new_agent
 
+    def save_checkpoint(self) -> None:
+        """
+        Save a checkpoint that can be loaded quickly and lazily with .load_checkpoint.
+
+        Written to the same folder as .save, alongside (and not replacing) agent.joblib and the SavedModels:
+         - checkpoint.json: Manifest with format version and contents, written last so partial saves aren't loaded.
+         - checkpoint_agent.joblib: Agent settings, without models, buffer, or history.
+         - action_model.npz, target_model.npz, optimizer.npz: Model and optimizer weights.
+         - replay_buffer/: Buffer arrays, these are memory mapped on load, see ContinuousBuffer.save_arrays.
+         - history.npz: Training history columns, see TrainingHistory.save_columns.
+
+        Unlike .save, this doesn't unready the agent.
+        """
+        os.makedirs(self._fn, exist_ok=True)
+
+        state = self._pickle_compatible_getstate()
+        # The weights and buffer are saved separately below
+        state.pop('_unpicklable_state', None)
+        state['training_history'] = replace(self.training_history)
+        joblib.dump(state, f"{self._fn}/checkpoint_agent.joblib")
+
+        np.savez(f"{self._fn}/action_model.npz", *self._action_model.get_weights())
+        np.savez(f"{self._fn}/target_model.npz", *self._target_model.get_weights())
+        np.savez(f"{self._fn}/optimizer.npz", *self._action_model.optimizer.get_weights())
+        self.replay_buffer.save_arrays(f"{self._fn}/replay_buffer")
+        self.training_history.save_columns(f"{self._fn}/history.npz")
+
+        with open(f"{self._fn}/checkpoint.json", 'w') as f:
+            json.dump({'format_version': self._checkpoint_version, 'agent_class': type(self).__name__,
+                       'contents': ['checkpoint_agent.joblib', 'action_model.npz', 'target_model.npz',
+                                    'optimizer.npz', 'replay_buffer', 'history.npz']}, f)
+
+    @classmethod
+    def load_checkpoint(cls, fn: str, lazy: bool = True) -> "DeepQAgent":
+        """
+        Load an agent saved with .save_checkpoint, or with .save if the folder doesn't contain a checkpoint.
+
+        The action model is loaded immediately, so the agent is ready to act. If lazy, the target model and buffer are
+        loaded when first accessed (eg. at the first training step). The env is always built on first access.
+
+        :param fn: Agent folder, as for .load.
+        :param lazy: Delay loading the target model and replay buffer until they're used. If False load everything now.
+        """
+        if not os.path.exists(f"{fn}/checkpoint.json"):
+            return cls.load(fn)
+
+        with open(f"{fn}/checkpoint.json", 'r') as f:
+            manifest = json.load(f)
+        if manifest['format_version'] != cls._checkpoint_version:
+            raise ValueError(f"Unsupported checkpoint format version {manifest['format_version']}, "
+                             f"expected {cls._checkpoint_version}.")
+
+        new_agent = cls.__new__(cls)
+        new_agent.__dict__.update(joblib.load(f"{fn}/checkpoint_agent.joblib"))
+        new_agent._fn = fn
+
+        new_agent._action_model = new_agent._load_weights(f"{fn}/action_model.npz", model_name='action_model',
+                                                          optimizer_fn=f"{fn}/optimizer.npz")
+        new_agent.training_history = new_agent.training_history.load_columns(f"{fn}/history.npz",
+                                                                             epsilon_used=new_agent.eps)
+        new_agent._set_lazy('_target_model', lambda: new_agent._load_weights(f"{fn}/target_model.npz",
+                                                                             model_name='target_model'))
+        new_agent._set_lazy('replay_buffer', lambda: ContinuousBuffer.load_arrays(f"{fn}/replay_buffer"))
+        new_agent.ready = True
+
+        if not lazy:
+            _ = new_agent._target_model, new_agent.replay_buffer, new_agent.env
+
+        return new_agent
+
+    @staticmethod
+    def _load_npz(fn: str) -> List[np.ndarray]:
+        """Load a list of arrays saved with np.savez."""
+        with np.load(fn) as arrays:
+            return [arrays[f"arr_{i}"] for i in range(len(arrays.files))]
+
+    def _load_weights(self, fn: str, model_name: str, optimizer_fn: Union[None, str] = None) -> keras.Model:
+        """Compile a new model from the architecture and set its (and optionally its optimizer's) saved weights."""
+        return self.model_architecture.compile_with_weights(
+            self._load_npz(fn), model_name=model_name, loss='mse',
+            optimizer_weights=self._load_npz(optimizer_fn) if optimizer_fn is not None else None)
+
 
 if __name__ == "__main__":
     from rlk.environments.atari.pong.pong_config import PongConfig
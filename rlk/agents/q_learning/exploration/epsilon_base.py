@@ -1,11 +1,13 @@
 import abc
-import copy
 from dataclasses import dataclass
-from typing import Callable, Any, List, Union
+from typing import Callable, Any, Dict, List, Tuple, Union
 
-import matplotlib.pyplot as plt
 import numpy as np
 
+from rlk.agents.components.helpers.lazy_import import LazyModule
+
+plt = LazyModule('matplotlib.pyplot')
+
 
 @dataclass
 class EpsilonBase(abc.ABC):
@@ -19,6 +21,9 @@ class EpsilonBase(abc.ABC):
 
     .simulate runs epsilon and returns complete output with current settings, from current point.
 
+    .eps_current is read-only, as it's always the value of the schedule at the current step. Use .advance to move
+    along the schedule, or create a new object to use a different one.
+
     There's no protection against creating an object that increases epsilon, so be careful....
 
     Examples
@@ -54,16 +59,61 @@ class EpsilonBase(abc.ABC):
     perturb_increase_every: int = 0
     perturb_increase_mag: float = 0
 
+    # Number of eps values and random draws generated at a time for .select
+    _block_size = 4096
+
     def __post_init__(self) -> None:
         self._step: int = 0
-        self.eps_current = self.eps_initial
+        self._eps_current = self.eps_initial
 
         valid_decay = ('linear', 'compound')
         if self.decay_schedule.lower() not in valid_decay:
             raise ValueError(f"Invalid decay schedule {self.decay_schedule}. Pick from {valid_decay}.")
+        self._compound = self.decay_schedule.lower() == 'compound'
+        # Eps value at the start of each perturbation period, see ._period_start
+        self._period_starts: List[float] = []
+        # Precomputed eps values for the next steps, starting from _eps_block_start, see ._decay
+        self._eps_block: List[float] = []
+        self._eps_block_start: int = 1
 
         self._set_random_state()
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Pickle without the precomputed blocks, which are regenerated when needed.
+
+        Eps values are recalculated from the schedule. If a block of random draws is in use, the random state is
+        pickled as it was before the block was drawn, and the block is redrawn on unpickling so the sequence continues.
+        """
+        state = dict(self.__dict__)
+        state['_eps_block'] = []
+        state['_random_block'] = []
+        state.pop('_random_block_state', None)
+        if self._random_idx < len(self._random_block):
+            state['_state'] = np.random.RandomState()
+            state['_state'].set_state(self._random_block_state)
+        else:
+            state['_random_idx'] = 0
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        if (len(self._random_block) == 0) and (self._random_idx > 0):
+            random_idx = self._random_idx
+            self._draw_random_block()
+            self._random_idx = random_idx
+
+    @property
+    def eps_current(self) -> float:
+        """Eps at the current step of the schedule."""
+        return self._eps_current
+
+    @eps_current.setter
+    def eps_current(self, value: float) -> None:
+        raise AttributeError("eps_current is read-only, it follows the decay schedule. Use .advance to move along the "
+                             "schedule, or create a new object with different settings.")
+
     @abc.abstractmethod
     def _policy(self, state: np.ndarray) -> int:
         """How to select "other" action"""
@@ -71,55 +121,171 @@ class EpsilonBase(abc.ABC):
 
     def _set_random_state(self) -> None:
         self._state = np.random.RandomState(self.state)
+        self._random_block: List[float] = []
+        self._random_idx = 0
+
+    def _draw_random_block(self) -> None:
+        # The state before drawing is kept so the block can be redrawn rather than pickled, see .__getstate__
+        self._random_block_state = self._state.get_state()
+        # Stored as a list as indexing floats from it is faster than from an array
+        self._random_block = self._state.random(self._block_size).tolist()
+        self._random_idx = 0
+
+    def _random(self) -> float:
+        """Next random draw, these are generated in blocks from the random state (which gives the same sequence)."""
+        if self._random_idx >= len(self._random_block):
+            self._draw_random_block()
+
+        draw = self._random_block[self._random_idx]
+        self._random_idx += 1
+
+        return draw
+
+    def _randoms(self, n: int) -> np.ndarray:
+        """Next n random draws, continuing from the current block."""
+        draws = np.array(self._random_block[self._random_idx:self._random_idx + n])
+        self._random_idx += len(draws)
+        if len(draws) < n:
+            draws = np.concatenate((draws, self._state.random(n - len(draws))))
+            # Block is used up, and the random state has moved on past it
+            self._random_block = []
+            self._random_idx = 0
+
+        return draws
+
+    def _decay_steps(self, eps: Union[float, np.ndarray],
+                     steps: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+        """Value of eps after a number of steps of decay, ignoring eps_min and perturbation."""
+        if self._compound:
+            return eps * (1 - self.decay) ** steps
+        else:
+            return eps - self.decay * steps
+
+    def _period_start(self, period: int) -> float:
+        """
+        Eps value after the first step of a perturbation period (the step the perturbation is added on).
+
+        Within a period eps is just decayed (and floored at eps_min), so any value can be calculated from the start of
+        its period. The period starts depend on each other, so are calculated in order and cached.
+        """
+        while len(self._period_starts) <= period:
+            if len(self._period_starts) == 0:
+                new_eps = self._decay_steps(self.eps_initial, 1)
+            else:
+                period_end = max(self.eps_min, self._decay_steps(self._period_starts[-1],
+                                                                 self.perturb_increase_every - 1))
+                new_eps = self._decay_steps(period_end, 1) + self.perturb_increase_mag
+            self._period_starts.append(max(self.eps_min, new_eps))
+
+        return self._period_starts[period]
+
+    def _period_and_offset(self, steps: Union[int, np.ndarray]) -> Tuple[Union[int, np.ndarray],
+                                                                          Union[int, np.ndarray]]:
+        """Perturbation period each step is in, and the number of steps since that period started."""
+        if self.perturb_increase_every > 0:
+            return (steps - 1) // self.perturb_increase_every, (steps - 1) % self.perturb_increase_every
+        else:
+            return steps * 0, steps - 1
+
+    def eps_at(self, step: int) -> float:
+        """
+        Value of eps after a number of decay steps, in closed form, including eps_min and perturbation.
+
+        :param step: Number of decay steps (ie. training selections) from eps_initial. 0 is eps_initial.
+        """
+        if step <= 0:
+            return self.eps_initial
+
+        if self.perturb_increase_every > 0:
+            period, offset = divmod(step - 1, self.perturb_increase_every)
+        else:
+            period, offset = 0, step - 1
 
-    def _linear_decay(self) -> float:
-        return self.eps_current - self.decay
+        period_start = self._period_starts[period] if period < len(self._period_starts) else self._period_start(period)
+        if self._compound:
+            eps = period_start * (1 - self.decay) ** offset
+        else:
+            eps = period_start - self.decay * offset
 
-    def _compound_decay(self) -> float:
-        return self.eps_current - self.eps_current * self.decay
+        return eps if eps > self.eps_min else self.eps_min
 
-    def _decay(self):
-        new_eps = np.nan
-        if self.decay_schedule.lower() == 'linear':
-            new_eps = self._linear_decay()
+    def schedule(self, start: int = 1, steps: int = 10000) -> np.ndarray:
+        """
+        Values of eps for a range of decay steps, calculated without stepping through them.
 
-        if self.decay_schedule.lower() == 'compound':
-            new_eps = self._compound_decay()
+        :param start: First step, see .eps_at. Should be 1 or more.
+        :param steps: Number of steps.
+        """
+        if start < 1:
+            raise ValueError(f"Schedule must start from step 1 or later, not {start}.")
+        if steps <= 0:
+            return np.empty(0)
 
-        if (self.perturb_increase_every > 0) and (self._step > 0) and (
-                not self._step % self.perturb_increase_every):
-            new_eps += self.perturb_increase_mag
+        step = np.arange(start, start + steps)
+        period, offset = self._period_and_offset(step)
+        period_starts = np.array([self._period_start(p) for p in range(period[0], period[-1] + 1)])
 
+        return np.maximum(self.eps_min, self._decay_steps(period_starts[period - period[0]], offset))
+
+    def _decay(self) -> float:
+        """Move on one step and return the new eps value, from a block of precomputed values."""
         self._step += 1
 
-        return max(self.eps_min, new_eps)
+        idx = self._step - self._eps_block_start
+        if not (0 <= idx < len(self._eps_block)):
+            self._eps_block = self.schedule(start=self._step, steps=self._block_size).tolist()
+            self._eps_block_start = self._step
+            idx = 0
+
+        return self._eps_block[idx]
+
+    def advance(self, n: int) -> None:
+        """Decay for n steps without selecting anything."""
+        self._step += n
+        self._eps_current = self.eps_at(self._step)
 
-    def select(self, state: Union[None, np.ndarray], greedy_option: Callable, training: bool = False) -> Any:
+    def select(self, state: Union[None, np.ndarray], greedy_option: Callable, training: bool = False,
+               greedy_args: Tuple[Any, ...] = ()) -> Any:
         """
         Apply epsilon greedy selection.
 
         If training, decay epsilon, and return selected option. If not training, just return greedy_option.
 
-        Use of lambdas is to avoid unnecessarily picking between two pre-computed options.
+        Use of a callable is to avoid unnecessarily picking between two pre-computed options.
 
         :param greedy_option: Function to evaluate if random option is NOT picked.
         :param training: Bool indicating if call is during training and to use epsilon greedy and decay.
+        :param greedy_args: Args to call greedy_option with. Avoids needing to create a new closure for each call.
         :return: Evaluated selected option.
         """
         if training:
-            self.eps_current = self._decay()
-            if self._state.random() < self.eps_current:
+            self._eps_current = self._decay()
+            if self._random() < self._eps_current:
                 return self._policy(state)
 
-        return greedy_option()
+        return greedy_option(*greedy_args)
+
+    def explore_option(self, state: Union[None, np.ndarray]) -> Any:
+        """The option used when exploring, eg. for the selections .explore_mask picks."""
+        return self._policy(state)
+
+    def explore_mask(self, n: int) -> np.ndarray:
+        """
+        Decay for n training selections at once, and return which of them should explore.
+
+        For batched selection, eg. one step in each of n envs.
+
+        :param n: Number of selections.
+        :return: Bool array, True where the random option should be used.
+        """
+        eps_values = self.schedule(start=self._step + 1, steps=n)
+        self.advance(n)
 
-    def simulate(self, steps: int = 10000, plot: bool = False) -> List[float]:
-        eps = copy.copy(self)
+        return self._randoms(n) < eps_values
 
-        eps_value = []
-        for _ in range(steps):
-            eps.select(lambda: 0, lambda: 1, training=True)
-            eps_value.append(eps.eps_current)
+    def simulate(self, steps: int = 10000, plot: bool = False) -> np.ndarray:
+        """Eps values for the next steps training selections, from the current step. Doesn't modify this object."""
+        eps_value = self.schedule(start=self._step + 1, steps=steps)
 
         if plot:
             plt.plot(eps_value)
@@ -130,7 +296,8 @@ class EpsilonBase(abc.ABC):
         return eps_value
 
     @classmethod
-    def future_value(cls, eps: float, decay: float, steps: int, decay_schedule: str) -> float:
+    def future_value(cls, eps: float, decay: float, steps: Union[int, np.ndarray],
+                     decay_schedule: str) -> Union[float, np.ndarray]:
         """
         Calculate what eps will be after a number of steps.
 
@@ -139,10 +306,11 @@ class EpsilonBase(abc.ABC):
 
         :param eps: Current/initial epsilon.
         :param decay: Decay rate per step.
-        :param steps: Number of steps (usually training frames, rather than whole episodes)
+        :param steps: Number of steps (usually training frames, rather than whole episodes). Can be an array.
         :param decay_schedule: 'linear' or 'compound'.
         :return:
         """
+        steps = np.asarray(steps) if isinstance(steps, (list, tuple)) else steps
         if decay_schedule.lower() == 'compound':
             return eps * (1 - decay) ** steps
 
@@ -111,7 +111,7 @@ class LinearQAgent(AgentBase):
                          returns best action.
         :return: The selected action.
         """
-        action = self.eps.select(state=s, greedy_option=lambda: self.get_best_action(s),
+        action = self.eps.select(state=s, greedy_option=self.get_best_action, greedy_args=(s,),
                                  training=training)
 
         return action
@@ -32,7 +32,7 @@ class RandomAgent(AgentBase):
 
     def _build_model(self) -> None:
         """Set model function. Note using a lambda breaks pickle support."""
-        self.model = RandomModel(self.env.action_space.n)
+        self.model = RandomModel(self.env_builder.action_space.n)
 
     def update_model(self, *args, **kwargs) -> None:
         """No model to update."""
@@ -22,9 +22,10 @@ class AtariDefaultConfig(ConfigBase):
     supported_modes = ('diff', 'stack')
     gpu_memory: int = 2048
 
-    _wrappers_stack = (MaxAndSkipWrapper, ImageProcessWrapper, FireStartWrapper, FrameBufferWrapper)
-    _wrappers_diff = (MaxAndSkipWrapper, ImageProcessWrapper, FireStartWrapper,
-                      partial(FrameBufferWrapper, buffer_length=2, buffer_function='diff'))
+    _wrappers_stack = (partial(MaxAndSkipWrapper, reuse_obs=True), partial(ImageProcessWrapper, fast=True),
+                       FireStartWrapper, partial(FrameBufferWrapper, lazy=True))
+    _wrappers_diff = (partial(MaxAndSkipWrapper, reuse_obs=True), partial(ImageProcessWrapper, fast=True),
+                      FireStartWrapper, partial(FrameBufferWrapper, buffer_length=2, buffer_function='diff'))
 
     def __init__(self, *args, mode: str = 'diff', **kwargs) -> None:
         super().__init__(*args, **kwargs)
@@ -36,15 +37,9 @@ class AtariDefaultConfig(ConfigBase):
         if self.mode == "diff":
             self.env_wrappers = self._wrappers_diff
             self.frame_depth = 1
-            self.wrapped_env = FrameBufferWrapper(
-                FireStartWrapper(ImageProcessWrapper(MaxAndSkipWrapper(self.unwrapped_env))),
-                buffer_length=2, buffer_function='diff')
         if self.mode == "stack":
             self.env_wrappers = self._wrappers_stack
             self.frame_depth = 3
-            self.wrapped_env = FrameBufferWrapper(FireStartWrapper(
-                ImageProcessWrapper(MaxAndSkipWrapper(self.unwrapped_env))),
-                buffer_length=3, buffer_function='stack')
 
     def _build_for_dqn(self) -> Dict[str, Any]:
         return {'name': os.path.join(self.folder, 'DeepQAgent'),
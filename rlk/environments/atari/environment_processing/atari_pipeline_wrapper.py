@@ -0,0 +1,97 @@
+from functools import partial
+from typing import Any, Callable, Dict, Tuple, Type, Union
+
+import gym
+import numpy as np
+
+from rlk.environments.atari.environment_processing.fire_start_wrapper import FireStartWrapper
+from rlk.environments.atari.environment_processing.frame_buffer_wrapper import FrameBufferWrapper, FrameStack
+from rlk.environments.atari.environment_processing.image_process_wrapper import AtariFrameProcessor, \
+    ImageProcessWrapper
+from rlk.environments.atari.environment_processing.max_and_skip_wrapper import MaxAndSkipWrapper
+from rlk.environments.preprocessing.lazy_frames import LazyFrames, output_dtype
+
+
+class AtariPipelineWrapper(MaxAndSkipWrapper):
+    """
+    Single wrapper doing the work of MaxAndSkipWrapper, ImageProcessWrapper, FireStartWrapper and FrameBufferWrapper.
+
+    Each step, the action is repeated and the last frames max pooled into a reused array (using the ALE fast path of
+    MaxAndSkipWrapper where possible), which is processed (grayscale, resize, crop, scale) straight into the frame
+    store slot for the new frame, and the buffer is returned stacked or diffed. This avoids the per wrapper dispatch
+    and intermediate arrays of the chained wrappers, and the output is the same as the chain returned by
+    .chained_wrappers with the same options.
+
+    Eg. to replace the chain in AtariDefaultConfig:
+    >>> env_wrappers = (partial(AtariPipelineWrapper, buffer_length=2, buffer_function='diff'),)
+
+    See scripts/benchmark_atari_pipeline.py for a comparison with the chained wrappers.
+    """
+
+    def __init__(self, env: gym.Env,
+                 frame_buffer_length: int = 2,
+                 n_action_frames: int = 4,
+                 dtype: Type = np.float32,
+                 fast: bool = True,
+                 fire_start: bool = True,
+                 fire_action_id: int = 1,
+                 buffer_length: int = 3,
+                 buffer_function: str = 'stack',
+                 lazy: bool = False) -> None:
+        """
+        :param env: Gym env.
+        :param frame_buffer_length: Number of frames to max pool, see MaxAndSkipWrapper.
+        :param n_action_frames: Number of frames to repeat action for, see MaxAndSkipWrapper.
+        :param dtype: Output dtype, see ImageProcessWrapper.
+        :param fast: Use fast processing, see ImageProcessWrapper.
+        :param fire_start: Press fire on reset, see FireStartWrapper.
+        :param fire_action_id: Action used to fire.
+        :param buffer_length: Number of processed frames to stack, see FrameBufferWrapper.
+        :param buffer_function: 'stack' or 'diff', see FrameBufferWrapper.
+        :param lazy: Return LazyFrames, see FrameBufferWrapper.
+        """
+        super().__init__(env, frame_buffer_length=frame_buffer_length, n_action_frames=n_action_frames,
+                         reuse_obs=True)
+        self.fire_start = fire_start
+        self.fire_action_id = fire_action_id
+        self._processor = AtariFrameProcessor(dtype=dtype, fast=fast)
+        self._frame_stack = FrameStack(obs_shape=AtariFrameProcessor.output_shape, buffer_length=buffer_length,
+                                       buffer_function=buffer_function, lazy=lazy)
+        high = 255 if self._processor.uint8_output else 1
+        self.observation_space = gym.spaces.Box(low=-high if buffer_function == 'diff' else 0, high=high,
+                                                shape=self._frame_stack.output_shape,
+                                                dtype=output_dtype([np.dtype(dtype)], buffer_function))
+
+    @staticmethod
+    def chained_wrappers(frame_buffer_length: int = 2, n_action_frames: int = 4, dtype: Type = np.float32,
+                         fast: bool = True, fire_start: bool = True, fire_action_id: int = 1, buffer_length: int = 3,
+                         buffer_function: str = 'stack', lazy: bool = False) -> Tuple[Callable, ...]:
+        """The equivalent chain of separate wrappers, for the same options."""
+        wrappers = [partial(MaxAndSkipWrapper, frame_buffer_length=frame_buffer_length,
+                            n_action_frames=n_action_frames, reuse_obs=True),
+                    partial(ImageProcessWrapper, dtype=dtype, fast=fast)]
+        if fire_start:
+            wrappers.append(partial(FireStartWrapper, fire_action_id=fire_action_id))
+        wrappers.append(partial(FrameBufferWrapper, obs_shape=AtariFrameProcessor.output_shape,
+                                buffer_length=buffer_length, buffer_function=buffer_function, lazy=lazy))
+
+        return tuple(wrappers)
+
+    def _process(self, pooled: np.ndarray) -> np.ndarray:
+        """Process a pooled frame, into the frame store if possible."""
+        return self._processor.process(pooled, out=self._frame_stack.next_slot())
+
+    def step(self, action: int) -> Tuple[Union[np.ndarray, LazyFrames], float, bool, Dict[Any, Any]]:
+        pooled, reward, done, info = super().step(action)
+        self._frame_stack.add(self._process(pooled))
+
+        return self._frame_stack.get(), reward, done, info
+
+    def reset(self) -> Union[np.ndarray, LazyFrames]:
+        obs = super().reset()
+        if self.fire_start:
+            obs, _, _, _ = super().step(self.fire_action_id)
+
+        self._frame_stack.reset(self._processor.process(obs))
+
+        return self._frame_stack.get()
@@ -1,9 +1,80 @@
-import collections
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple, Union
 
 import gym
 import numpy as np
 
+from rlk.environments.preprocessing.lazy_frames import LazyFrames, combine_frames, output_dtype
+
+
+class FrameStack:
+    """
+    Buffer of the most recent frames, returned stacked (or diffed), see FrameBufferWrapper.
+
+    Eager mode copies frames into a preallocated circular store; .next_slot gives the store slot the next frame goes
+    in, so it can be written there directly. Lazy mode keeps references to the frames and returns LazyFrames.
+    """
+
+    def __init__(self, obs_shape: Tuple[int, ...] = (84, 84), buffer_length: int = 3, buffer_function: str = 'stack',
+                 lazy: bool = False) -> None:
+        if buffer_function not in ('stack', 'diff'):
+            raise ValueError(f"Unknown buffer op {buffer_function}")
+        if (buffer_function == 'diff') and (buffer_length != 2):
+            raise ValueError("When using diff, buffer length must be 2.")
+
+        self.obs_shape = tuple(obs_shape)
+        self.buffer_length = buffer_length
+        self.buffer_function = buffer_function
+        self.lazy = lazy
+
+        # Circular store of frames (eager) or frame references (lazy). _head is the index of the oldest frame.
+        self._frame_store: Union[None, np.ndarray] = None
+        self._frame_refs: List[np.ndarray] = []
+        self._head: int = 0
+
+    @property
+    def output_shape(self) -> Tuple[int, ...]:
+        return self.obs_shape + ((self.buffer_length,) if self.buffer_function == 'stack' else (1,))
+
+    def reset(self, obs: np.ndarray) -> None:
+        """Fill buffer with zero frames, using dtype of obs, then add obs."""
+        zeros = np.zeros(shape=self.obs_shape, dtype=obs.dtype)
+        self._head = 0
+        if self.lazy:
+            self._frame_refs = [zeros] * self.buffer_length
+        elif (self._frame_store is None) or (self._frame_store.dtype != obs.dtype):
+            self._frame_store = np.zeros(shape=(self.buffer_length,) + self.obs_shape, dtype=obs.dtype)
+        else:
+            self._frame_store[:] = 0
+
+        self.add(obs)
+
+    def next_slot(self) -> Union[None, np.ndarray]:
+        """Store slot the next frame will be added to (eager mode after reset), or None."""
+        if self.lazy or (self._frame_store is None):
+            return None
+
+        return self._frame_store[self._head]
+
+    def add(self, obs: np.ndarray) -> None:
+        """Replace the oldest frame with obs."""
+        if self.lazy:
+            self._frame_refs[self._head] = obs
+        else:
+            slot = self._frame_store[self._head]
+            if obs is not slot:
+                np.copyto(slot, np.reshape(obs, self.obs_shape))
+        self._head = (self._head + 1) % self.buffer_length
+
+    def get(self) -> Union[np.ndarray, LazyFrames]:
+        order = [(self._head + i) % self.buffer_length for i in range(self.buffer_length)]
+
+        if self.lazy:
+            return LazyFrames(tuple(self._frame_refs[i] for i in order), obs_shape=self.obs_shape,
+                              buffer_function=self.buffer_function)
+
+        return combine_frames([self._frame_store[i] for i in order], obs_shape=self.obs_shape,
+                               buffer_function=self.buffer_function)
+
 
 class FrameBufferWrapper(gym.Wrapper):
     """
@@ -11,12 +82,18 @@ class FrameBufferWrapper(gym.Wrapper):
 
     Returned buffer contains previous steps, eg. for env.step at t=3, returns obs for t=3, t=2, t=1. In games like pong,
     this adds directional information to the returned observations.
+
+    Frames are copied into a preallocated circular store, and each step the stacked (or diffed) observation is written
+    directly into a single new array. With lazy=True, the wrapper instead returns LazyFrames referencing the frames
+    from the inner env, and no stacked array is created until one is needed. This requires the inner env to return
+    new frame arrays each step (rather than modifying one in place), as the Atari, Doom and GFootball wrappers do.
     """
 
     def __init__(self, env: gym.Env,
-                 obs_shape: Tuple[int, int] = (84, 84),
+                 obs_shape: Tuple[int, ...] = (84, 84),
                  buffer_length: int = 3,
-                 buffer_function: str = 'stack') -> None:
+                 buffer_function: str = 'stack',
+                 lazy: bool = False) -> None:
         """
         :param env: Gym env.
         :param obs_shape: Expected shape of single observation.
@@ -24,54 +101,46 @@ class FrameBufferWrapper(gym.Wrapper):
         :param buffer_function: Function to apply to use contents of buffer. Supports 'stack or 'diff':
                                   - 'stack' stack contents of buffer on a new (final) axis
                                   - 'diff' take diff between two frames without changing dimensions.
+        :param lazy: Return LazyFrames rather than arrays.
         """
         super().__init__(env)
-        self._buffer_length = buffer_length
-        self._buffer_function = buffer_function
-        self._obs_shape = obs_shape
-        self._prepare_obs_buffer()
-
-    def _prepare_obs_buffer(self) -> None:
-        """Create buffer and preallocate with empty arrays of expected shape."""
-
-        self._obs_buffer = collections.deque(maxlen=self._buffer_length)
+        self._frames = FrameStack(obs_shape=obs_shape, buffer_length=buffer_length, buffer_function=buffer_function,
+                                  lazy=lazy)
+        self.observation_space = self._buffered_space(env.observation_space)
 
-        for _ in range(self._buffer_length):
-            self._obs_buffer.append(np.zeros(shape=self._obs_shape))
+    @property
+    def lazy(self) -> bool:
+        return self._frames.lazy
 
-    def _buffer_obs(self) -> np.ndarray:
-        agg_buff = None
-
-        if self._buffer_function == "stack":
-            agg_buff = np.stack([obs.squeeze() for obs in self._obs_buffer],
-                                axis=len(self._obs_shape))
+    def _buffered_space(self, space: gym.Space) -> gym.Space:
+        """
+        Space of the buffered observations, from the space of single frames.
 
-        if self._buffer_function == 'diff':
-            if self._buffer_length != 2:
-                raise ValueError("When using diff, buffer length must be 2.")
-            agg_buff = self._obs_buffer[1].squeeze() - self._obs_buffer[0].squeeze()
-            agg_buff = np.expand_dims(agg_buff,
-                                      axis=len(self._obs_shape))
+        Stacking keeps the frame dtype and bounds. Diff bounds are the largest change either way, and diff of unsigned
+        frames is signed (eg. uint8 in [0, 255] -> int16 in [-255, 255]), see output_dtype.
+        """
+        if not isinstance(space, gym.spaces.Box):
+            return space
 
-        if agg_buff is None:
-            raise ValueError(f"Unknown buffer op {self._buffer_function}")
+        low, high = float(np.min(space.low)), float(np.max(space.high))
+        if self._frames.buffer_function == 'diff':
+            low, high = low - high, high - low
 
-        return agg_buff
+        return gym.spaces.Box(low=low, high=high, shape=self._frames.output_shape,
+                              dtype=output_dtype([space.dtype], self._frames.buffer_function))
 
-    def step(self, action: int) -> Tuple[np.ndarray, float, bool, Dict[Any, Any]]:
+    def step(self, action: int) -> Tuple[Union[np.ndarray, LazyFrames], float, bool, Dict[Any, Any]]:
         """Step env, add new obs to buffer, return buffer."""
         obs, reward, done, info = self.env.step(action)
-        self._obs_buffer.append(obs)
+        self._frames.add(obs)
 
-        return self._buffer_obs(), reward, done, info
+        return self._frames.get(), reward, done, info
 
-    def reset(self) -> np.ndarray:
+    def reset(self) -> Union[np.ndarray, LazyFrames]:
         """Add initial obs to end of pre-allocated buffer.
 
         :return: Buffered observation
         """
-        self._prepare_obs_buffer()
-        obs = self.env.reset()
-        self._obs_buffer.append(obs)
+        self._frames.reset(np.asarray(self.env.reset()))
 
-        return self._buffer_obs()
+        return self._frames.get()
@@ -1,39 +1,126 @@
-from typing import Type
+from typing import Dict, Type, Union
 
 import cv2
 import gym
 import numpy as np
 
 
+class AtariFrameProcessor:
+    """
+    Converts frames from (210, 160, 3) or (250, 160, 3) to (84, 84), see ImageProcessWrapper.
+
+    Holds the buffers used for fast processing, so it can be shared by wrappers doing the same processing (eg.
+    AtariPipelineWrapper).
+    """
+    _resolutions = ((210, 160, 3), (250, 160, 3))
+    # Size frames are resized to (width, height), before cropping rows to 84 x 84
+    _resize_to = (84, 110)
+    _crop_rows = slice(18, 102)
+    output_shape = (84, 84)
+
+    def __init__(self, dtype: Type = np.float32, fast: bool = False) -> None:
+        """
+        :param dtype: Output dtype. Float types are scaled to 0 -> 1, uint8 output is left 0 -> 255.
+        :param fast: Use uint8 processing with preallocated buffers. Frames that aren't uint8 use the default
+                     processing.
+        """
+        self.dtype = dtype
+        self.fast = fast
+
+        # Preallocated grayscale and resize buffers for the fast path, by frame height
+        self._gray_buffers: Dict[int, np.ndarray] = {h: np.empty((h, w), dtype=np.uint8)
+                                                     for h, w, _ in self._resolutions}
+        self._resized_buffer = np.empty(self._resize_to[::-1], dtype=np.uint8)
+
+    @property
+    def uint8_output(self) -> bool:
+        return np.dtype(self.dtype) == np.uint8
+
+    def process(self, frame: np.ndarray, out: Union[None, np.ndarray] = None) -> np.ndarray:
+        """
+        :param frame: Frame to process.
+        :param out: Array of output_shape and dtype to write the output to. If not set, a new array is returned.
+        """
+        for shape in self._resolutions:
+            if frame.size == np.prod(shape):
+                img = np.reshape(frame, shape)
+                break
+        else:
+            raise ValueError("Unknown resolution.")
+
+        if self.fast and (img.dtype == np.uint8):
+            return self._process_fast(img, out=out)
+
+        processed = self._process(img)
+        if out is None:
+            return processed
+
+        np.copyto(out, processed)
+
+        return out
+
+    def _process(self, img: np.ndarray) -> np.ndarray:
+        img = img.astype(np.float32 if self.uint8_output else self.dtype)
+        img = img[:, :, 0] * 0.299 + img[:, :, 1] * 0.587 + img[:, :, 2] * 0.114
+        resized_screen = cv2.resize(img, self._resize_to, interpolation=cv2.INTER_AREA)
+        x_t = resized_screen[self._crop_rows, :]
+
+        if self.uint8_output:
+            return np.round(x_t).astype(np.uint8)
+
+        return x_t.astype(self.dtype) / 255.0
+
+    def _process_fast(self, img: np.ndarray, out: Union[None, np.ndarray] = None) -> np.ndarray:
+        gray = self._gray_buffers[img.shape[0]]
+        cv2.cvtColor(np.ascontiguousarray(img), cv2.COLOR_RGB2GRAY, dst=gray)
+        # INTER_AREA at this (non-integer) scale doesn't give the same pixels if the frame is cropped before resizing,
+        # so the crop is taken as a view of the resize buffer instead.
+        cv2.resize(gray, self._resize_to, dst=self._resized_buffer, interpolation=cv2.INTER_AREA)
+        cropped = self._resized_buffer[self._crop_rows, :]
+
+        # Output is a new array unless out is given, as downstream wrappers (eg. FrameBufferWrapper) may keep
+        # references to observations
+        if out is None:
+            out = np.empty(cropped.shape, dtype=self.dtype)
+        if self.uint8_output:
+            np.copyto(out, cropped)
+        else:
+            np.multiply(cropped, out.dtype.type(1 / 255), out=out)
+
+        return out
+
+
 class ImageProcessWrapper(gym.ObservationWrapper):
     """
     Convert frames from (210, 160, 3) or (250, 160, 3) to (84, 84, 1).
-    Scales from 0 -> 255 to 0 -> 1.
+    Scales from 0 -> 255 to 0 -> 1 (unless dtype is uint8).
+
+    With fast=True, uint8 frames are converted to grayscale and resized as uint8 by OpenCV, into buffers preallocated
+    for each frame size, and the output is created directly from the cropped resize buffer. This avoids the full size
+    float temporaries of the default processing and is around 2x faster. Output is within 1/255 of the default due to
+    rounding of the intermediate uint8 grayscale and resized images.
 
     Based on ProcessFrame84, ScaledFloatFrame, ImageToPyTorch wrappers:
     https://github.com/PacktPublishing/Deep-Reinforcement-Learning-Hands-On/blob/master/Chapter06/lib/wrappers.py
     """
 
-    def __init__(self, env: gym.Env, dtype: Type = np.float32) -> None:
+    def __init__(self, env: gym.Env, dtype: Type = np.float32, fast: bool = False) -> None:
+        """
+        :param env: Gym env.
+        :param dtype: Output dtype. Float types are scaled to 0 -> 1, uint8 output is left 0 -> 255.
+        :param fast: Use uint8 processing with preallocated buffers (see above). Frames that aren't uint8 use the default
+                     processing.
+        """
         super().__init__(env)
         self.dtype = dtype
+        self.fast = fast
+        self._processor = AtariFrameProcessor(dtype=dtype, fast=fast)
         # New env obs space shape
-        self.observation_space = gym.spaces.Box(low=0, high=1, shape=(84, 84, 1),
-                                                dtype=self.dtype)
+        self.observation_space = gym.spaces.Box(low=0, high=255 if self._processor.uint8_output else 1,
+                                                shape=(84, 84, 1), dtype=self.dtype)
 
     def observation(self, obs: np.ndarray) -> np.ndarray:
         return self.process(obs)
 
     def process(self, frame: np.ndarray) -> np.ndarray:
-        if frame.size == 210 * 160 * 3:
-            img = np.reshape(frame, [210, 160, 3]).astype(self.dtype)
-        elif frame.size == 250 * 160 * 3:
-            img = np.reshape(frame, [250, 160, 3]).astype(self.dtype)
-        else:
-            raise ValueError("Unknown resolution.")
-        img = img[:, :, 0] * 0.299 + img[:, :, 1] * 0.587 + img[:, :, 2] * 0.114
-        resized_screen = cv2.resize(img, (84, 110), interpolation=cv2.INTER_AREA)
-        x_t = resized_screen[18:102, :]
-        x_t = np.reshape(x_t, [84, 84, 1]).astype(self.dtype) / 255.0
-
-        return x_t.squeeze()
+        return self._processor.process(frame)
@@ -1,17 +1,29 @@
-import collections
-from typing import Any, Dict, Tuple, Callable
+from typing import Any, Dict, Tuple, Callable, List, Union
 
 import gym
 import numpy as np
+from gym.wrappers import TimeLimit
 
 
 class MaxAndSkipWrapper(gym.Wrapper):
-    """Pools frames across steps, returning max, and repeat action for a number of frames."""
+    """
+    Pools frames across steps, returning max, and repeat action for a number of frames.
+
+    The most recent frames are kept in a fixed ring of frame_buffer_length slots rather than a growing buffer, and the
+    default max aggregation is done with np.maximum into a single output array, rather than stacking the frames.
+
+    If the inner env is a (non-frameskipping) Atari env, optionally wrapped in TimeLimit, the action is applied
+    directly with the emulator, and the screen is only fetched (into preallocated slots) for the frames that are
+    aggregated. This skips rendering the other frames, which for the default 4 action frames and 2 buffered frames
+    halves the screen fetches and copies. If the game ends on a frame that wasn't fetched, the screen at the end is
+    used.
+    """
 
     def __init__(self, env: gym.Env,
                  frame_buffer_length: int = 2,
                  n_action_frames: int = 4,
-                 frame_buffer_agg_f: Callable = np.max) -> None:
+                 frame_buffer_agg_f: Callable = np.max,
+                 reuse_obs: bool = False) -> None:
         """
 
         :param env: Gym environment to wrap, "inner environment".
@@ -19,18 +31,95 @@ class MaxAndSkipWrapper(gym.Wrapper):
         :param n_action_frames: Number of frames to repeat action for. Can be longer than frame buffer.
         :param frame_buffer_agg_f: Function used to aggregate frames in frame buffer to create observation.
                                    Default np.max.
+        :param reuse_obs: Aggregate into the same output array each step (with default max aggregation), so nothing is
+                          allocated per step. Only use when the observation is used before the next step, eg. by
+                          ImageProcessWrapper.
         """
         super().__init__(env)
         self._n_action_frames = n_action_frames
         self._frame_buffer_length = frame_buffer_length
         self._frame_buffer_agg_f = frame_buffer_agg_f
+        self.reuse_obs = reuse_obs
+
+        self._ale, self._time_limit = self._find_ale(env)
+        self._out: Union[None, np.ndarray] = None
         self._prepare_frame_buffer()
 
-    def _prepare_frame_buffer(self) -> None:
-        self._frame_buffer = collections.deque(maxlen=self._frame_buffer_length)
+    @staticmethod
+    def _find_ale(env: gym.Env) -> Tuple[Any, Union[None, TimeLimit]]:
+        """Get the ALE interface if env is an unskipped Atari image env, with no wrappers other than TimeLimit."""
+        time_limit = None
+        while isinstance(env, gym.Wrapper):
+            if not isinstance(env, TimeLimit):
+                return None, None
+            time_limit = env
+            env = env.env
+
+        ale = getattr(env, 'ale', None)
+        if (ale is None) or (getattr(env, 'frameskip', None) != 1) or (getattr(env, '_obs_type', None) != 'image'):
+            return None, None
+
+        return ale, time_limit
+
+    def _prepare_frame_buffer(self, obs: Union[None, np.ndarray] = None) -> None:
+        """Reset the ring of frames. For the ALE path, the slots are preallocated arrays filled with obs."""
+        self._head = 0
+        self._n_frames = 0
+        if (self._ale is not None) and (obs is not None):
+            self._frames: List[Union[None, np.ndarray]] = [obs.copy() for _ in range(self._frame_buffer_length)]
+        else:
+            self._frames = [None] * self._frame_buffer_length
+
+    @property
+    def _frame_buffer(self) -> List[np.ndarray]:
+        """Buffered frames, oldest first."""
+        start = self._head - self._n_frames
+        return [self._frames[i % self._frame_buffer_length] for i in range(start, self._head)]
+
+    def _append_frame(self, obs: np.ndarray) -> None:
+        self._frames[self._head % self._frame_buffer_length] = obs
+        self._head += 1
+        self._n_frames = min(self._n_frames + 1, self._frame_buffer_length)
 
     def _aggregate_buffer_frames(self, ) -> np.ndarray:
-        return self._frame_buffer_agg_f(np.stack(self._frame_buffer), axis=0)
+        frames = self._frame_buffer
+        if self._frame_buffer_agg_f is not np.max:
+            return self._frame_buffer_agg_f(np.stack(frames), axis=0)
+
+        if (not self.reuse_obs) or (self._out is None) or (self._out.shape != frames[0].shape):
+            self._out = np.empty_like(frames[0])
+        np.copyto(self._out, frames[0])
+        for frame in frames[1:]:
+            np.maximum(self._out, frame, out=self._out)
+
+        return self._out
+
+    def _step_ale(self, action: int) -> Tuple[float, bool, Dict[Any, Any]]:
+        """Repeat action in the emulator, fetching the screen into the frame slots for the last frames only."""
+        ale_action = self.env.unwrapped._action_set[action]
+        total_reward = 0.0
+        done = False
+        n_frames = 0
+        for frame_i in range(self._n_action_frames):
+            total_reward += self._ale.act(ale_action)
+            n_frames += 1
+            done = self._ale.game_over()
+            if done or (frame_i >= self._n_action_frames - self._frame_buffer_length):
+                slot = self._frames[self._head % self._frame_buffer_length]
+                self._ale.getScreenRGB2(slot)
+                self._append_frame(slot)
+            if done:
+                break
+
+        info = {"ale.lives": self._ale.lives()}
+        if self._time_limit is not None:
+            # Keep TimeLimit's count of inner env steps, as they didn't go through it
+            self._time_limit._elapsed_steps += n_frames
+            if self._time_limit._elapsed_steps >= self._time_limit._max_episode_steps:
+                info['TimeLimit.truncated'] = not done
+                done = True
+
+        return total_reward, done, info
 
     def step(self, action: int) -> Tuple[np.ndarray, float, bool, Dict[Any, Any]]:
         """
@@ -41,15 +130,18 @@ class MaxAndSkipWrapper(gym.Wrapper):
 
         :param action: Int id of action to perform.
         """
-        total_reward = 0.0
-        done = False
-        info = {}
-        for _ in range(self._n_action_frames):
-            obs, reward, done, info = self.env.step(action)
-            self._frame_buffer.append(obs)
-            total_reward += reward
-            if done:
-                break
+        if self._ale is not None:
+            total_reward, done, info = self._step_ale(action)
+        else:
+            total_reward = 0.0
+            done = False
+            info = {}
+            for _ in range(self._n_action_frames):
+                obs, reward, done, info = self.env.step(action)
+                self._append_frame(obs)
+                total_reward += reward
+                if done:
+                    break
 
         agg_frame = self._aggregate_buffer_frames()
 
@@ -61,8 +153,12 @@ class MaxAndSkipWrapper(gym.Wrapper):
 
         :return: Observation from inner_env.reset() call.
         """
-        self._frame_buffer.clear()
         obs = self.env.reset()
-        self._frame_buffer.append(obs)
+        self._prepare_frame_buffer(obs)
+        if self._ale is not None:
+            # Use the preallocated slot, filled with obs, rather than holding obs
+            self._append_frame(self._frames[0])
+        else:
+            self._append_frame(obs)
 
         return obs
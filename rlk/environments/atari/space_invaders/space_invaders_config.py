@@ -18,12 +18,12 @@ class SpaceInvadersConfig(AtariDefaultConfig):
     """Defines configs tweaks for Space Invaders."""
     env_spec = 'SpaceInvadersNoFrameskip-v0'
 
-    _wrappers_stack = (partial(MaxAndSkipWrapper, frame_buffer_length=4),
-                       ImageProcessWrapper,
+    _wrappers_stack = (partial(MaxAndSkipWrapper, frame_buffer_length=4, reuse_obs=True),
+                       partial(ImageProcessWrapper, fast=True),
                        FireStartWrapper,
-                       FrameBufferWrapper)
-    _wrappers_diff = (partial(MaxAndSkipWrapper, frame_buffer_length=4),
-                      ImageProcessWrapper,
+                       partial(FrameBufferWrapper, lazy=True))
+    _wrappers_diff = (partial(MaxAndSkipWrapper, frame_buffer_length=4, reuse_obs=True),
+                      partial(ImageProcessWrapper, fast=True),
                       FireStartWrapper,
                       partial(FrameBufferWrapper, buffer_length=2, buffer_function='diff'))
 
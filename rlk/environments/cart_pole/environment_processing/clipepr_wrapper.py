@@ -2,16 +2,17 @@ from typing import Tuple
 
 import gym
 import numpy as np
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler
-
-from rlk.environments.preprocessing.clipper import Clipper
 
 
 class ClipperWrapper(gym.ObservationWrapper):
     """Clip all observations to within limits, then StandardScale."""
 
     def __init__(self, env: gym.Env, lim: Tuple[float, float] = (-1, 1)):
+        # sklearn is imported here so it's only loaded when the wrapper is used
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import StandardScaler
+        from rlk.environments.preprocessing.clipper import Clipper
+
         super().__init__(env)
         # New env obs space shape
         self.observation_space = gym.spaces.Box(low=lim[0], high=lim[1], shape=self.observation_space.shape)
@@ -1,11 +1,13 @@
 import gym
 import numpy as np
-from sklearn.kernel_approximation import RBFSampler
-from sklearn.pipeline import FeatureUnion
 
 
 class RBFSWrapper(gym.ObservationWrapper):
     def __init__(self, env: gym.Env) -> None:
+        # sklearn is imported here so it's only loaded when the wrapper is used
+        from sklearn.kernel_approximation import RBFSampler
+        from sklearn.pipeline import FeatureUnion
+
         super().__init__(env)
 
         # Sample observations from env and fit pipeline
@@ -1,5 +1,6 @@
 import abc
-from typing import List, Dict, Any
+from functools import reduce
+from typing import List, Dict, Any, Iterable, Callable, Union
 
 import gym
 
@@ -10,22 +11,37 @@ class ConfigBase(abc.ABC):
     env_spec: str
     supported_agents: List[str]
     gpu_memory: int = 256
+    # Wrappers applied to the example wrapped_env (default none)
+    env_wrappers: Iterable[Callable] = ()
 
     def __init__(self, agent_type: str, plot_during_training: bool = True, folder: str = ''):
         self.plot_during_training = plot_during_training
         self.folder = folder
 
-        # Example env
-        try:
-            # May not be possible to build this if dependencies not available
-            self.unwrapped_env = gym.make(self.env_spec)
-            self.wrapped_env = self.unwrapped_env  # (Default no wrapper)
-        except (ImportError, AttributeError):
-            pass
+        # Example envs, built on first access. May not be possible to build these if dependencies not available.
+        self._unwrapped_env: Union[None, gym.Env] = None
+        self._wrapped_env: Union[None, gym.Env] = None
 
         self._check_supported(agent_type)
         self.agent_type = agent_type
 
+    @property
+    def unwrapped_env(self) -> gym.Env:
+        """Example env without wrappers."""
+        if self._unwrapped_env is None:
+            self._unwrapped_env = gym.make(self.env_spec)
+
+        return self._unwrapped_env
+
+    @property
+    def wrapped_env(self) -> gym.Env:
+        """Example env with the config's wrappers applied (wraps the same env as .unwrapped_env)."""
+        if self._wrapped_env is None:
+            self._wrapped_env = reduce(lambda inner_env, wrapper: wrapper(inner_env), self.env_wrappers,
+                                       self.unwrapped_env)
+
+        return self._wrapped_env
+
     def _check_supported(self, agent_type: str):
         if agent_type not in self.supported_agents:
             raise NotImplementedError(f"Agent {agent_type} not in supported agents: {self.supported_agents}")
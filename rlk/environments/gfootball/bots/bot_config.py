@@ -4,6 +4,10 @@ import pathlib
 
 class BotConfig:
     json_dump_path = '/home/gareth/json_dump_path2/dump.json'
+    # ObsChannel used to pass raw observations to the bot, see rlk_compatibility. Set shared if the env is in another
+    # process.
+    obs_channel = 'rlk_bot_obs'
+    obs_channel_shared = False
 
     def __init__(self):
         pathlib.Path(os.path.split(self.json_dump_path)[0]).mkdir(exist_ok=True, parents=True)
@@ -0,0 +1,120 @@
+import os
+import pickle
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Union
+
+
+class ObsChannel:
+    """
+    Holds the last raw observation, to pass it from an env wrapper to a bot policy without going via disk.
+
+    SimpleAndRawObsWrapper puts each raw observation in the channel and rlk_compatibility gets the latest one for the
+    bot, when the bot is used as an EpsilonPolicy policy and only receives the processed observation.
+
+    By default the channel is in-process and the observation object itself is passed, with no copying or encoding.
+    If the env and the bot are in different processes, use shared=True; the observation is pickled into a named
+    shared memory block that any process can attach to by name.
+
+    The channel that creates the shared memory block (the first to open the name) owns it, and frees it on .close.
+    Channels that attached to an existing block only detach on .close, so the block stays available to the owner.
+
+    Channels are looked up by name with .get_channel, so wrappers and bots can refer to them by name (which can be
+    pickled with the agent's env_wrappers) rather than by object.
+    """
+    _channels: Dict[str, "ObsChannel"] = {}
+    # (sequence number, length of pickled obs)
+    _header = struct.Struct('QQ')
+    # Reads retry while a put is in progress, waiting between attempts, up to a limit in case the writer died mid-put
+    _max_read_attempts = 10000
+    _read_retry_wait = 1e-5
+
+    def __init__(self, name: str = 'rlk_bot_obs', shared: bool = False, size: int = 2 ** 20) -> None:
+        """
+        :param name: Name of the channel, also used for the shared memory block.
+        :param shared: Use shared memory, so the channel can be used across processes.
+        :param size: Size of the shared memory block in bytes. Must be larger than a pickled observation.
+        """
+        self.name = name
+        self.shared = shared
+        self.size = size
+
+        self._obs: Any = None
+        self._shm: Union[None, shared_memory.SharedMemory] = None
+        self._owner = False
+        if self.shared:
+            self._attach()
+
+    def _attach(self) -> None:
+        try:
+            self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=self.size)
+            self._header.pack_into(self._shm.buf, 0, 0, 0)
+            self._owner = True
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+            # Otherwise the resource tracker frees the block when this process exits, even though it didn't create it
+            resource_tracker.unregister(self._tracker_name, 'shared_memory')
+
+    @property
+    def _tracker_name(self) -> str:
+        """Name the resource tracker registers the block under, POSIX shared memory names have a leading /."""
+        return self._shm.name if os.name == 'nt' else f"/{self._shm.name}"
+
+    @classmethod
+    def get_channel(cls, name: str = 'rlk_bot_obs', shared: bool = False) -> "ObsChannel":
+        """Get the named channel in this process, creating (or attaching to, if shared) it if needed."""
+        if name not in cls._channels:
+            cls._channels[name] = cls(name=name, shared=shared)
+
+        return cls._channels[name]
+
+    def put(self, obs: Any) -> None:
+        if not self.shared:
+            self._obs = obs
+            return
+
+        data = pickle.dumps(obs, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.size - self._header.size:
+            raise ValueError(f"Observation ({len(data)} bytes) is too large for channel {self.name} ({self.size}).")
+
+        # Sequence number is odd while writing, so readers know to retry
+        seq, _ = self._header.unpack_from(self._shm.buf, 0)
+        self._header.pack_into(self._shm.buf, 0, seq + 1, 0)
+        self._shm.buf[self._header.size:self._header.size + len(data)] = data
+        self._header.pack_into(self._shm.buf, 0, seq + 2, len(data))
+
+    def get(self) -> Any:
+        """Get the last observation put in the channel, or None if there isn't one yet."""
+        if not self.shared:
+            return self._obs
+
+        for _ in range(self._max_read_attempts):
+            seq, length = self._header.unpack_from(self._shm.buf, 0)
+            # Odd sequence number means a put is in progress, and if it changed while copying the data may be mixed
+            if not seq % 2:
+                data = bytes(self._shm.buf[self._header.size:self._header.size + length])
+                if self._header.unpack_from(self._shm.buf, 0)[0] == seq:
+                    return pickle.loads(data) if length > 0 else None
+            time.sleep(self._read_retry_wait)
+
+        raise TimeoutError(f"Couldn't read a complete observation from channel {self.name} after "
+                           f"{self._max_read_attempts} attempts, the writer may have stopped during a put.")
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory block, if used, and remove from the channels in this process.
+
+        The block is also freed if this channel created it.
+        """
+        if self._shm is not None:
+            self._shm.close()
+            if self._owner:
+                # unlink unregisters the block from the resource tracker, which may be shared with a process that
+                # attached and already unregistered it, so make sure it's registered first
+                resource_tracker.register(self._tracker_name, 'shared_memory')
+                self._shm.unlink()
+            self._shm = None
+        self._obs = None
+        if self._channels.get(self.name) is self:
+            del self._channels[self.name]
@@ -5,11 +5,13 @@ from functools import wraps
 import numpy as np
 
 from rlk.environments.gfootball.bots.bot_config import BotConfig
+from rlk.environments.gfootball.bots.obs_channel import ObsChannel
+from rlk.environments.preprocessing.lazy_frames import LazyFrames
 
 
 def rlk_compatibility(agent: Callable) -> Callable:
     """
-    Decorator to get obs from dump on disk if passed obs is None.
+    Decorator to get the last raw obs from the ObsChannel (or dump on disk) if passed obs is None.
 
     Compatible with both naked agent function and agent function already decorated with @human_readable_agent. In the
     latter case, the decorator requires the obs to not be None, so this should be the outer decorator. Eg:
@@ -19,7 +21,8 @@ def rlk_compatibility(agent: Callable) -> Callable:
     def agent(obs):
         pass
 
-    Path to json dump to load from is set in the BotConfig(). This should work fine with relative paths.
+    The channel name and path to json dump to load from are set in the BotConfig(). The json dump is only used if
+    nothing has been put in the channel. This should work fine with relative paths.
     """
 
     # @wraps is required to make obs_getter pickleable (otherwise local get_obs can't be pickled)
@@ -27,12 +30,14 @@ def rlk_compatibility(agent: Callable) -> Callable:
     def get_obs(obs):
         rlk_compat = False
 
-        if (obs is None) or isinstance(obs, np.ndarray):
+        if (obs is None) or isinstance(obs, (np.ndarray, LazyFrames)):
             # Either agent is being passed no obs, or it's being passed a processed observation during rl training.
-            # In both cases, discard and replace with last dumped raw observation by SimpleAndRawObsWrapper.
+            # In both cases, discard and replace with last raw observation from SimpleAndRawObsWrapper.
             rlk_compat = True
-            with open(BotConfig().json_dump_path, 'r') as f:
-                obs = json.load(f)
+            obs = ObsChannel.get_channel(BotConfig.obs_channel, shared=BotConfig.obs_channel_shared).get()
+            if obs is None:
+                with open(BotConfig().json_dump_path, 'r') as f:
+                    obs = json.load(f)
 
         if rlk_compat:
             # If rlk is running this, we just want the action
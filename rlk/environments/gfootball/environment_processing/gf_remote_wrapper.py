@@ -1,11 +1,13 @@
 import json
 from typing import Tuple, List, Dict, Any, Union
-from unittest.mock import MagicMock
 
 import gym
 import numpy as np
 import requests
-from asyncio import get_running_loop
+from requests.adapters import HTTPAdapter
+
+from rlk.environments.remote import protocol
+
 
 class GFRemoteWrapper:
     """
@@ -15,9 +17,25 @@ class GFRemoteWrapper:
     Might be worth adding create from env to make more general.
 
     Currently does not inherit from gym.Env so needs a few extra things added.
+
+    Requests are made through a persistent session, so the connection is kept alive and reused rather than opened for
+    every step. The protocol version is negotiated on create: servers supporting version 2 are sent POST requests and
+    return observations as binary encoded arrays (see rlk.environments.remote.protocol), optionally compressed. Older
+    servers (that don't return a version) use the original JSON API, version 1.
     """
 
-    def __init__(self, env: Union[gym.Env, str], ip: str = "192.168.0.1", port: int = 8000):
+    def __init__(self, env: Union[gym.Env, str], ip: str = "192.168.0.1", port: int = 8000,
+                 protocol_version: int = protocol.PROTOCOL_VERSION, compress: bool = False,
+                 timeout: Union[None, float] = None):
+        """
+        :param env: Env, or name of env, to create on remote.
+        :param ip: Server address.
+        :param port: Server port.
+        :param protocol_version: Highest protocol version to use. The version used is the highest supported by both
+                                 this and the server.
+        :param compress: Ask the server to compress observations (protocol version 2+).
+        :param timeout: Timeout for requests, in seconds. Default None waits forever.
+        """
 
         # register_all()
 
@@ -44,45 +62,76 @@ class GFRemoteWrapper:
         self._remote_step = f"{self.address}/step"
         self._remote_close = f"{self.address}/kill"
 
+        self.requested_protocol_version = protocol_version
+        self.protocol_version = 1
+        self.compress = compress
+        self.timeout = timeout
+        self._session = self._new_session()
+
         self._create_remote_from_local()
         self.__max_episode_steps = None
 
     def __repr__(self) -> str:
         return f"GFRemoteWrapper(env={self.env_name}, ip={self.ip}, port={self.port})"
 
+    @staticmethod
+    def _new_session() -> requests.Session:
+        """Session with a single kept alive connection to the server."""
+        session = requests.Session()
+        session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+        return session
+
     def _create_remote_from_local(self):
         """
-        Create equivalent of local env on remote.
+        Create equivalent of local env on remote, and negotiate the protocol version.
 
         For now, remote just supports limited set, ie. SMMBuffer(SimpleSMM(create_env('name'))), so
         just passing name.
         """
-        resp = requests.get(self._remote_create, params={'env_name': self.env_name})
-        self._remote_env_id = resp.json()['id']
+        resp = self._session.get(self._remote_create, timeout=self.timeout,
+                                 params={'env_name': self.env_name, 'protocol_version': self.requested_protocol_version,
+                                         'compress': int(self.compress)})
+        resp.raise_for_status()
+        resp = resp.json()
+        self._remote_env_id = resp['id']
+        # Servers that don't return a version only support the original JSON API
+        self.protocol_version = min(self.requested_protocol_version, resp.get('protocol_version', 1))
 
     @staticmethod
     def _json_to_obs(resp_obs: str) -> List[np.ndarray]:
         return [np.array(arr) for arr in json.loads(resp_obs)]
 
-    def reset(self) -> List[np.ndarray]:
-        resp = requests.get(self._remote_reset,
-                            params={'env_id': str(self._remote_env_id)})
+    def _request(self, url: str, **params) -> Dict[str, Any]:
+        """Make a request to the remote, as binary POST (protocol version 2+) or JSON GET, and return the response."""
+        params['env_id'] = str(self._remote_env_id)
+        if self.protocol_version >= 2:
+            resp = self._session.post(url, data=protocol.encode(params), timeout=self.timeout,
+                                      headers={'Content-Type': protocol.CONTENT_TYPE})
+            resp.raise_for_status()
+            return protocol.decode(resp.content)
+
+        resp = self._session.get(url, params=params, timeout=self.timeout)
+        resp.raise_for_status()
+        resp = resp.json()
+        if 'obs' in resp:
+            resp['obs'] = self._json_to_obs(resp['obs'])
 
-        return self._json_to_obs(resp.json()['obs'])
+        return resp
+
+    def reset(self) -> List[np.ndarray]:
+        return list(self._request(self._remote_reset)['obs'])
 
     def step(self, action: int) -> Tuple[List[np.ndarray], float, bool, Dict[str, Any]]:
-        resp = requests.get(self._remote_step,
-                            params={'env_id': str(self._remote_env_id),
-                                    'action': int(action)})
-        resp = resp.json()
+        resp = self._request(self._remote_step, action=int(action))
 
-        return self._json_to_obs(resp['obs']), resp['reward'], resp['done'], resp['info']
+        return list(resp['obs']), resp['reward'], resp['done'], resp['info']
 
     def close(self):
-        resp = requests.get(self._remote_close,
-                            params={'env_id': str(self._remote_env_id)})
+        resp = self._request(self._remote_close)
+        self._session.close()
 
-        return resp.json()
+        return resp
 
     @property
     def _max_episode_steps(self) -> int:
@@ -104,7 +153,7 @@ class GFRemoteWrapper:
 
 
 if __name__ == "__main__":
-    env = GFRemoteWrapper(env_name="GFootball-academy_empty_goal_close-v0")
+    env = GFRemoteWrapper("GFootball-academy_empty_goal_close-v0")
     obs = env.reset()
     obs, reward, done, info = env.step(1)
     env.close()
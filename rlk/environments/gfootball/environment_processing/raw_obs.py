@@ -1,4 +1,4 @@
-from typing import Any, Dict, Union, List
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
 
 import numpy as np
 
@@ -19,6 +19,10 @@ class RawObs:
 
     Processes those apparently not in s115:
     'ball_rotation'
+
+    The output slice of each key is computed once, on init, and .process writes each key straight into a single float32
+    output vector. .process_key writes a single key in the same way, into its own vector. .process_batch converts a list of observations at once, converting each key for all observations
+    together (eg. for building datasets).
     """
     data: Dict[str, Any]
     standard_keys = ['active', 'ball', 'ball_direction', 'ball_owned_player',
@@ -55,6 +59,14 @@ class RawObs:
     # Custom
     distance_to_ball_n: int = 22
 
+    # Keys holding (x, y) pairs for each player
+    _pair_keys = ('left_team', 'left_team_direction', 'right_team', 'right_team_direction')
+    # Custom features, by name: (method, keys of inputs). Methods work on single or batched (leading axis) inputs.
+    _custom_features: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+        'distance_to_ball': ('_distance_to_ball', ('ball', 'left_team', 'right_team'))}
+    # Compiled instances, by (using, using_custom), see .get
+    _instances: Dict[Tuple[type, Union[None, Tuple[str, ...]], Tuple[str, ...]], "RawObs"] = {}
+
     def __init__(self, using: List[str] = None, using_custom: List[str] = None) -> None:
 
         if using is None:
@@ -68,6 +80,31 @@ class RawObs:
         self.using_custom = using_custom
 
         self.shape = (1, sum([getattr(self, f"{key}_n") for key in self.using + self.using_custom]))
+        self._plan = self._compile()
+
+    def _compile(self) -> List[Tuple[str, slice, Union[None, Callable]]]:
+        """Get (key, output slice, custom feature method or None) for each key in output."""
+        plan = []
+        offset = 0
+        for key in self.using + self.using_custom:
+            n = getattr(self, f"{key}_n")
+            plan.append((key, slice(offset, offset + n), self._feature(key)))
+            offset += n
+
+        return plan
+
+    def _feature(self, key: str) -> Union[None, Callable]:
+        """Method computing a custom feature, or None for keys of the raw observation."""
+        return getattr(self, self._custom_features[key][0]) if key in self._custom_features else None
+
+    @classmethod
+    def get(cls, using: List[str] = None, using_custom: List[str] = None) -> "RawObs":
+        """Get a (cached) instance for these keys, to avoid compiling a new one for every observation."""
+        instance_key = (cls, tuple(using) if using is not None else None, tuple(using_custom or ()))
+        if instance_key not in cls._instances:
+            cls._instances[instance_key] = cls(using=using, using_custom=using_custom)
+
+        return cls._instances[instance_key]
 
     def set_obs(self, data: Union[List[Dict[str, Any]], Dict[str, Any]]):
         if isinstance(data, list):
@@ -79,36 +116,88 @@ class RawObs:
 
     @staticmethod
     def _euclidean_distance(x1: np.ndarray, x2: np.ndarray, y1: np.ndarray, y2: np.ndarray) -> np.ndarray:
-        return np.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
-
-    def _add_distance_to_ball(self) -> np.ndarray:
-        left_team = self._euclidean_distance(x1=np.array(self.data['ball'])[0],
-                                             x2=np.array(self.data["left_team"])[:, 0],
-                                             y1=np.array(self.data['ball'])[1],
-                                             y2=np.array(self.data["left_team"])[:, 1])
-        right_team = self._euclidean_distance(x1=np.array(self.data['ball'])[0],
-                                              x2=np.array(self.data["right_team"])[:, 0],
-                                              y1=np.array(self.data['ball'])[1],
-                                              y2=np.array(self.data["right_team"])[:, 1])
+        return np.hypot(x1 - x2, y1 - y2)
 
-        return np.expand_dims(np.concatenate([left_team, right_team]), axis=0)
+    @classmethod
+    def _distance_to_ball(cls, ball: np.ndarray, left_team: np.ndarray, right_team: np.ndarray) -> np.ndarray:
+        """Distance of each left then right team player to the ball, from (..., 3) ball and (..., 11, 2) teams."""
+        teams = np.concatenate([left_team, right_team], axis=-2)
+
+        return cls._euclidean_distance(x1=ball[..., 0:1], x2=teams[..., 0], y1=ball[..., 1:2], y2=teams[..., 1])
+
+    def _write_key(self, data: Dict[str, Any], key: str, out: np.ndarray, feature: Union[None, Callable]) -> None:
+        """Write the values of a key (or custom feature) of an observation into out, a flat view of the key's length."""
+        if feature is not None:
+            out[:] = feature(*[np.asarray(data[input_key], dtype=np.float32)
+                               for input_key in self._custom_features[key][1]])
+        elif key in self._pair_keys:
+            out.reshape(-1, 2)[:] = data[key]
+        else:
+            out[:] = data[key]
 
     def process_key(self, key: str) -> np.ndarray:
-        raw_obs = np.array(self.data[key])
-        if len(raw_obs.shape) == 0:
-            raw_obs = np.expand_dims(raw_obs, axis=0)
-
-        if len(raw_obs.shape) > 1:
-            raw_obs = raw_obs.flatten()
-
-        return np.expand_dims(raw_obs, axis=0)
-
-    def process(self) -> Union[np.ndarray, None]:
-        obs = [self.process_key(key) for key in self.using + self.using_custom]
-
-        return np.concatenate(obs, axis=1) if len(obs) > 0 else None
+        """
+        Get a single key (or custom feature) of the observation, as written by .process.
+
+        :return: Float32 array of (1, n values of key).
+        """
+        out = np.empty((1, getattr(self, f"{key}_n")), dtype=np.float32)
+        self._write_key(self.data, key, out.reshape(-1), self._feature(key))
+
+        return out
+
+    def process(self, out: Union[None, np.ndarray] = None) -> Union[np.ndarray, None]:
+        """
+        :param out: Float array of self.shape (or with the same number of elements) to write to. If not set, a new
+                    float32 array of self.shape is returned.
+        """
+        if len(self._plan) == 0:
+            return None
+
+        if out is None:
+            out = np.empty(self.shape, dtype=np.float32)
+        flat_out = out.reshape(-1)
+
+        data = self.data
+        for key, key_slice, feature in self._plan:
+            self._write_key(data, key, flat_out[key_slice], feature)
+
+        return out
+
+    def process_batch(self, data: Sequence[Union[List[Dict[str, Any]], Dict[str, Any]]]) -> Union[np.ndarray, None]:
+        """
+        Convert a batch of observations.
+
+        :param data: Sequence of observations, each as accepted by .set_obs.
+        :return: Float32 array of (n observations, self.shape[1]).
+        """
+        if len(self._plan) == 0:
+            return None
+
+        data = [d[0] if isinstance(d, list) else d for d in data]
+        n_obs = len(data)
+        columns: Dict[str, np.ndarray] = {}
+
+        def column(column_key: str) -> np.ndarray:
+            if column_key not in columns:
+                columns[column_key] = np.asarray([d[column_key] for d in data], dtype=np.float32)
+            return columns[column_key]
+
+        out = np.empty((n_obs, self.shape[1]), dtype=np.float32)
+        for key, key_slice, feature in self._plan:
+            if feature is not None:
+                out[:, key_slice] = feature(*[column(input_key) for input_key in self._custom_features[key][1]])
+            else:
+                out[:, key_slice] = column(key).reshape(n_obs, -1)
+
+        return out
 
     @classmethod
     def convert_observation(cls, data: Union[List[Dict[str, Any]], Dict[str, Any]],
                             using: List[str] = None) -> np.ndarray:
-        return cls(using=using).set_obs(data).process()
+        return cls.get(using=using).set_obs(data).process()
+
+    @classmethod
+    def convert_observations(cls, data: Sequence[Union[List[Dict[str, Any]], Dict[str, Any]]],
+                             using: List[str] = None) -> np.ndarray:
+        return cls.get(using=using).process_batch(data)
@@ -0,0 +1,95 @@
+from typing import Any, Dict, List, Sequence, Union
+
+import numpy as np
+
+
+class Simple115Obs:
+    """
+    Simple115 ("s115") features from raw observations, vectorized over a batch of observations.
+
+    Gives the same output as gfootball's Simple115StateWrapper.convert_observation, without requiring gfootball:
+    [left team positions (22), left team directions (22), right team positions (22), right team directions (22),
+     ball position (3), ball direction (3), ball owned team one-hot (3), active player one-hot (11),
+     game mode one-hot (7)]
+
+    Each key is converted for all observations at once, so converting many observations (eg. from downloaded game
+    logs) together is much faster than one at a time. If teams have less than 11 players, missing player values are
+    filled with -1 (at the end of the player features, or at the end of each team's features with fixed_positions).
+    """
+    n_features: int = 115
+    n_players: int = 11
+    _player_keys = ('left_team', 'left_team_direction', 'right_team', 'right_team_direction')
+    _n_player_features: int = 88
+
+    @classmethod
+    def convert_observation(cls, observation: Union[List[Dict[str, Any]], Dict[str, Any]],
+                            fixed_positions: bool = False) -> np.ndarray:
+        """
+        Drop in replacement for Simple115StateWrapper.convert_observation.
+
+        :param observation: Raw observations of each controlled player, as a list, or a single raw observation.
+        :param fixed_positions: Fill missing players for each team, rather than at the end of the player features.
+        :return: Float32 array of (n players, 115).
+        """
+        if isinstance(observation, dict):
+            observation = [observation]
+
+        return cls.convert_observations(observation, fixed_positions=fixed_positions)
+
+    @classmethod
+    def convert_observations(cls, observations: Sequence[Dict[str, Any]], fixed_positions: bool = False) -> np.ndarray:
+        """
+        :param observations: Sequence of raw observations (dicts), eg. for one player over the steps of a game.
+        :param fixed_positions: Fill missing players for each team, rather than at the end of the player features.
+        :return: Float32 array of (n observations, 115).
+        """
+        n_obs = len(observations)
+        out = np.zeros((n_obs, cls.n_features), dtype=np.float32)
+        if n_obs == 0:
+            return out
+
+        cls._add_players(observations, out[:, 0:cls._n_player_features], fixed_positions=fixed_positions)
+
+        col = cls._n_player_features
+        out[:, col:col + 6] = np.asarray([[obs['ball'], obs['ball_direction']] for obs in observations],
+                                         dtype=np.float32).reshape(n_obs, 6)
+        col += 6
+
+        rows = np.arange(n_obs)
+        ball_owned_team = np.fromiter((obs['ball_owned_team'] for obs in observations), dtype=np.int64, count=n_obs)
+        out[rows, col + 1 + ball_owned_team] = 1
+        col += 3
+
+        active = np.fromiter((obs['active'] for obs in observations), dtype=np.int64, count=n_obs)
+        has_active = active != -1
+        out[rows[has_active], col + active[has_active]] = 1
+        col += cls.n_players
+
+        game_mode = np.fromiter((obs['game_mode'] for obs in observations), dtype=np.int64, count=n_obs)
+        out[rows, col + game_mode] = 1
+
+        return out
+
+    @classmethod
+    def _add_players(cls, observations: Sequence[Dict[str, Any]], out: np.ndarray, fixed_positions: bool) -> None:
+        """Write (x, y) of each player for each of the player keys into out (n observations, 88)."""
+        try:
+            values = np.asarray([[obs[key] for key in cls._player_keys] for obs in observations], dtype=np.float32)
+        except ValueError:
+            # Teams of different sizes, can't be converted together
+            values = None
+        if (values is not None) and (values.shape == (len(observations), len(cls._player_keys), cls.n_players, 2)):
+            out[:] = values.reshape(len(observations), -1)
+            return
+
+        # Teams aren't all 11 players
+        n_team_features = cls.n_players * 2
+        out[:] = -1
+        for obs_i, obs in enumerate(observations):
+            col = 0
+            for key_i, key in enumerate(cls._player_keys):
+                values = np.asarray(obs[key], dtype=np.float32).reshape(-1)
+                if fixed_positions:
+                    col = key_i * n_team_features
+                out[obs_i, col:col + len(values)] = values
+                col += len(values)
@@ -2,9 +2,9 @@ from typing import Any, Dict, Union, List, Tuple
 
 import gym
 import numpy as np
-from gfootball.env.wrappers import Simple115StateWrapper
 
 from rlk.environments.gfootball.environment_processing.raw_obs import RawObs
+from rlk.environments.gfootball.environment_processing.simple115_obs import Simple115Obs
 
 
 class SimpleAndCustomRawObsWrapper(gym.Wrapper):
@@ -62,7 +62,7 @@ class SimpleAndCustomRawObsWrapper(gym.Wrapper):
         else:
             raise ValueError("Something unexpected about obs")
 
-        simple_obs = Simple115StateWrapper.convert_observation(obs_for_s115, fixed_positions=False).reshape(-1)
+        simple_obs = Simple115Obs.convert_observation(obs_for_s115, fixed_positions=False).reshape(-1)
         raw_obs = RawObs.convert_observation(obs_for_raw)
 
         return np.concatenate([simple_obs, raw_obs.squeeze()])
@@ -3,23 +3,32 @@ from typing import List, Union, Dict, Any, Tuple
 
 import gym
 import numpy as np
-from gfootball.env.wrappers import Simple115StateWrapper
 
 from rlk.agents.components.helpers.ndarray_encoder import NDArrayEncoder
+from rlk.environments.gfootball.bots.obs_channel import ObsChannel
 from rlk.environments.gfootball.environment_processing.raw_obs import RawObs
+from rlk.environments.gfootball.environment_processing.simple115_obs import Simple115Obs
 
 
 class SimpleAndRawObsWrapper(gym.Wrapper):
-    def __init__(self, env: gym.Env = None, raw_using: List[str] = None, raw_dump_path: str = None) -> None:
+    def __init__(self, env: gym.Env = None, raw_using: List[str] = None, raw_dump_path: str = None,
+                 obs_channel: str = None, obs_channel_shared: bool = False) -> None:
         """
         :param env: A gym env, or None.
         :param raw_using: List of keys to use in raw observations.
+        :param raw_dump_path: Path to dump raw observations to as json on each step, optional. Prefer obs_channel.
+        :param obs_channel: Name of an ObsChannel to put raw observations in on each step, optional. Eg. for a bot
+                            used as an EpsilonPolicy policy, see BotConfig.obs_channel.
+        :param obs_channel_shared: Use a shared memory channel, for if the bot is in a different process.
         """
         if env is not None:
             super().__init__(env)
 
         self.raw_dump_path = raw_dump_path
-        self.raw_obs = RawObs(using=raw_using)
+        self.obs_channel = None
+        if obs_channel is not None:
+            self.obs_channel = ObsChannel.get_channel(obs_channel, shared=obs_channel_shared)
+        self.raw_obs = RawObs.get(using=raw_using)
 
         self.simple_obs_shape = 115
         self.raw_obs_shape = self.raw_obs.shape[1]
@@ -29,18 +38,27 @@ class SimpleAndRawObsWrapper(gym.Wrapper):
 
     @staticmethod
     def process_obs(obs: Union[Dict[str, Any], List[Any]], using: List[str] = None) -> np.ndarray:
-        """Generate array with simple obs and raw obs."""
+        """Generate array with simple obs and raw obs, written into a single new array."""
 
         if isinstance(obs, dict):
             obs = obs['players_raw']
 
-        simple_obs = Simple115StateWrapper.convert_observation(obs, fixed_positions=False).reshape(-1)
-        raw_obs = RawObs(using=using).set_obs(obs[0]).process()
+        simple_obs = Simple115Obs.convert_observation(obs, fixed_positions=False).reshape(-1)
+        raw_obs = RawObs.get(using=using)
+        if raw_obs.shape[1] == 0:
+            return simple_obs
 
-        return np.concatenate([simple_obs, raw_obs.reshape(-1)]) if raw_obs is not None else simple_obs
+        processed_obs = np.empty(simple_obs.shape[0] + raw_obs.shape[1], dtype=np.float32)
+        processed_obs[0: simple_obs.shape[0]] = simple_obs
+        raw_obs.set_obs(obs[0]).process(out=processed_obs[simple_obs.shape[0]:])
+
+        return processed_obs
 
     def _dump(self, obs: Dict[str, np.ndarray]):
-        # Save raw observations to disk, may be used by EpsilonPolicy bot. TODO: This interface should be improved.
+        # Pass raw observations on, may be used by EpsilonPolicy bot.
+        if self.obs_channel is not None:
+            self.obs_channel.put({'players_raw': obs})
+
         if self.raw_dump_path is not None:
             with open(self.raw_dump_path, 'w') as f:
                 json.dump({'players_raw': obs}, f, cls=NDArrayEncoder)
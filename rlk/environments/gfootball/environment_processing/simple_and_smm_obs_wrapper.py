@@ -4,11 +4,8 @@ from typing import Tuple, Dict, Any, List, Union
 import gym
 import numpy as np
 
-try:
-    from gfootball.env import observation_preprocessing
-    from gfootball.env.wrappers import Simple115StateWrapper
-except ImportError:
-    pass
+from rlk.environments.gfootball.environment_processing.simple115_obs import Simple115Obs
+from rlk.environments.gfootball.environment_processing.smm_obs import SMMObs
 
 
 class SimpleAndSMMObsWrapper(gym.Wrapper):
@@ -20,13 +17,18 @@ class SimpleAndSMMObsWrapper(gym.Wrapper):
     as Tuple[smm_obs, simple_obs].
     """
 
-    def __init__(self, env: gym.Env = None):
+    def __init__(self, env: gym.Env = None, reuse_smm: bool = False):
         """
         :param env: A gym env, or None.
+        :param reuse_smm: Draw the SMM obs into the same array each step. Only use when the SMM obs is copied before the
+                          next step, eg. by SMMFrameProcessWrapper.
         """
         if env is not None:
             super().__init__(env)
 
+        self.reuse_smm = reuse_smm
+        self._smm_buffer = np.zeros((1, 72, 96, 4), dtype=np.uint8) if reuse_smm else None
+
         self.simple_obs_shape = (115,)  # TODO: It's possible this can be bigger
 
         self.observation_space = gym.spaces.Tuple(
@@ -34,7 +36,8 @@ class SimpleAndSMMObsWrapper(gym.Wrapper):
              gym.spaces.Box(low=-np.inf, high=np.inf, shape=self.simple_obs_shape, dtype=np.float32)])
 
     @staticmethod
-    def process_obs(obs: Union[Dict[str, Any], List[Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    def process_obs(obs: Union[Dict[str, Any], List[Any]],
+                    smm_out: Union[None, np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
         """
         Obs can be from gym env or the version passed from Kaggle runner.
 
@@ -48,6 +51,9 @@ class SimpleAndSMMObsWrapper(gym.Wrapper):
         Which is located in:
          - Kag obs: obs_kag_env['players_raw'][0].keys():
          - Gym obs: obs_gym_env[0].keys()
+
+        :param obs: Raw obs.
+        :param smm_out: Optional (1, 72, 96, 4) uint8 array to draw the SMM obs into.
         """
 
         if isinstance(obs, dict):
@@ -55,16 +61,16 @@ class SimpleAndSMMObsWrapper(gym.Wrapper):
 
         # This can return multiple rows when env has:
         # number_of_left_players_agent_controls=1 and number_of_right_players_agent_controls=1
-        simple_obs = Simple115StateWrapper.convert_observation(obs, fixed_positions=False).reshape(-1)
-        smm_obs = observation_preprocessing.generate_smm([obs[0]])
+        simple_obs = Simple115Obs.convert_observation(obs, fixed_positions=False).reshape(-1)
+        smm_obs = SMMObs.generate_smm([obs[0]], out=smm_out)
 
         return smm_obs, simple_obs
 
     def step(self, action: int) -> Tuple[Tuple[np.ndarray, np.ndarray], float, bool, Dict[Any, Any]]:
         obs, reward, done, info = self.env.step(action)
 
-        return self.process_obs(obs), reward, done, info
+        return self.process_obs(obs, smm_out=self._smm_buffer), reward, done, info
 
     def reset(self) -> Tuple[np.ndarray, np.ndarray]:
         obs = self.env.reset()
-        return self.process_obs(obs)
+        return self.process_obs(obs, smm_out=self._smm_buffer)
@@ -1,5 +1,4 @@
-import collections
-from typing import Any, Dict, Tuple, Union
+from typing import Any, Dict, List, Tuple, Type, Union
 
 import gym
 import numpy as np
@@ -10,16 +9,26 @@ class SMMFrameProcessWrapper(gym.Wrapper):
     Wrapper for processing frames from SMM observation wrapper from football env.
 
     Input is (72, 96, 4), where last dim is (team 1 pos, team 2 pos, ball pos, active player pos). Range 0 -> 255.
-    Output is (72, 96, 4) as difference to last frame for all. Range -1 -> 1
+    Output is (72, 96, 4) as difference to last frame for all. Range -1 -> 1 (or -255 -> 255 for integer dtypes).
+
+    The last two frames are copied into a preallocated ring of two slots (of float32, or int16 for integer dtypes), and
+    the output is made with a single subtraction of all channels, with normalisation applied in place on the result
+    rather than to each frame.
 
     If input is Tuple, assumes SMM input is index [0] and only buffers that.
     """
 
     def __init__(self, env: Union[None, gym.Env] = None,
-                 obs_shape: Tuple[int, int] = (72, 96, 4)) -> None:
+                 obs_shape: Tuple[int, int] = (72, 96, 4),
+                 dtype: Type = np.float32,
+                 reuse_output: bool = False) -> None:
         """
         :param env: Gym env.
         :param obs_shape: Expected shape of single observation.
+        :param dtype: Output dtype. Float types are normalised to -1 -> 1, integer types (eg. np.int16) are left as
+                      the difference of the raw frames.
+        :param reuse_output: Write the output into the same array each step, so nothing is allocated per step. Only use
+                             when the observation isn't kept after the next step (eg. not with a replay buffer).
         """
         if env is not None:
             super().__init__(env)
@@ -28,6 +37,13 @@ class SMMFrameProcessWrapper(gym.Wrapper):
 
         self._buffer_length = 2
         self._obs_shape = obs_shape
+        self.dtype = dtype
+        self.reuse_output = reuse_output
+
+        self._normalise = not np.issubdtype(np.dtype(dtype), np.integer)
+        self._storage_dtype = np.float32 if self._normalise else np.int16
+        self._frames: Union[None, np.ndarray] = None
+        self._out: Union[None, np.ndarray] = None
         self._prepare_obs_buffer()
 
     def __repr__(self) -> str:
@@ -36,22 +52,34 @@ class SMMFrameProcessWrapper(gym.Wrapper):
         else:
             return super().__repr__()
 
-    @staticmethod
-    def _normalise_frame(frame: np.ndarray) -> np.ndarray:
-        return frame / 255.0
-
     def _prepare_obs_buffer(self) -> None:
-        """Create buffer and preallocate with empty arrays of expected shape."""
+        """Create or clear the ring of frames. _head is the slot the next frame goes in (the older frame)."""
+        if self._frames is None:
+            self._frames = np.zeros(shape=(self._buffer_length,) + tuple(self._obs_shape), dtype=self._storage_dtype)
+        else:
+            self._frames[:] = 0
+        self._head = 0
 
-        self._obs_buffer = collections.deque(maxlen=self._buffer_length)
+    @property
+    def _obs_buffer(self) -> List[np.ndarray]:
+        """Buffered frames (unnormalised), oldest first."""
+        return [self._frames[(self._head + i) % self._buffer_length] for i in range(self._buffer_length)]
 
-        for _ in range(self._buffer_length):
-            self._obs_buffer.append(np.zeros(shape=self._obs_shape))
+    def _add_frame(self, frame: np.ndarray) -> None:
+        np.copyto(self._frames[self._head], np.reshape(frame, self._obs_shape), casting='unsafe')
+        self._head = (self._head + 1) % self._buffer_length
 
     def build_buffered_obs(self) -> np.ndarray:
-        agg_buff = np.empty(self._obs_shape)
-        for f in range(self._obs_shape[-1]):
-            agg_buff[..., f] = self._obs_buffer[1][..., f] - self._obs_buffer[0][..., f]
+        if self.reuse_output and (self._out is not None):
+            agg_buff = self._out
+        else:
+            agg_buff = np.empty(self._obs_shape, dtype=self.dtype)
+            self._out = agg_buff
+
+        old_frame, new_frame = self._obs_buffer
+        np.subtract(new_frame, old_frame, out=agg_buff, casting='unsafe')
+        if self._normalise:
+            np.multiply(agg_buff, agg_buff.dtype.type(1 / 255.0), out=agg_buff)
 
         return agg_buff
 
@@ -71,12 +99,11 @@ class SMMFrameProcessWrapper(gym.Wrapper):
         if other_obs is None:
             return smm_obs
         else:
-            return tuple([smm_obs] + list(other_obs))
+            return (smm_obs,) + tuple(other_obs)
 
     def process(self, obs: Union[np.ndarray, Tuple[np.ndarray, Any]]) -> Union[np.ndarray, Tuple[np.ndarray, ...]]:
         smm_obs, other_obs = self._split_obs(obs)
-        smm_obs = self._normalise_frame(smm_obs)
-        self._obs_buffer.append(smm_obs)
+        self._add_frame(smm_obs)
         smm_obs_buff = self.build_buffered_obs()
         joined_obs = self._rejoin_obs(smm_obs_buff, other_obs)
 
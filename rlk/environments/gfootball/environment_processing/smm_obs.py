@@ -0,0 +1,142 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class SMMObs:
+    """
+    Super mini map (SMM) from raw observations, vectorized over the players in each layer and over observations.
+
+    Gives the same output as gfootball's observation_preprocessing.generate_smm, without requiring gfootball: for each
+    observation, (72, 96, 4) uint8 layers of (left team, right team, ball, active player), with 255 at the pixel of
+    each, and 0 elsewhere.
+
+    The pixel coordinates of all points are calculated together, then set in the frame with a single scatter write.
+    This can be into a reused (preallocated) output array, see .generate_smm.
+    """
+    layers = ('left_team', 'right_team', 'ball', 'active')
+
+    # Normalised minimap coordinates
+    x_min: float = -1.0
+    x_max: float = 1.0
+    y_min: float = -1.0 / 2.25
+    y_max: float = 1.0 / 2.25
+
+    marker_value: int = 255
+
+    @classmethod
+    def _to_pixels(cls, points: np.ndarray, channel_dimensions: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert (n, 2) float64 (x, y) points to (y, x) pixel indexes, clipped to the frame."""
+        width, height = channel_dimensions
+        # Same operations (and order) as gfootball, truncating towards 0, which is the same as floor after clipping
+        x = ((points[:, 0] - cls.x_min) / (cls.x_max - cls.x_min) * width).astype(np.int64)
+        y = ((points[:, 1] - cls.y_min) / (cls.y_max - cls.y_min) * height).astype(np.int64)
+        for idx, size in ((x, width), (y, height)):
+            np.maximum(idx, 0, out=idx)
+            np.minimum(idx, size - 1, out=idx)
+
+        return y, x
+
+    @classmethod
+    def _layer_points(cls, obs: Dict[str, Any]) -> List[np.ndarray]:
+        """Get (n, 2) (x, y) points to mark in each layer of a single observation."""
+        points = []
+        for layer in cls.layers:
+            if layer == 'active':
+                if obs['active'] == -1:
+                    points.append(np.empty((0, 2)))
+                    continue
+                flat = np.asarray(obs['left_team'][obs['active']], dtype=np.float64).reshape(-1)
+            else:
+                flat = np.asarray(obs[layer], dtype=np.float64).reshape(-1)
+            # Pairs of (x, y), so the ball (x, y, z) gives one point, as in gfootball
+            points.append(flat[0:(flat.size // 2) * 2].reshape(-1, 2))
+
+        return points
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _base_indexes(n_obs: int, n_players: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (obs index, layer index) of the team and ball points, for a batch size and team size.
+
+        Cached, as these are usually the same every step. Only the most recent few sizes are kept, so batches of
+        varying length don't grow the cache. The arrays are shared, so are read-only.
+        """
+        obs_idx = np.concatenate([np.repeat(np.arange(n_obs), 2 * n_players), np.arange(n_obs)])
+        layer_idx = np.concatenate([np.tile(np.repeat([0, 1], n_players), n_obs), np.full(n_obs, 2)])
+        for idx in (obs_idx, layer_idx):
+            idx.setflags(write=False)
+
+        return obs_idx, layer_idx
+
+    @classmethod
+    def _batch_points(cls, observations: Sequence[Dict[str, Any]]) -> Union[None, Tuple[np.ndarray, ...]]:
+        """
+        Get (obs index, (x, y) point, layer index) of all points in all observations, converting each key for all
+        observations together. Returns None if teams vary in size.
+        """
+        n_obs = len(observations)
+        try:
+            teams = np.asarray([[obs['left_team'], obs['right_team']] for obs in observations], dtype=np.float64)
+        except ValueError:
+            return None
+        if (teams.ndim != 4) or (teams.shape[3] != 2):
+            return None
+
+        n_players = teams.shape[2]
+        ball = np.asarray([obs['ball'] for obs in observations], dtype=np.float64)[:, 0:2]
+        active = np.fromiter((obs['active'] for obs in observations), dtype=np.int64, count=n_obs)
+        has_active = np.flatnonzero(active != -1)
+
+        obs_idx, layer_idx = cls._base_indexes(n_obs, n_players)
+        obs_idx = np.concatenate([obs_idx, has_active])
+        layer_idx = np.concatenate([layer_idx, np.full(len(has_active), 3)])
+        points = np.concatenate([teams.reshape(-1, 2), ball, teams[has_active, 0, active[has_active]]])
+
+        return obs_idx, points, layer_idx
+
+    @classmethod
+    def generate_smm(cls, observation: Union[Sequence[Dict[str, Any]], Dict[str, Any]],
+                     channel_dimensions: Tuple[int, int] = (96, 72),
+                     out: Union[None, np.ndarray] = None) -> np.ndarray:
+        """
+        Drop in replacement for observation_preprocessing.generate_smm (with the default layers).
+
+        :param observation: Raw observations (dicts), eg. for each controlled player, or over the steps of a game.
+        :param channel_dimensions: (width, height) of the frames.
+        :param out: uint8 array of (n observations, height, width, 4) to reuse. It's cleared before drawing. If not set,
+                    a new array is returned.
+        :return: uint8 array of (n observations, height, width, 4).
+        """
+        if isinstance(observation, dict):
+            observation = [observation]
+
+        shape = (len(observation), channel_dimensions[1], channel_dimensions[0], len(cls.layers))
+        if out is None:
+            out = np.zeros(shape, dtype=np.uint8)
+        else:
+            if out.shape != shape:
+                raise ValueError(f"Output shape {out.shape} doesn't match expected shape {shape}.")
+            out.fill(0)
+
+        if len(observation) == 0:
+            return out
+
+        batch_points = cls._batch_points(observation)
+        if batch_points is None:
+            # Teams of different sizes, get points for each observation
+            obs_idx, points, layer_idx = [], [], []
+            for obs_i, obs in enumerate(observation):
+                for layer_i, layer_points in enumerate(cls._layer_points(obs)):
+                    obs_idx.append(np.full(len(layer_points), obs_i))
+                    layer_idx.append(np.full(len(layer_points), layer_i))
+                    points.append(layer_points)
+            batch_points = np.concatenate(obs_idx), np.concatenate(points), np.concatenate(layer_idx)
+
+        obs_idx, points, layer_idx = batch_points
+        y, x = cls._to_pixels(points, channel_dimensions)
+        out[obs_idx, y, x, layer_idx] = cls.marker_value
+
+        return out
@@ -1,5 +1,6 @@
 import os
 import warnings
+from functools import partial
 from typing import Any, Dict
 
 from rlk.agents.components.replay_buffers.continuous_buffer import ContinuousBuffer
@@ -13,8 +14,6 @@ from rlk.environments.gfootball.environment_processing.smm_frame_process_wrapper
     SMMFrameProcessWrapper
 from rlk.environments.gfootball.register_environments import register_all, SUPPORTED_ENVS
 
-register_all()
-
 
 class GFootballConfig(ConfigBase):
     supported_agents = ('linear_q', 'dqn', 'double_dqn', 'dueling_dqn', 'double_dueling_dqn')
@@ -27,6 +26,7 @@ class GFootballConfig(ConfigBase):
                  remote: bool = False, **kwargs):
         if env_spec not in self.supported_envs:
             warnings.warn(f"Unknown env {env_spec}")
+        register_all()
         self.env_spec = env_spec
         self.using_simple_obs = using_simple_obs
         self.using_smm_obs = using_smm_obs
@@ -53,7 +53,8 @@ class GFootballConfig(ConfigBase):
         return {"model_architecture": SplitterConvNN(observation_shape=(72, 96, 4), n_actions=19, dueling=dueling,
                                                      additional_dense_input_shape=(115,), output_activation=None,
                                                      opt='adam', learning_rate=0.000105),
-                "env_wrappers": [GFRemoteWrapper] if self.remote else [SimpleAndSMMObsWrapper, SMMFrameProcessWrapper]}
+                "env_wrappers": [GFRemoteWrapper] if self.remote else [partial(SimpleAndSMMObsWrapper, reuse_smm=True),
+                                                                       SMMFrameProcessWrapper]}
 
     def _build_for_dqn(self, dueling: bool = False) -> Dict[str, Any]:
         if self.using_simple_obs & self.using_smm_obs:
@@ -0,0 +1,71 @@
+from typing import Any, Sequence, Tuple, Union
+
+import numpy as np
+
+
+def output_dtype(frames: Sequence[Union[np.ndarray, np.dtype]], buffer_function: str) -> np.dtype:
+    """
+    Dtype of frames (or frame dtypes) combined with buffer_function.
+
+    Diff of unsigned integer frames can be negative, so is promoted to a signed type (eg. uint8 -> int16) rather than
+    wrapping around.
+    """
+    dtype = np.result_type(*frames)
+    if (buffer_function == 'diff') and np.issubdtype(dtype, np.unsignedinteger):
+        dtype = np.promote_types(dtype, np.int16)
+
+    return dtype
+
+
+def combine_frames(frames: Sequence[np.ndarray], obs_shape: Tuple[int, ...], buffer_function: str,
+                   dtype: Union[None, np.dtype] = None) -> np.ndarray:
+    """Stack or diff frames (oldest first) into a new array, without intermediate copies."""
+    if dtype is None:
+        dtype = output_dtype(frames, buffer_function)
+
+    if buffer_function == 'stack':
+        out = np.empty(obs_shape + (len(frames),), dtype=dtype)
+        for frame_i, frame in enumerate(frames):
+            out[..., frame_i] = frame.reshape(obs_shape)
+    else:
+        out = np.empty(obs_shape + (1,), dtype=dtype)
+        np.subtract(frames[1].reshape(obs_shape), frames[0].reshape(obs_shape), out=out[..., 0], dtype=dtype)
+
+    return out
+
+
+class LazyFrames:
+    """
+    References to the frames in a buffered observation, which are only stacked (or diffed) when converted to an array.
+
+    Consecutive observations share frames, so holding these (eg. in a replay buffer) rather than stacked arrays uses
+    around 1/buffer_length of the memory, and no stacked array is created on steps where it isn't used. Converts to an
+    array with np.asarray (or anything using __array__, eg. np.expand_dims, np.stack).
+    """
+    __slots__ = ('_frames', '_obs_shape', '_buffer_function')
+
+    def __init__(self, frames: Tuple[np.ndarray, ...], obs_shape: Tuple[int, ...], buffer_function: str) -> None:
+        self._frames = frames
+        self._obs_shape = obs_shape
+        self._buffer_function = buffer_function
+
+    def __array__(self, dtype: Union[None, np.dtype] = None) -> np.ndarray:
+        return combine_frames(self._frames, self._obs_shape, self._buffer_function, dtype=dtype)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._obs_shape + ((len(self._frames),) if self._buffer_function == 'stack' else (1,))
+
+    @property
+    def dtype(self) -> np.dtype:
+        return output_dtype(self._frames, self._buffer_function)
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, idx: Any) -> np.ndarray:
+        return np.asarray(self)[idx]
@@ -0,0 +1,335 @@
+"""
+Server hosting envs built with EnvBuilder, for use with RemoteEnv.
+
+Run with, eg.:
+    python -m rlk.environments.remote.env_server --port 8000
+
+Envs with wrappers are created from the server's named env_builders (see EnvServer), so to serve those start the
+server from Python with them, eg.:
+    EnvServer(port=8000, env_builders={'CartPole-v0': EnvBuilder('CartPole-v0', env_wrappers=wrappers)}).serve_forever()
+
+Endpoints (all POST, with messages encoded with rlk.environments.remote.protocol):
+    /create: Build a new env, returns its env_id and the protocol version to use.
+    /spaces: Observation and action space descriptions of an env.
+    /reset: Reset an env (setting max_episode_steps, if given), returns obs.
+    /step: Step an env with action, returns obs, reward, done, info.
+    /close: Close and remove an env.
+    /reset_batch: Reset envs env_ids (setting max_episode_steps, if given), returns a list of obs.
+    /step_batch: Step envs env_ids with actions (one for each), in one request. Returns lists of obs and infos, and
+                 arrays of rewards and dones. Done envs are reset (if auto_reset), with the last obs of the episode in
+                 their info as 'terminal_observation'.
+"""
+
+import argparse
+import itertools
+import pickle
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import gym
+import numpy as np
+from gym.wrappers import TimeLimit
+
+from rlk.agents.components.helpers.env_builder import EnvBuilder
+from rlk.environments.remote import protocol
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """HTTP server handling each connection in a daemon thread, as http.server.ThreadingHTTPServer (Python 3.7+)."""
+    daemon_threads = True
+
+
+class EnvServer:
+    """
+    Hosts many envs, each built with an EnvBuilder (spec, kwargs and wrappers), and steps them on request.
+
+    Requests are handled in threads and each env has its own lock, so different envs (eg. from different clients) are
+    stepped concurrently. Connections are kept alive (HTTP/1.1) and Nagle's algorithm is disabled, as every message is
+    a request waiting on a small response.
+
+    Batch requests step (or reset) many envs with one round trip, stepping them concurrently on a pool of n_workers
+    threads. This overlaps simulators that release the GIL while stepping (eg. GFootball and ViZDoom engines), for pure
+    Python envs run a server process per core instead.
+
+    Envs are created from:
+     - the name of one of env_builders, which is used as a template (the built envs aren't shared). This is how
+       RemoteEnv creates envs with wrappers by default, the name is sent as builder_name (or env_spec). Or
+     - a gym spec and env kwargs, or
+     - a pickled EnvBuilder, which can include wrappers. This is only accepted with allow_pickle=True, as unpickling
+       can run arbitrary code; only use it on trusted networks.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8000,
+                 env_builders: Union[None, Dict[str, EnvBuilder]] = None,
+                 allow_pickle: bool = False, n_workers: Union[None, int] = None) -> None:
+        """
+        :param host: Address to listen on.
+        :param port: Port to listen on. 0 picks a free port, see .port.
+        :param env_builders: Named EnvBuilders that clients can create envs from.
+        :param allow_pickle: Allow clients to send pickled EnvBuilders.
+        :param n_workers: Threads used to step envs in batch requests. Default None uses ThreadPoolExecutor's default.
+        """
+        self.env_builders = env_builders if env_builders is not None else {}
+        self.allow_pickle = allow_pickle
+        self.n_workers = n_workers
+        self._executor: Union[None, ThreadPoolExecutor] = None
+
+        self._envs: Dict[int, EnvBuilder] = {}
+        self._locks: Dict[int, threading.Lock] = {}
+        self._compress: Dict[int, bool] = {}
+        self._env_ids = itertools.count()
+        self._envs_lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.host, self.port = self._server.server_address[0:2]
+        self._thread: Union[None, threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return f"EnvServer(host={self.host}, port={self.port}, n_envs={self.n_envs})"
+
+    def __enter__(self) -> "EnvServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+
+    @property
+    def n_envs(self) -> int:
+        return len(self._envs)
+
+    def start(self) -> "EnvServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        self._server.serve_forever(poll_interval=poll_interval)
+
+    def shutdown(self) -> None:
+        """Stop serving and close all envs."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+        for env_id in list(self._envs):
+            self._close(env_id)
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _new_builder(self, message: Dict[str, Any]) -> EnvBuilder:
+        if message.get('builder') is not None:
+            if not self.allow_pickle:
+                raise PermissionError("Server doesn't accept pickled EnvBuilders, start it with allow_pickle=True.")
+            builder = pickle.loads(message['builder'].tobytes())
+            if not isinstance(builder, EnvBuilder):
+                raise TypeError(f"Expected a pickled EnvBuilder, got {type(builder)}.")
+        elif (message.get('builder_name') is not None) or (message['env_spec'] in self.env_builders):
+            name = message['builder_name'] if message.get('builder_name') is not None else message['env_spec']
+            if name not in self.env_builders:
+                raise KeyError(f"No env builder named {name}, available are {sorted(self.env_builders)}. Start the "
+                               f"server with it in env_builders, or send the wrappers in a pickled builder (see "
+                               f"RemoteEnv send_pickle, needs allow_pickle).")
+            template = self.env_builders[name]
+            builder = EnvBuilder(template.env_spec, env_kwargs=template.env_kwargs, env_wrappers=template.env_wrappers)
+        else:
+            builder = EnvBuilder(message['env_spec'], env_kwargs=message.get('env_kwargs'))
+
+        # Envs are always built locally on the server
+        builder.remote = False
+
+        return builder
+
+    def _create(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        builder = self._new_builder(message)
+        # Build now, so errors are returned on create
+        builder.set_env()
+
+        with self._envs_lock:
+            env_id = next(self._env_ids)
+            self._envs[env_id] = builder
+            self._locks[env_id] = threading.Lock()
+            self._compress[env_id] = bool(message.get('compress', False))
+
+        return {'env_id': env_id,
+                'protocol_version': min(protocol.PROTOCOL_VERSION, int(message.get('protocol_version', 1)))}
+
+    def _close(self, env_id: int) -> Dict[str, Any]:
+        with self._envs_lock:
+            builder = self._envs.pop(env_id)
+            lock = self._locks.pop(env_id)
+            self._compress.pop(env_id)
+        with lock:
+            builder.close()
+
+        return {'closed': True}
+
+    def _handle_env(self, path: str, env_id: int, message: Dict[str, Any]) -> Dict[str, Any]:
+        if path == '/step':
+            obs, reward, done, info = self._step_env(env_id, message['action'], auto_reset=False)
+            return {'obs': obs, 'reward': reward, 'done': done, 'info': info}
+
+        if path == '/reset':
+            return {'obs': self._reset_env(env_id, max_episode_steps=message.get('max_episode_steps'))}
+
+        builder = self._envs[env_id]
+        with self._locks[env_id]:
+            if path == '/spaces':
+                return {'observation_space': protocol.space_to_description(builder.observation_space),
+                        'action_space': protocol.space_to_description(builder.action_space)}
+
+        raise FileNotFoundError(f"Unknown endpoint {path}.")
+
+    def _step_env(self, env_id: int, action: Any, auto_reset: bool) -> Tuple[Any, float, bool, Dict[str, Any]]:
+        builder = self._envs[env_id]
+        with self._locks[env_id]:
+            obs, reward, done, info = builder.env.step(action)
+            if done and auto_reset:
+                info = dict(info)
+                info['terminal_observation'] = obs
+                obs = builder.env.reset()
+
+        return obs, float(reward), bool(done), info
+
+    @staticmethod
+    def _time_limit(env: gym.Env) -> Union[None, TimeLimit]:
+        """Find the TimeLimit wrapper in an env's wrappers, if it has one."""
+        while isinstance(env, gym.Wrapper):
+            if isinstance(env, TimeLimit):
+                return env
+            env = env.env
+
+        return None
+
+    def _reset_env(self, env_id: int, max_episode_steps: Union[None, int] = None) -> Any:
+        """Reset an env. If max_episode_steps is given, it's set on the env's TimeLimit, which it must have."""
+        builder = self._envs[env_id]
+        with self._locks[env_id]:
+            if max_episode_steps is not None:
+                time_limit = self._time_limit(builder.env)
+                if time_limit is None:
+                    raise ValueError(f"Can't set max_episode_steps, env {env_id} doesn't have a TimeLimit wrapper.")
+                time_limit._max_episode_steps = int(max_episode_steps)
+            return builder.env.reset()
+
+    def _map(self, fn, *args: Sequence[Any]) -> List[Any]:
+        """Apply fn to each env, on the worker threads if there's more than one env."""
+        if len(args[0]) <= 1:
+            return list(map(fn, *args))
+
+        with self._envs_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.n_workers)
+
+        return list(self._executor.map(fn, *args))
+
+    def _handle_batch(self, path: str, env_ids: List[int], message: Dict[str, Any]) -> Dict[str, Any]:
+        if path == '/reset_batch':
+            max_episode_steps = [message.get('max_episode_steps')] * len(env_ids)
+            return {'obs': self._map(self._reset_env, env_ids, max_episode_steps)}
+        if path == '/step_batch':
+            actions = message['actions']
+            if len(actions) != len(env_ids):
+                raise ValueError(f"Got {len(actions)} actions for {len(env_ids)} envs.")
+            auto_reset = [bool(message.get('auto_reset', True))] * len(env_ids)
+            results = self._map(self._step_env, env_ids, actions, auto_reset)
+            obs, rewards, dones, infos = zip(*results) if len(results) > 0 else ((), (), (), ())
+            return {'obs': list(obs), 'rewards': np.array(rewards, dtype=np.float64),
+                    'dones': np.array(dones, dtype=bool), 'infos': list(infos)}
+
+        raise FileNotFoundError(f"Unknown endpoint {path}.")
+
+    def handle(self, path: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a decoded request message, and return the response message."""
+        if path == '/create':
+            return self._create(message)
+
+        if 'env_ids' in message:
+            env_ids = [int(env_id) for env_id in message['env_ids']]
+            unknown = [env_id for env_id in env_ids if env_id not in self._envs]
+            if len(unknown) > 0:
+                raise KeyError(f"Unknown env_ids {unknown}.")
+            return self._handle_batch(path, env_ids, message)
+
+        env_id = int(message['env_id'])
+        if env_id not in self._envs:
+            raise KeyError(f"Unknown env_id {env_id}.")
+        if path == '/close':
+            return self._close(env_id)
+
+        return self._handle_env(path, env_id, message)
+
+    def _compress_response(self, message: Dict[str, Any], resp: Dict[str, Any]) -> bool:
+        """Compress responses for envs created with compress (for batches, if any are)."""
+        env_ids = message.get('env_ids', [message.get('env_id', resp.get('env_id'))])
+
+        return any(self._compress.get(env_id, False) for env_id in env_ids)
+
+    def _make_handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections alive, and send responses immediately
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def _send(self, status: int, resp: Dict[str, Any], compress: bool = False) -> None:
+                body = protocol.encode(resp, compress=compress)
+                self.send_response(status)
+                self.send_header('Content-Type', protocol.CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self) -> None:
+                body = None
+                try:
+                    body = self.rfile.read(int(self.headers['Content-Length']))
+                    message = protocol.decode(body)
+                    resp = server.handle(self.path, message)
+                except (KeyError, FileNotFoundError) as e:
+                    self._send(404, {'error': f"{type(e).__name__}: {e}"})
+                except PermissionError as e:
+                    self._send(403, {'error': f"{type(e).__name__}: {e}"})
+                except ValueError as e:
+                    self._send(400, {'error': f"{type(e).__name__}: {e}"})
+                except Exception as e:
+                    if body is None:
+                        # The request body wasn't read, so the connection can't be used for the next request
+                        self.close_connection = True
+                    self._send(500, {'error': f"{type(e).__name__}: {e}"})
+                else:
+                    self._send(200, resp, compress=server._compress_response(message, resp))
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+def pickle_builder(builder: EnvBuilder) -> np.ndarray:
+    """Pickle an EnvBuilder (without its env) into a uint8 array, for sending to an EnvServer with allow_pickle."""
+    return np.frombuffer(pickle.dumps(builder), dtype=np.uint8)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve envs for RemoteEnv clients.")
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--allow_pickle', action='store_true',
+                        help="Accept pickled EnvBuilders (with wrappers) from clients. Only use on trusted networks.")
+    args = parser.parse_args()
+
+    env_server = EnvServer(host=args.host, port=args.port, allow_pickle=args.allow_pickle)
+    print(f"Serving envs on {env_server.host}:{env_server.port}")
+    try:
+        env_server.serve_forever()
+    finally:
+        env_server.shutdown()
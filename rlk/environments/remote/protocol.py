@@ -0,0 +1,140 @@
+"""
+Binary message encoding used between remote envs and their clients.
+
+A message is a dict of JSON compatible values and numpy arrays (at any depth, including in lists and tuples). It's
+encoded as a fixed header, a JSON description of the message (with arrays replaced by their dtype, shape and position),
+then the raw bytes of each array. Arrays are decoded from the buffer without parsing, rather than via nested lists in
+JSON. The array bytes can optionally be compressed with zlib (worth it for sparse observations like SMM frames, on
+slow networks).
+"""
+
+import json
+import struct
+import zlib
+from typing import Any, Dict, List
+
+import gym
+import numpy as np
+
+# Highest version of the protocol supported. Version 1 is the original JSON (GET) API, see GFRemoteWrapper.
+PROTOCOL_VERSION = 2
+CONTENT_TYPE = 'application/x-rlk-message'
+
+_MAGIC = b'RLKM'
+# Magic, protocol version, flags, length of JSON description
+_HEADER = struct.Struct('<4sBBI')
+_FLAG_COMPRESSED = 1
+
+
+def _to_description(value: Any, buffers: List[bytes], arrays: List[Dict[str, Any]]) -> Any:
+    """Replace arrays with references to buffers, recursively, and make other values JSON compatible."""
+    if isinstance(value, np.ndarray):
+        arrays.append({'dtype': value.dtype.str, 'shape': value.shape, 'nbytes': value.nbytes})
+        # In C order, whatever the layout of value
+        buffers.append(value.tobytes())
+        return {'__array__': len(arrays) - 1}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return {'__tuple__': [_to_description(v, buffers, arrays) for v in value]}
+    if isinstance(value, list):
+        return [_to_description(v, buffers, arrays) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_description(v, buffers, arrays) for k, v in value.items()}
+
+    return value
+
+
+def _from_description(value: Any, arrays: List[np.ndarray]) -> Any:
+    if isinstance(value, dict):
+        if '__array__' in value:
+            return arrays[value['__array__']]
+        if '__tuple__' in value:
+            return tuple(_from_description(v, arrays) for v in value['__tuple__'])
+        return {k: _from_description(v, arrays) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_from_description(v, arrays) for v in value]
+
+    return value
+
+
+def encode(message: Dict[str, Any], compress: bool = False) -> bytes:
+    """
+    :param message: Dict of JSON compatible values and numpy arrays.
+    :param compress: Compress the array bytes.
+    :return: Encoded message.
+    """
+    buffers: List[bytes] = []
+    arrays: List[Dict[str, Any]] = []
+    description = json.dumps({'message': _to_description(message, buffers, arrays),
+                              'arrays': arrays}).encode('utf-8')
+
+    data = b''.join(buffers)
+    if compress:
+        data = zlib.compress(data, 1)
+
+    return b''.join([_HEADER.pack(_MAGIC, PROTOCOL_VERSION, _FLAG_COMPRESSED if compress else 0, len(description)),
+                     description, data])
+
+
+def decode(data: bytes) -> Dict[str, Any]:
+    """
+    :param data: Encoded message.
+    :return: Decoded message. Arrays are writable and don't share memory with data.
+    """
+    magic, version, flags, description_length = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC:
+        raise ValueError("Not an encoded message.")
+    if version > PROTOCOL_VERSION:
+        raise ValueError(f"Message is protocol version {version}, only {PROTOCOL_VERSION} is supported.")
+
+    description_end = _HEADER.size + description_length
+    description = json.loads(bytes(data[_HEADER.size:description_end]).decode('utf-8'))
+    buffer = data[description_end:]
+    # Copy once into a bytearray, so arrays made from it are writable
+    buffer = bytearray(zlib.decompress(buffer) if flags & _FLAG_COMPRESSED else buffer)
+
+    arrays = []
+    offset = 0
+    for array in description['arrays']:
+        arrays.append(np.frombuffer(buffer, dtype=np.dtype(array['dtype']), offset=offset,
+                                    count=int(np.prod(array['shape']))).reshape(tuple(array['shape'])))
+        offset += array['nbytes']
+
+    return _from_description(description['message'], arrays)
+
+
+def space_to_description(space: gym.Space) -> Dict[str, Any]:
+    """Describe a (Box, Discrete, MultiBinary, MultiDiscrete, Tuple or Dict) gym space, for encoding in a message."""
+    if isinstance(space, gym.spaces.Box):
+        return {'type': 'Box', 'low': space.low, 'high': space.high, 'dtype': np.dtype(space.dtype).str}
+    if isinstance(space, gym.spaces.Discrete):
+        return {'type': 'Discrete', 'n': int(space.n)}
+    if isinstance(space, gym.spaces.MultiBinary):
+        return {'type': 'MultiBinary', 'n': space.n}
+    if isinstance(space, gym.spaces.MultiDiscrete):
+        return {'type': 'MultiDiscrete', 'nvec': space.nvec}
+    if isinstance(space, gym.spaces.Tuple):
+        return {'type': 'Tuple', 'spaces': [space_to_description(s) for s in space.spaces]}
+    if isinstance(space, gym.spaces.Dict):
+        return {'type': 'Dict', 'spaces': {k: space_to_description(s) for k, s in space.spaces.items()}}
+
+    raise TypeError(f"Space {space} isn't supported.")
+
+
+def space_from_description(description: Dict[str, Any]) -> gym.Space:
+    space_type = description['type']
+    if space_type == 'Box':
+        return gym.spaces.Box(low=description['low'], high=description['high'], dtype=np.dtype(description['dtype']))
+    if space_type == 'Discrete':
+        return gym.spaces.Discrete(description['n'])
+    if space_type == 'MultiBinary':
+        return gym.spaces.MultiBinary(description['n'])
+    if space_type == 'MultiDiscrete':
+        return gym.spaces.MultiDiscrete(description['nvec'])
+    if space_type == 'Tuple':
+        return gym.spaces.Tuple(tuple(space_from_description(s) for s in description['spaces']))
+    if space_type == 'Dict':
+        return gym.spaces.Dict({k: space_from_description(s) for k, s in description['spaces'].items()})
+
+    raise TypeError(f"Space {space_type} isn't supported.")
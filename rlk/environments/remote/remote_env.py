@@ -0,0 +1,132 @@
+from typing import Any, Callable, Dict, Iterable, Tuple, Union
+
+import gym
+import requests
+from requests.adapters import HTTPAdapter
+
+from rlk.agents.components.helpers.env_builder import EnvBuilder
+from rlk.environments.remote import protocol
+from rlk.environments.remote.env_server import pickle_builder
+
+
+def post(session: requests.Session, url: str, message: Dict[str, Any],
+         timeout: Union[None, float] = None) -> Dict[str, Any]:
+    """Post an encoded message to an EnvServer and return the decoded response, raising server errors."""
+    resp = session.post(url, data=protocol.encode(message), timeout=timeout,
+                        headers={'Content-Type': protocol.CONTENT_TYPE})
+    if resp.status_code != 200:
+        error = resp.reason
+        if resp.headers.get('Content-Type') == protocol.CONTENT_TYPE:
+            error = protocol.decode(resp.content).get('error', error)
+        raise RuntimeError(f"Remote env request {url} failed ({resp.status_code}): {error}")
+
+    return protocol.decode(resp.content)
+
+
+class RemoteEnv(gym.Env):
+    """
+    Env hosted by an EnvServer (see rlk.environments.remote.env_server), used like a local env.
+
+    The env is created on the server from a spec (and kwargs). If wrappers are given, it's created from one of the
+    server's named env_builders instead (by default the one named env_spec), which should have the same wrappers; the
+    wrappers themselves aren't sent. Alternatively, with send_pickle=True, a pickled EnvBuilder including the wrappers
+    is sent, which requires the server to be started with allow_pickle. The observation and action spaces are fetched
+    from the server on creation.
+
+    Requests are made through a persistent session, so the connection is kept alive, using the binary protocol in
+    rlk.environments.remote.protocol.
+    """
+
+    def __init__(self, env_spec: str, env_kwargs: Union[None, Dict[str, Any]] = None,
+                 env_wrappers: Union[None, Iterable[Callable]] = None,
+                 ip: Union[None, str] = None, port: int = 8000,
+                 compress: bool = False, timeout: Union[None, float] = None,
+                 session: Union[None, requests.Session] = None,
+                 builder_name: Union[None, str] = None, send_pickle: bool = False) -> None:
+        """
+        :param env_spec: Gym spec of the env, or the name of one of the server's env_builders.
+        :param env_kwargs: Kwargs for gym.make.
+        :param env_wrappers: Wrappers to apply to the env on the server, see builder_name and send_pickle.
+        :param ip: Server address. Default None uses localhost.
+        :param port: Server port.
+        :param compress: Ask the server to compress observations.
+        :param timeout: Timeout for requests, in seconds. Default None waits forever.
+        :param session: Session to make requests with, eg. shared by envs on the same server (see RemoteVectorEnv).
+                        It isn't closed with the env. Default None creates a new session.
+        :param builder_name: Name of the server's env_builders to create the env from. Default None uses env_spec if
+                             wrappers are given.
+        :param send_pickle: Send a pickled EnvBuilder with the wrappers rather than using a named builder. The
+                            wrappers must be picklable and the server started with allow_pickle.
+        """
+        self.env_spec = env_spec
+        self.env_kwargs = env_kwargs if env_kwargs is not None else {}
+        self.env_wrappers = list(env_wrappers) if env_wrappers is not None else []
+        self.ip = ip if ip is not None else '127.0.0.1'
+        self.port = port
+        self.address = f"http://{self.ip}:{port}"
+        self.compress = compress
+        self.timeout = timeout
+        self.builder_name = builder_name
+        self.send_pickle = send_pickle
+
+        self._max_episode_steps: Union[None, int] = None
+        self._owns_session = session is None
+        self._session = self._new_session() if session is None else session
+        self._remote_env_id: Union[None, int] = None
+        self._create()
+
+        spaces = self._request('/spaces')
+        self.observation_space = protocol.space_from_description(spaces['observation_space'])
+        self.action_space = protocol.space_from_description(spaces['action_space'])
+
+    def __repr__(self) -> str:
+        return f"RemoteEnv(env={self.env_spec}, ip={self.ip}, port={self.port})"
+
+    @staticmethod
+    def _new_session() -> requests.Session:
+        """Session with a single kept alive connection to the server."""
+        session = requests.Session()
+        session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+        return session
+
+    def _post(self, path: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        return post(self._session, f"{self.address}{path}", message, timeout=self.timeout)
+
+    def _create(self) -> None:
+        message = {'env_spec': self.env_spec, 'env_kwargs': self.env_kwargs, 'compress': self.compress,
+                   'protocol_version': protocol.PROTOCOL_VERSION}
+        if self.send_pickle:
+            message['builder'] = pickle_builder(EnvBuilder(self.env_spec, env_kwargs=self.env_kwargs,
+                                                           env_wrappers=self.env_wrappers))
+        elif self.builder_name is not None:
+            message['builder_name'] = self.builder_name
+        elif len(self.env_wrappers) > 0:
+            message['builder_name'] = self.env_spec
+
+        self._remote_env_id = self._post('/create', message)['env_id']
+
+    def _request(self, path: str, **message) -> Dict[str, Any]:
+        message['env_id'] = self._remote_env_id
+
+        return self._post(path, message)
+
+    def reset(self) -> Any:
+        return self._request('/reset', max_episode_steps=self._max_episode_steps)['obs']
+
+    def step(self, action: Any) -> Tuple[Any, float, bool, Dict[str, Any]]:
+        resp = self._request('/step', action=action)
+
+        return resp['obs'], resp['reward'], resp['done'], resp['info']
+
+    def render(self, mode: str = 'human') -> None:
+        # Not supported, but doesn't need to break.
+        pass
+
+    def close(self) -> None:
+        """Close the env on the server, and the connection."""
+        if self._remote_env_id is not None:
+            self._request('/close')
+            self._remote_env_id = None
+        if self._owns_session:
+            self._session.close()
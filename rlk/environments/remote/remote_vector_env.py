@@ -0,0 +1,115 @@
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+import requests
+from gym.vector import VectorEnv
+from gym.vector.utils import concatenate, create_empty_array
+from requests.adapters import HTTPAdapter
+
+from rlk.environments.remote.remote_env import RemoteEnv, post
+
+
+class RemoteVectorEnv(VectorEnv):
+    """
+    Vector of envs hosted by one EnvServer, stepped together with a single request per step.
+
+    Each step sends all actions to the server's /step_batch endpoint, which steps the envs concurrently and returns all
+    observations, rewards and dones in one response, so the per request latency is shared across the batch rather than
+    paid for each env. Observations are batched using the single env observation space, as gym's vector envs.
+
+    As with gym's vector envs, envs that are done are reset automatically, the returned observation is the first of
+    the next episode, and the last observation of the episode is in the env's info as 'terminal_observation'.
+    """
+
+    def __init__(self, env_spec: str, num_envs: int, env_kwargs: Union[None, Dict[str, Any]] = None,
+                 env_wrappers: Union[None, Iterable[Callable]] = None,
+                 ip: Union[None, str] = None, port: int = 8000,
+                 compress: bool = False, timeout: Union[None, float] = None,
+                 reuse_obs: bool = False, builder_name: Union[None, str] = None, send_pickle: bool = False) -> None:
+        """
+        :param env_spec: Gym spec of the env, or the name of one of the server's env_builders.
+        :param num_envs: Number of envs to create on the server.
+        :param env_kwargs: Kwargs for gym.make.
+        :param env_wrappers: Wrappers to apply to the envs on the server, see RemoteEnv.
+        :param ip: Server address. Default None uses localhost.
+        :param port: Server port.
+        :param compress: Ask the server to compress observations.
+        :param timeout: Timeout for requests, in seconds. Default None waits forever.
+        :param reuse_obs: Write the batched observations into the same array each step. Only use when observations
+                          aren't kept after the next step (eg. not with a replay buffer).
+        :param builder_name: Name of the server's env_builders to create the envs from, see RemoteEnv.
+        :param send_pickle: Send the wrappers in a pickled EnvBuilder, see RemoteEnv.
+        """
+        self.timeout = timeout
+        self.reuse_obs = reuse_obs
+
+        self._session = requests.Session()
+        self._session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self.envs: List[RemoteEnv] = []
+        try:
+            for _ in range(num_envs):
+                self.envs.append(RemoteEnv(env_spec, env_kwargs=env_kwargs, env_wrappers=env_wrappers, ip=ip,
+                                           port=port, compress=compress, timeout=timeout, session=self._session,
+                                           builder_name=builder_name, send_pickle=send_pickle))
+        except Exception:
+            self._close_envs()
+            raise
+
+        super().__init__(num_envs=num_envs, observation_space=self.envs[0].observation_space,
+                         action_space=self.envs[0].action_space)
+
+        self.env_spec = env_spec
+        self.address = self.envs[0].address
+        # Set on the server's envs on reset, see .set_max_episode_steps
+        self._max_episode_steps: Union[None, int] = None
+        self._env_ids = [env._remote_env_id for env in self.envs]
+        self._actions: Union[None, List[Any]] = None
+        self._obs: Union[None, Any] = None
+
+    def __repr__(self) -> str:
+        return f"RemoteVectorEnv(env={self.env_spec}, num_envs={self.num_envs}, address={self.address})"
+
+    def set_max_episode_steps(self, max_episode_steps: Union[None, int]) -> None:
+        """
+        Set the time limit of the server's envs, from the next reset (as setting ._max_episode_steps on a RemoteEnv).
+
+        :param max_episode_steps: Maximum steps per episode. The server's envs need a TimeLimit wrapper (gym.make adds
+                                  one). None leaves their limits unchanged.
+        """
+        self._max_episode_steps = max_episode_steps
+
+    def _post(self, path: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        message['env_ids'] = self._env_ids
+
+        return post(self._session, f"{self.address}{path}", message, timeout=self.timeout)
+
+    def _batch_obs(self, obs: List[Any]) -> Any:
+        if (not self.reuse_obs) or (self._obs is None):
+            self._obs = create_empty_array(self.single_observation_space, n=self.num_envs, fn=np.empty)
+
+        return concatenate(obs, self._obs, self.single_observation_space)
+
+    def reset_wait(self, **kwargs) -> Any:
+        return self._batch_obs(self._post('/reset_batch', {'max_episode_steps': self._max_episode_steps})['obs'])
+
+    def step_async(self, actions: Iterable[Any]) -> None:
+        self._actions = list(actions)
+
+    def step_wait(self, **kwargs) -> Tuple[Any, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        resp = self._post('/step_batch', {'actions': self._actions, 'auto_reset': True})
+        self._actions = None
+
+        return self._batch_obs(resp['obs']), resp['rewards'], resp['dones'], resp['infos']
+
+    def _close_envs(self) -> None:
+        for env in self.envs:
+            env.close()
+        self._session.close()
+
+    def close_extras(self, terminate: bool = False, **kwargs) -> None:
+        """Close the envs on the server. On garbage collection (terminate), the server may already be gone."""
+        try:
+            self._close_envs()
+        except requests.RequestException:
+            if not terminate:
+                raise
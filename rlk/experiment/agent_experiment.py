@@ -5,16 +5,18 @@ from typing import Callable, Union, Dict, Any
 from typing import List
 
 import gym
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
 from joblib import Parallel, delayed
 from joblib.externals.loky.process_executor import BrokenProcessPool
 
 from rlk.agents.agent_base import AgentBase
+from rlk.agents.components.helpers.lazy_import import LazyModule
 from rlk.agents.components.helpers.virtual_gpu import VirtualGPU
 from rlk.environments.config_base import ConfigBase
 
+plt = LazyModule('matplotlib.pyplot')
+sns = LazyModule('seaborn')
+
 
 @dataclass
 class AgentExperiment:
@@ -58,7 +58,7 @@ class MultiTrainer:
     def update_main_training_history(self, training_histories: List[TrainingHistory]):
 
         for th in training_histories:
-            self.agent.training_history.extend(th.history)
+            self.agent.training_history.extend(th)
 
         self.agent.training_history.plot(metrics=["frames", "total_reward"], show=True)
 
@@ -73,8 +73,7 @@ class MultiTrainer:
                                                  samples[2][s_idx], samples[3][s_idx]))
 
     def update_main_epsilon(self, n_steps):
-        for _ in range(n_steps):
-            self.agent.eps.eps_current = self.agent.eps._decay()
+        self.agent.eps.advance(n_steps)
 
     def update_main_weights(self, new_weights: List[np.ndarray]) -> None:
         current_weights = self.agent.get_weights()
@@ -103,6 +102,9 @@ class MultiTrainer:
             warnings.simplefilter('ignore', FutureWarning)
 
             agent_config["name"] = f"{agent_config.get('name', 'Agent')}_{str(uuid.uuid1())}"
+            if agent_config.get('training_history') is not None:
+                # Worker episodes are logged by the main history when merged, workers mustn't write to its log
+                agent_config['training_history'] = agent_config['training_history'].without_log()
 
             agent: DeepQAgent = agent_class(**agent_config)
             agent.train(**training_kwargs)
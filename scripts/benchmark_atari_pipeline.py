@@ -0,0 +1,97 @@
+"""
+Compare steps per second of AtariPipelineWrapper with the equivalent chain of separate wrappers.
+
+Uses an Atari env if the ROM is available, otherwise (or with --synthetic) an env returning random (210, 160, 3) frames,
+which measures the wrapper overhead only.
+
+Usage:
+python -m scripts.benchmark_atari_pipeline
+python -m scripts.benchmark_atari_pipeline --env_spec SpaceInvadersNoFrameskip-v0 --n_steps 5000
+python -m scripts.benchmark_atari_pipeline --synthetic --buffer_function diff --buffer_length 2
+"""
+
+import argparse
+import time
+from functools import reduce
+from typing import Any, Callable, Dict, Tuple
+
+import gym
+import numpy as np
+
+from rlk.environments.atari.environment_processing.atari_pipeline_wrapper import AtariPipelineWrapper
+
+
+class SyntheticFrameEnv(gym.Env):
+    """Returns one of a few pregenerated (210, 160, 3) uint8 frames each step."""
+    observation_space = gym.spaces.Box(low=0, high=255, shape=(210, 160, 3), dtype=np.uint8)
+    action_space = gym.spaces.Discrete(6)
+
+    def __init__(self, n_frames: int = 16) -> None:
+        self._frames = [np.random.RandomState(i).randint(0, 256, size=(210, 160, 3), dtype=np.uint8)
+                        for i in range(n_frames)]
+        self._step = 0
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, Dict[Any, Any]]:
+        self._step += 1
+        return self._frames[self._step % len(self._frames)], 0.0, False, {}
+
+    def reset(self) -> np.ndarray:
+        self._step = 0
+        return self._frames[0]
+
+    def render(self, mode: str = 'human') -> None:
+        pass
+
+
+def make_base_env(env_spec: str, synthetic: bool = False) -> gym.Env:
+    if not synthetic:
+        try:
+            return gym.make(env_spec)
+        except Exception as e:
+            print(f"Couldn't make {env_spec} ({e}), using synthetic frames.")
+
+    return SyntheticFrameEnv()
+
+
+def steps_per_second(env: gym.Env, n_steps: int = 2000, reset_every: int = 500) -> float:
+    env.reset()
+    t0 = time.perf_counter()
+    for step in range(n_steps):
+        obs, _, done, _ = env.step(step % env.action_space.n)
+        np.asarray(obs)
+        if done or not (step + 1) % reset_every:
+            env.reset()
+
+    return n_steps / (time.perf_counter() - t0)
+
+
+def benchmark(make_env: Callable[[], gym.Env], n_steps: int = 2000, **options) -> Dict[str, float]:
+    """
+    :param make_env: Function returning a new base env.
+    :param n_steps: Number of steps to time for each version.
+    :param options: Options for AtariPipelineWrapper (and the equivalent chain).
+    :return: Steps per second for each version.
+    """
+    chained_env = reduce(lambda env, wrapper: wrapper(env), AtariPipelineWrapper.chained_wrappers(**options),
+                         make_env())
+    fused_env = AtariPipelineWrapper(make_env(), **options)
+
+    return {'chained': steps_per_second(chained_env, n_steps=n_steps),
+            'fused': steps_per_second(fused_env, n_steps=n_steps)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--env_spec', type=str, default='PongNoFrameskip-v4')
+    parser.add_argument('--synthetic', action='store_true')
+    parser.add_argument('--n_steps', type=int, default=2000)
+    parser.add_argument('--buffer_length', type=int, default=3)
+    parser.add_argument('--buffer_function', type=str, default='stack')
+    parser.add_argument('--lazy', action='store_true')
+    args = parser.parse_args()
+
+    results = benchmark(lambda: make_base_env(args.env_spec, synthetic=args.synthetic), n_steps=args.n_steps,
+                        buffer_length=args.buffer_length, buffer_function=args.buffer_function, lazy=args.lazy)
+    for version, sps in results.items():
+        print(f"{version}: {sps:.0f} steps/s")
+    print(f"Speedup: {results['fused'] / results['chained']:.2f}x")
@@ -0,0 +1,62 @@
+"""
+Measure import time of rlk modules, and which heavy dependencies each one pulls in.
+
+Each module is imported in a fresh interpreter with python -X importtime, which is the cost paid by each new worker
+process (eg. in AgentExperiment or AsyncEvaluator) before it can do anything.
+
+Usage:
+python -m scripts.benchmark_import_time
+python -m scripts.benchmark_import_time rlk.agents.q_learning.deep_q_agent
+"""
+
+import subprocess
+import sys
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_MODULES = ['rlk.agents.agent_base',
+                   'rlk.agents.random.random_agent',
+                   'rlk.agents.q_learning.linear_q_agent',
+                   'rlk.agents.q_learning.deep_q_agent',
+                   'rlk.agents.policy_gradient.reinforce_agent',
+                   'rlk.environments.cart_pole.cart_pole_config',
+                   'rlk.environments.atari.pong.pong_config',
+                   'rlk.experiment.agent_experiment']
+HEAVY_DEPENDENCIES = ('tensorflow', 'sklearn', 'matplotlib', 'seaborn', 'gfootball', 'vizdoom')
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """Import a module in a new process, and return (name, self us, cumulative us) for each module imported."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, universal_newlines=True, check=True)
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or ('|' not in line) or ('self [us]' in line):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    return times
+
+
+def summarise(module: str) -> Dict[str, float]:
+    times = import_times(module)
+    total = max([cumulative for name, _, cumulative in times if name == module])
+    summary = {'total_s': total / 1e6}
+    for dep in HEAVY_DEPENDENCIES:
+        summary[f"{dep}_s"] = max([cumulative for name, _, cumulative in times if name == dep], default=0) / 1e6
+
+    return summary
+
+
+def run(modules: Iterable[str]) -> None:
+    print(f"{'module':<50}{'total (s)':>10}  heavy dependencies imported (cumulative s)")
+    for module in modules:
+        summary = summarise(module)
+        deps = ", ".join([f"{dep} {summary[f'{dep}_s']:.2f}" for dep in HEAVY_DEPENDENCIES
+                          if summary[f'{dep}_s'] > 0])
+        print(f"{module:<50}{summary['total_s']:>10.2f}  {deps}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:] if len(sys.argv) > 1 else DEFAULT_MODULES)
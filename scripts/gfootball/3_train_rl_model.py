@@ -8,7 +8,8 @@ step, depending on epsilon, the agent will either sample an action from its own
 
 Communication between the rlk env and the bot (which uses the Kaggle completion api and expects raw observations rather
 than, eg. simple115 from the gym-wrapped env, is handled using the SimpleAndRawObsWrapper. This returns the simple115
-observations to rl agent as normal, but additionally dumps the raw observations to disk for the bot to use.
+observations to rl agent as normal, but additionally puts the raw observations in an in-memory channel (see ObsChannel)
+for the bot to use.
 
 There's also a frame buffer wrapper that stacks 2 frames.
 """
@@ -57,13 +58,14 @@ if __name__ == "__main__":
                        env_spec="GFootball-kaggle_11_vs_11_001-v0",
                        gamma=0.99,
                        env_wrappers=[
-                           # Wrapper to get s115 and dump raw observations to disk
+                           # Wrapper to get s115 and pass raw observations to the bot
                            partial(SimpleAndRawObsWrapper, raw_using=[],
-                                   raw_dump_path=BotConfig().json_dump_path),
+                                   obs_channel=BotConfig.obs_channel),
                            # Wrapper to buffer observations
                            partial(FrameBufferWrapper, obs_shape=(115,),
                                    buffer_length=2,
-                                   buffer_function='stack')],
+                                   buffer_function='stack',
+                                   lazy=True)],
                        model_architecture=DenserNN(observation_shape=(115, 2), n_actions=19, dueling=False,
                                                    output_activation=None, opt='adam', learning_rate=0.00009),
                        eps=EpsilonPolicy(eps_initial=0.75, decay=0.000001, eps_min=0.01, policy=bot),
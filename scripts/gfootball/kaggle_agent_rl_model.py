@@ -15,7 +15,7 @@ from tensorflow import keras
 
 
 class BufferWrapper(gym.Wrapper):
-    """General buffer wrapper to handle raw observations."""
+    """General buffer wrapper to handle observations."""
 
     def __init__(self, env: Union[None, gym.Env] = None, buffer_length: int = 2) -> None:
         if env is not None:
@@ -60,16 +60,11 @@ def agent(obs):
     global mod
     global buffer
 
-    buffer.add(obs)
-    buffered_obs = buffer.get()
+    # Buffer the s115 features rather than the raw obs, so each obs is only converted once
+    buffer.add(Simple115StateWrapper.convert_observation(obs['players_raw'], fixed_positions=False))
 
-    s115_obs = []
-    for b in buffered_obs:
-        if b is None:
-            # First step
-            s115_obs.append(np.zeros(shape=(1, 115)))
-        else:
-            s115_obs.append(Simple115StateWrapper.convert_observation(b['players_raw'], fixed_positions=False))
+    # None on first step
+    s115_obs = [np.zeros(shape=(1, 115)) if b is None else b for b in buffer.get()]
 
     obs = np.concatenate([np.array(s)[..., None] for s in s115_obs], axis=2)
 
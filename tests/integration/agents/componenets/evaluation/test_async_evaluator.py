@@ -0,0 +1,55 @@
+import gc
+import tempfile
+import unittest
+
+import tensorflow as tf
+
+from rlk.agents.components.evaluation.async_evaluator import AsyncEvaluator
+from rlk.agents.components.helpers.virtual_gpu import VirtualGPU
+from rlk.agents.q_learning.deep_q_agent import DeepQAgent
+from rlk.environments.cart_pole.cart_pole_config import CartPoleConfig
+
+
+class TestAsyncEvaluator(unittest.TestCase):
+    _sut = AsyncEvaluator
+    _gpu = VirtualGPU(256)
+
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._config = CartPoleConfig(agent_type='dqn', plot_during_training=False, folder=self._tmp_dir.name)
+
+    def tearDown(self):
+        tf.keras.backend.clear_session()
+        tf.compat.v1.reset_default_graph()
+        gc.collect()
+        self._tmp_dir.cleanup()
+
+    def test_evaluations_added_to_training_history(self):
+        # Arrange
+        agent = DeepQAgent(**self._config.build())
+        evaluator = self._sut(agent_class=DeepQAgent, agent_config=self._config.build(), n_episodes=2,
+                              max_episode_steps=10)
+        evaluator.start()
+
+        # Act
+        agent.train(n_episodes=3, max_episode_steps=10, verbose=False, render=False, evaluator=evaluator,
+                    evaluate_every=1)
+        evaluator.close(agent.training_history)
+
+        # Assert
+        n_evaluated = 3 - evaluator.n_dropped
+        self.assertGreater(n_evaluated, 0)
+        self.assertEqual(n_evaluated * 2, len(agent.training_history.evaluation_history))
+        self.assertFalse(evaluator.running)
+
+    def test_close_without_snapshots_stops_worker(self):
+        # Arrange
+        evaluator = self._sut(agent_class=DeepQAgent, agent_config=self._config.build())
+        evaluator.start()
+
+        # Act
+        n = evaluator.close()
+
+        # Assert
+        self.assertEqual(0, n)
+        self.assertFalse(evaluator.running)
@@ -71,6 +71,48 @@ class TestDeepQAgent(unittest.TestCase):
         # Assert
         self.assertEqual(agent, agent_2)
 
+    def test_checkpoint_round_trips_agent(self):
+        # Arrange
+        agent = self._sut(**CartPoleConfig(agent_type='dqn', plot_during_training=False,
+                                           folder=self._tmp_dir.name).build())
+        agent.train(verbose=False, render=False, n_episodes=4)
+
+        # Act
+        agent.save_checkpoint()
+        agent_2 = self._sut.load_checkpoint(f"{agent.name}_{agent.env_spec}")
+
+        # Assert
+        self.assertIn('_target_model', agent_2._lazy_loaders)
+        self.assertIn('replay_buffer', agent_2._lazy_loaders)
+        obs = agent.env.reset()
+        self.assertEqual(agent.get_best_action(obs), agent_2.get_best_action(obs))
+        self.assertEqual(agent, agent_2)
+        self.assertEqual(agent.replay_buffer.n, agent_2.replay_buffer.n)
+        optimizer_weights = agent._action_model.optimizer.get_weights()
+        optimizer_weights_2 = agent_2._action_model.optimizer.get_weights()
+        self.assertEqual(len(optimizer_weights), len(optimizer_weights_2))
+        for w, w_2 in zip(optimizer_weights, optimizer_weights_2):
+            self.assertTrue((w == w_2).all())
+        self.assertEqual(len(agent.training_history.history), len(agent_2.training_history.history))
+        for w, w_2 in zip(agent._target_model.get_weights(), agent_2._target_model.get_weights()):
+            self.assertTrue((w == w_2).all())
+        self.assertEqual({}, agent_2._lazy_loaders)
+        agent_2.train(verbose=False, render=False, n_episodes=1)
+
+    def test_load_checkpoint_falls_back_to_saved_agent(self):
+        # Arrange
+        agent = self._sut(**CartPoleConfig(agent_type='dqn', plot_during_training=False,
+                                           folder=self._tmp_dir.name).build())
+        agent.train(verbose=False, render=False, n_episodes=2)
+
+        # Act
+        agent.save()
+        agent_2 = self._sut.load_checkpoint(f"{agent.name}_{agent.env_spec}")
+
+        # Assert
+        self.assertTrue(agent_2.ready)
+        self.assertEqual(agent, agent_2)
+
     def test_dqn_cart_pole_example(self):
         # Arrange
         config = CartPoleConfig(agent_type='dqn', plot_during_training=False,
@@ -26,27 +26,6 @@ class TestSMMFrameProcessWrapper(unittest.TestCase):
         self._env_fixture._obs = np.zeros(self._obs_shape) + 255
         self._sut = SMMFrameProcessWrapper(self._env_fixture)
 
-        frames = [np.random.randint(low=0, high=252, size=(5, 5, 1)) + i for i in range(4)]
-        self._random_obs = np.concatenate(frames, axis=2)
-
-    def test_normalise_single_frame(self):
-        # Act
-        norm_frame = self._sut._normalise_frame(self._random_obs)
-
-        # Assert
-        self.assertEqual(norm_frame.shape, self._random_obs.shape)
-        self.assertGreaterEqual(norm_frame.min(), 0)
-        self.assertLessEqual(norm_frame.max(), 1)
-
-    def test_normalise_all_frames(self):
-        # Act
-        norm_frame = self._sut._normalise_frame(self._random_obs[..., 0])
-
-        # Assert
-        self.assertEqual(norm_frame.shape, self._random_obs.shape[0: 2])
-        self.assertGreaterEqual(norm_frame.min(), 0)
-        self.assertLessEqual(norm_frame.max(), 1)
-
     def test_build_buffer_of_2_obs(self):
         # Act
         obs, _, _, _ = self._sut.step(3)
@@ -79,7 +58,7 @@ class TestSMMFrameProcessWrapper(unittest.TestCase):
         self.assertEqual(0, np.unique(initial_buffer))
         self.assertNotEqual(0, np.unique(buffer._obs_buffer[0]))
         self.assertAlmostEqual(1 / 255.0, float(np.unique(first_call)))
-        self.assertEqual(2 / 255.0, float(np.unique(second_call)))
+        self.assertAlmostEqual(2 / 255.0, float(np.unique(second_call)))
 
     def test_process_with_tuple_input(self):
         # Arrange
@@ -101,7 +80,7 @@ class TestSMMFrameProcessWrapper(unittest.TestCase):
         self.assertNotEqual(0, np.unique(buffer._obs_buffer[0]))
         self.assertAlmostEqual(1 / 255.0, float(np.unique(first_call[0])))
         self.assertEqual(first_call[1:], (['other', 'obs'],))
-        self.assertEqual(2 / 255.0, float(np.unique(second_call[0])))
+        self.assertAlmostEqual(2 / 255.0, float(np.unique(second_call[0])))
         self.assertEqual(second_call[1:], (['other', 'obs'],))
 
     @unittest.skipUnless(GFOOTBALL_AVAILABLE, "GFootball not available in this env")
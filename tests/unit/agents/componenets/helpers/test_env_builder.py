@@ -0,0 +1,44 @@
+import unittest
+
+import gym
+
+from rlk.agents.components.helpers.env_builder import EnvBuilder
+from rlk.environments.cart_pole.environment_processing.clipepr_wrapper import ClipperWrapper
+
+
+class TestEnvBuilder(unittest.TestCase):
+    _sut = EnvBuilder
+
+    def test_env_not_built_until_accessed(self) -> None:
+        # Act
+        env_builder = self._sut(env_spec='CartPole-v0')
+
+        # Assert
+        self.assertIsNone(env_builder._env)
+        self.assertIsInstance(env_builder.env, gym.Env)
+        self.assertIsNotNone(env_builder._env)
+
+    def test_spaces_available_without_building_env_after_first_build(self) -> None:
+        # Arrange
+        first_env_builder = self._sut(env_spec='CartPole-v0', env_wrappers=[ClipperWrapper])
+        expected_spaces = first_env_builder.spaces
+
+        # Act
+        env_builder = self._sut(env_spec='CartPole-v0', env_wrappers=[ClipperWrapper])
+        spaces = env_builder.spaces
+
+        # Assert
+        self.assertIsNone(env_builder._env)
+        self.assertEqual(expected_spaces, spaces)
+        self.assertEqual(2, env_builder.action_space.n)
+
+    def test_close_detaches_env(self) -> None:
+        # Arrange
+        env_builder = self._sut(env_spec='CartPole-v0')
+        _ = env_builder.env
+
+        # Act
+        env_builder.close()
+
+        # Assert
+        self.assertIsNone(env_builder._env)
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from rlk.agents.components.helpers.lazy_import import LazyModule
+
+
+class TestLazyModule(unittest.TestCase):
+    _sut = LazyModule
+
+    def test_module_loaded_on_first_attribute_access(self) -> None:
+        # Arrange
+        json = self._sut('json')
+
+        # Act
+        output = json.dumps([1])
+
+        # Assert
+        self.assertEqual('[1]', output)
+        self.assertIsNotNone(json._module)
+
+    def test_importing_configs_and_agent_base_does_not_import_heavy_dependencies(self) -> None:
+        # Arrange
+        # Needs a fresh interpreter, as these will already have been imported by other tests
+        code = ("import sys\n"
+                "import rlk.agents.agent_base, rlk.environments.cart_pole.cart_pole_config\n"
+                "print(','.join([m for m in ('tensorflow', 'sklearn', 'matplotlib', 'seaborn') "
+                "if m in sys.modules]))")
+
+        # Act
+        output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True,
+                                universal_newlines=True).stdout.strip()
+
+        # Assert
+        self.assertEqual('', output)
+
+    def test_importing_models_does_not_import_tensorflow(self) -> None:
+        # Arrange
+        code = ("import sys\n"
+                "import rlk.agents.models.dense_nn, rlk.agents.models.conv_nn, rlk.agents.models.splitter_conv_nn\n"
+                "print('tensorflow' in sys.modules)")
+
+        # Act
+        output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True,
+                                universal_newlines=True).stdout.strip()
+
+        # Assert
+        self.assertEqual('False', output)
+
+    def test_modules_do_not_use_postponed_annotations(self) -> None:
+        """from __future__ import annotations isn't available on Python 3.6, lazy annotations should be strings."""
+        # Arrange
+        rlk_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
+            sys.modules[self._sut.__module__].__file__)))))
+
+        # Act
+        using = []
+        for root, _, files in os.walk(rlk_dir):
+            for fn in (f for f in files if f.endswith('.py')):
+                with open(os.path.join(root, fn), 'r') as f:
+                    if any(line.startswith('from __future__ import annotations') for line in f):
+                        using.append(fn)
+
+        # Assert
+        self.assertEqual([], using)
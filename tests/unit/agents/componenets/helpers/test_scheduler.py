@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from rlk.agents.components.helpers.scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+    _sut = Scheduler
+
+    def test_frame_triggered_task_runs_when_due(self) -> None:
+        # Arrange
+        scheduler = self._sut()
+        callback = Mock(return_value=1)
+        scheduler.add('task', callback, every_frames=10)
+
+        # Act
+        outputs_1 = scheduler.advance(n_frames=6)
+        outputs_2 = scheduler.advance(n_frames=6)
+        outputs_3 = scheduler.advance(n_frames=6)
+
+        # Assert
+        self.assertEqual({}, outputs_1)
+        self.assertEqual({'task': 1}, outputs_2)
+        self.assertEqual({}, outputs_3)
+        self.assertEqual(1, callback.call_count)
+        self.assertEqual(18, scheduler.frame)
+
+    def test_time_triggered_task_runs_when_due(self) -> None:
+        # Arrange
+        scheduler = self._sut()
+        callback = Mock()
+        scheduler.add('task', callback, every_seconds=60)
+
+        # Act
+        scheduler.advance(n_frames=1)
+        with patch('rlk.agents.components.helpers.scheduler.time.time', return_value=1e12):
+            scheduler.advance(n_frames=1)
+
+        # Assert
+        self.assertEqual(1, callback.call_count)
+
+    def test_task_with_no_trigger_never_runs(self) -> None:
+        # Arrange
+        scheduler = self._sut()
+        callback = Mock()
+        scheduler.add('task', callback)
+
+        # Act
+        for _ in range(5):
+            scheduler.advance(n_frames=100)
+
+        # Assert
+        callback.assert_not_called()
+
+    def test_costs_include_tasks_and_logged_activities(self) -> None:
+        # Arrange
+        scheduler = self._sut()
+        scheduler.add('task', Mock(), every_frames=1)
+
+        # Act
+        scheduler.advance(n_frames=1)
+        scheduler.advance(n_frames=1)
+        scheduler.log_cost('play_episode', 0.5)
+
+        # Assert
+        self.assertEqual(2, scheduler.costs['task']['n_calls'])
+        self.assertEqual({'n_calls': 1, 'time_taken': 0.5}, scheduler.costs['play_episode'])
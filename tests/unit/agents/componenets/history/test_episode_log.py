@@ -0,0 +1,158 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from rlk.agents.components.history.episode_log import EpisodeLog
+
+
+class TestEpisodeLog(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._tmp_dir.name, 'logs', 'episodes.log')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    @staticmethod
+    def _records(n: int, offset: int = 0) -> np.ndarray:
+        records = np.zeros(n, dtype=EpisodeLog.record_dtype)
+        records['frames'] = np.arange(offset, offset + n)
+        records['total_reward'] = np.arange(offset, offset + n) * 0.5
+
+        return records
+
+    def test_write_and_read_records(self):
+        # Arrange
+        sut = EpisodeLog(self._path, fsync_every=2)
+
+        # Act
+        sut.open()
+        sut.write(self._records(3))
+        sut.write(self._records(2, offset=3))
+        records = EpisodeLog.read(self._path)
+        sut.close()
+
+        # Assert
+        self.assertIsInstance(records, np.memmap)
+        self.assertEqual(5, EpisodeLog.n_records(self._path))
+        np.testing.assert_array_equal(self._records(5), records)
+        np.testing.assert_array_equal(self._records(5), EpisodeLog.read(self._path, mmap=False))
+
+    def test_read_ignores_partial_record(self):
+        # Arrange
+        sut = EpisodeLog(self._path)
+        sut.open()
+        sut.write(self._records(2))
+        sut.close()
+        with open(self._path, 'ab') as f:
+            f.write(b'\x00' * 5)
+
+        # Act
+        records = EpisodeLog.read(self._path, mmap=False)
+
+        # Assert
+        self.assertEqual(2, len(records))
+
+    def test_open_appends_to_existing_log(self):
+        # Arrange
+        sut = EpisodeLog(self._path)
+        sut.open()
+        sut.write(self._records(5))
+        sut.close()
+
+        # Act
+        n_records = sut.open()
+        sut.write(self._records(1, offset=5))
+        sut.close()
+
+        # Assert
+        self.assertEqual(5, n_records)
+        np.testing.assert_array_equal(self._records(6), EpisodeLog.read(self._path))
+
+    def test_open_removes_partial_record_before_appending(self):
+        # Arrange
+        sut = EpisodeLog(self._path)
+        sut.open()
+        sut.write(self._records(2))
+        sut.close()
+        with open(self._path, 'ab') as f:
+            f.write(b'\x00' * 5)
+
+        # Act
+        n_records = sut.open()
+        sut.write(self._records(1, offset=2))
+        sut.close()
+
+        # Assert
+        self.assertEqual(2, n_records)
+        np.testing.assert_array_equal(self._records(3), EpisodeLog.read(self._path))
+
+    def test_open_truncates_only_when_asked(self):
+        # Arrange
+        sut = EpisodeLog(self._path)
+        sut.open()
+        sut.write(self._records(5))
+        sut.close()
+
+        # Act
+        n_kept = sut.open(truncate_to=3)
+        sut.write(self._records(1, offset=10))
+        sut.close()
+
+        # Assert
+        self.assertEqual(3, n_kept)
+        np.testing.assert_array_equal(np.concatenate([self._records(3), self._records(1, offset=10)]),
+                                      EpisodeLog.read(self._path))
+
+    def test_open_new_log_returns_0(self):
+        # Arrange
+        sut = EpisodeLog(self._path)
+
+        # Act
+        n_records = sut.open(truncate_to=3)
+        sut.close()
+
+        # Assert
+        self.assertEqual(0, n_records)
+
+    def test_rotate_moves_log_to_free_path(self):
+        # Arrange
+        sut = EpisodeLog(self._path)
+        for n in (2, 3):
+            sut.open()
+            sut.write(self._records(n))
+            sut.close()
+            sut.rotate()
+
+        # Act
+        rotated = sut.rotate()
+
+        # Assert
+        self.assertIsNone(rotated)
+        self.assertFalse(os.path.exists(self._path))
+        self.assertEqual(2, EpisodeLog.n_records(f"{self._path}.1"))
+        self.assertEqual(3, EpisodeLog.n_records(f"{self._path}.2"))
+
+    def test_read_raises_for_incompatible_file(self):
+        # Arrange
+        os.makedirs(os.path.dirname(self._path))
+        with open(self._path, 'wb') as f:
+            f.write(b'not an episode log')
+
+        # Act/Assert
+        self.assertRaises(ValueError, lambda: EpisodeLog.read(self._path))
+
+    def test_tail_yields_records_from_start(self):
+        # Arrange
+        sut = EpisodeLog(self._path)
+        sut.open()
+        sut.write(self._records(4))
+
+        # Act
+        tailed = list(EpisodeLog.tail(self._path, start=1, poll_interval=0.01, timeout=0.05))
+        sut.close()
+
+        # Assert
+        self.assertEqual([1, 2, 3], [int(r['frames']) for r in tailed])
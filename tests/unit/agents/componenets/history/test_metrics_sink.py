@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from rlk.agents.components.history.episode_report import EpisodeReport
+from rlk.agents.components.history.metrics_sink import MetricsSink
+
+
+class TestMetricsSink(unittest.TestCase):
+    _sut = MetricsSink
+
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def test_stats_track_mean_of_last_window(self) -> None:
+        # Arrange
+        sink = self._sut(rolling_average=3, print_every=0)
+        rewards = [1.0, 5.0, -2.0, 4.0, 10.0]
+
+        # Act
+        for r in rewards:
+            sink._report(EpisodeReport(frames=10, time_taken=0.5, total_reward=r))
+
+        # Assert
+        self.assertAlmostEqual(float(np.mean(rewards[-3:])), sink.stats.rolling_mean)
+        self.assertEqual(5, sink.stats.n_episodes)
+        self.assertEqual(50, sink.stats.total_frames)
+        self.assertEqual("5 episodes, 50 frames (20 f/s). Mean reward over last 3: 4.000", sink._summary())
+
+    def test_close_reports_all_queued_episodes(self) -> None:
+        # Arrange
+        log_path = os.path.join(self._tmp_dir.name, 'log.csv')
+        plot_path = os.path.join(self._tmp_dir.name, 'plot.png')
+        sink = self._sut(print_every=0, log_path=log_path, plot_path=plot_path, plot_every=4)
+
+        # Act
+        with sink:
+            for ep in range(10):
+                sink.put(EpisodeReport(frames=ep, time_taken=0.1, total_reward=float(ep)))
+
+        # Assert
+        self.assertFalse(sink.running)
+        self.assertEqual(10, sink.stats.n_episodes)
+        with open(log_path, 'r') as f:
+            self.assertEqual(10, len(f.readlines()))
+        self.assertTrue(os.path.exists(plot_path))
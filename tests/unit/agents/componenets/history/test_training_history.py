@@ -0,0 +1,244 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+from rlk.agents.components.history.episode_log import EpisodeLog
+from rlk.agents.components.history.episode_report import EpisodeReport
+from rlk.agents.components.history.training_history import TrainingHistory
+from rlk.agents.q_learning.exploration.epsilon_greedy import EpsilonGreedy
+
+
+class TestTrainingHistory(unittest.TestCase):
+    @staticmethod
+    def _reports(n: int, eps: EpsilonGreedy = None):
+        return [EpisodeReport(frames=i + 1, time_taken=0.5, total_reward=float(i % 7), epsilon_used=eps)
+                for i in range(n)]
+
+    def test_append_grows_columns_and_keeps_values(self):
+        # Arrange
+        sut = TrainingHistory(rolling_average=5)
+        reports = self._reports(200)
+
+        # Act
+        for report in reports:
+            sut.append(report)
+
+        # Assert
+        self.assertEqual(200, sut.n_episodes)
+        self.assertEqual(200, len(sut.history))
+        np.testing.assert_array_equal([r.total_reward for r in reports], sut.get_metric('total_reward'))
+        self.assertEqual(sum(r.frames for r in reports), sut.total_frames)
+        self.assertAlmostEqual(100.0, sut.total_time)
+        self.assertEqual(reports[-1].frames, sut.history[-1].frames)
+
+    def test_rolling_stats_match_recalculated_values(self):
+        # Arrange
+        sut = TrainingHistory(rolling_average=10)
+        rewards = np.random.RandomState(0).normal(size=57)
+
+        # Act
+        for i, r in enumerate(rewards):
+            sut.append(EpisodeReport(frames=1, time_taken=0.1, total_reward=r))
+
+            # Assert
+            window = rewards[max(0, i - 9):i + 1]
+            self.assertAlmostEqual(float(np.mean(window)), sut.current_performance)
+            self.assertAlmostEqual(float(np.std(window)), sut.rolling_std)
+
+    def test_rolling_stats_are_nan_when_empty(self):
+        # Arrange
+        sut = TrainingHistory()
+
+        # Act/Assert
+        self.assertTrue(np.isnan(sut.current_performance))
+        self.assertTrue(np.isnan(sut.rolling_std))
+        self.assertEqual(0, sut.total_frames)
+
+    def test_extend_with_history_merges_columns(self):
+        # Arrange
+        eps = EpsilonGreedy()
+        sut = TrainingHistory(rolling_average=3)
+        sut.extend(self._reports(5))
+        other = TrainingHistory()
+        other.extend(self._reports(100, eps=eps))
+
+        # Act
+        sut.extend(other)
+
+        # Assert
+        expected = [r.total_reward for r in self._reports(5) + self._reports(100)]
+        self.assertEqual(105, sut.n_episodes)
+        np.testing.assert_array_equal(expected, sut.get_metric('total_reward'))
+        self.assertAlmostEqual(float(np.mean(expected[-3:])), sut.current_performance)
+        self.assertEqual(15 + 5050, sut.total_frames)
+        self.assertIs(eps, sut.history[-1].epsilon_used)
+        self.assertEqual(eps.eps_current, sut.get_metric('epsilon')[-1])
+
+    def test_get_metric_returns_read_only_view(self):
+        # Arrange
+        sut = TrainingHistory()
+        sut.extend(self._reports(3))
+
+        # Act
+        frames = sut.get_metric('frames')
+
+        # Assert
+        self.assertEqual(np.int64, frames.dtype)
+        self.assertRaises(ValueError, lambda: frames.__setitem__(0, 10))
+
+    def test_pickle_trims_spare_capacity(self):
+        # Arrange
+        sut = TrainingHistory()
+        sut.extend(self._reports(65))
+
+        # Act
+        state = sut.__getstate__()
+        sut_2 = pickle.loads(pickle.dumps(sut))
+        sut_2.append(self._reports(1)[0])
+
+        # Assert
+        self.assertEqual(65, len(state['_frames']))
+        self.assertEqual(66, sut_2.n_episodes)
+        np.testing.assert_array_equal(sut.get_metric('frames'), sut_2.get_metric('frames')[:65])
+        self.assertEqual(sut.current_performance, pickle.loads(pickle.dumps(sut)).current_performance)
+
+    def test_save_and_load_columns(self):
+        # Arrange
+        eps = EpsilonGreedy()
+        sut = TrainingHistory(agent_name='test')
+        sut.extend(self._reports(20))
+        sut.append_evaluation(self._reports(1)[0], trained_frames=10)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fn = os.path.join(tmp_dir, 'history.npz')
+
+            # Act
+            sut.save_columns(fn)
+            loaded = sut.load_columns(fn, epsilon_used=eps)
+
+        # Assert
+        self.assertEqual('test', loaded.agent_name)
+        np.testing.assert_array_equal(sut.get_metric('total_reward'), loaded.get_metric('total_reward'))
+        self.assertEqual(sut.total_frames, loaded.total_frames)
+        self.assertEqual(10, loaded.evaluation_history[0][0])
+        self.assertIs(eps, loaded.history[0].epsilon_used)
+
+    def test_episodes_are_streamed_to_log_and_read_with_from_log(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            log_path = os.path.join(tmp_dir, 'episodes.log')
+            sut = TrainingHistory(log_path=log_path, rolling_average=5)
+            reports = self._reports(10)
+
+            # Act
+            for report in reports[:4]:
+                sut.append(report)
+            other = TrainingHistory()
+            other.extend(reports[4:])
+            sut.extend(other)
+            sut.close_log()
+            from_log = TrainingHistory.from_log(log_path, rolling_average=5)
+
+        # Assert
+        self.assertEqual(10, from_log.n_episodes)
+        np.testing.assert_array_equal(sut.get_metric('total_reward'), from_log.get_metric('total_reward'))
+        self.assertEqual(sut.total_frames, from_log.total_frames)
+        self.assertAlmostEqual(sut.current_performance, from_log.current_performance)
+
+    def test_unpickled_history_rotates_longer_log(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            log_path = os.path.join(tmp_dir, 'episodes.log')
+            sut = TrainingHistory(log_path=log_path)
+            sut.extend(self._reports(3))
+            checkpoint = pickle.dumps(sut)
+            sut.extend(self._reports(4))
+            sut.close_log()
+
+            # Act
+            sut_2 = pickle.loads(checkpoint)
+            with self.assertWarns(UserWarning):
+                sut_2.append(EpisodeReport(frames=100, time_taken=1.0, total_reward=1.0))
+            sut_2.close_log()
+            from_log = TrainingHistory.from_log(log_path)
+            rotated = TrainingHistory.from_log(f"{log_path}.1")
+
+        # Assert
+        np.testing.assert_array_equal([1, 2, 3, 100], from_log.get_metric('frames'))
+        np.testing.assert_array_equal([1, 2, 3, 1, 2, 3, 4], rotated.get_metric('frames'))
+
+    def test_new_history_does_not_truncate_existing_log(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            log_path = os.path.join(tmp_dir, 'episodes.log')
+            sut = TrainingHistory(log_path=log_path)
+            sut.extend(self._reports(5))
+            sut.close_log()
+
+            # Act
+            sut_2 = TrainingHistory(log_path=log_path)
+            with self.assertWarns(UserWarning):
+                sut_2.append(EpisodeReport(frames=100, time_taken=1.0, total_reward=1.0))
+            sut_2.close_log()
+
+            # Assert
+            self.assertEqual(1, EpisodeLog.n_records(log_path))
+            self.assertEqual(5, EpisodeLog.n_records(f"{log_path}.1"))
+
+    def test_from_log_resume_appends_to_log(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            log_path = os.path.join(tmp_dir, 'episodes.log')
+            sut = TrainingHistory(log_path=log_path)
+            sut.extend(self._reports(5))
+            sut.close_log()
+
+            # Act
+            resumed = TrainingHistory.from_log(log_path, resume=True)
+            resumed.append(EpisodeReport(frames=100, time_taken=1.0, total_reward=1.0))
+            resumed.close_log()
+
+            # Assert
+            np.testing.assert_array_equal([1, 2, 3, 4, 5, 100], EpisodeLog.read(log_path)['frames'])
+            self.assertFalse(os.path.exists(f"{log_path}.1"))
+
+    def test_from_log_resume_from_earlier_episode_truncates_log(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            log_path = os.path.join(tmp_dir, 'episodes.log')
+            sut = TrainingHistory(log_path=log_path)
+            sut.extend(self._reports(5))
+            sut.close_log()
+
+            # Act
+            resumed = TrainingHistory.from_log(log_path, resume=True, n_episodes=2)
+            resumed.append(EpisodeReport(frames=100, time_taken=1.0, total_reward=1.0))
+            resumed.close_log()
+
+            # Assert
+            self.assertEqual(3, resumed.n_episodes)
+            np.testing.assert_array_equal([1, 2, 100], EpisodeLog.read(log_path)['frames'])
+
+    def test_without_log_keeps_episodes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            log_path = os.path.join(tmp_dir, 'episodes.log')
+            sut = TrainingHistory(log_path=log_path, rolling_average=5)
+            sut.extend(self._reports(8))
+            sut.append_evaluation(self._reports(1)[0], trained_frames=10)
+
+            # Act
+            copied = sut.without_log()
+            copied.append(EpisodeReport(frames=100, time_taken=1.0, total_reward=1.0))
+            sut.close_log()
+
+            # Assert
+            self.assertIsNone(copied.log_path)
+            self.assertEqual(9, copied.n_episodes)
+            self.assertEqual(8, sut.n_episodes)
+            self.assertEqual(1, len(copied.evaluation_history))
+            np.testing.assert_array_equal(sut.get_metric('frames'), copied.get_metric('frames')[:8])
+            self.assertEqual(8, EpisodeLog.n_records(log_path))
@@ -1,3 +1,4 @@
+import tempfile
 import unittest
 
 import numpy as np
@@ -67,3 +68,39 @@ class TestContinuousBuffer(unittest.TestCase):
         ss__0 = [np.unique(ss_[0][0])]
         self.assertListEqual([s + 1 for s in ss_0], ss__0)
         self.assertEqual(shape, ss[0].shape)
+
+    def test_save_and_load_arrays_round_trips_buffer(self) -> None:
+        # Arrange
+        rb = self._fill_replay_buffer_include_dones(shape=(5, 5, 3))
+
+        # Act
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            rb.save_arrays(tmp_dir)
+            rb_2 = self._sut.load_arrays(tmp_dir)
+            ss, aa, rr, dd, ss_ = rb.get_batch(idxs=[4, 5, 6])
+            ss_2, aa_2, rr_2, dd_2, ss__2 = rb_2.get_batch(idxs=[4, 5, 6])
+
+            # Assert
+            self.assertEqual(rb, rb_2)
+            self.assertEqual(rb.n, rb_2.n)
+            assert_array_almost_equal(np.array(ss), np.array(ss_2))
+            assert_array_almost_equal(np.array(ss_), np.array(ss__2))
+            self.assertListEqual(aa, list(aa_2))
+            self.assertListEqual(dd, list(dd_2))
+
+    def test_save_and_load_arrays_round_trips_multi_input_buffer(self) -> None:
+        # Arrange
+        rb = self._sut()
+        for i in range(10):
+            rb.append(((np.zeros(shape=(4, 4)) + i, np.zeros(shape=(3,)) - i), i, 0.9, False))
+
+        # Act
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            rb.save_arrays(tmp_dir)
+            rb_2 = self._sut.load_arrays(tmp_dir, mmap_mode=None)
+
+        # Assert
+        ss, _, _, _, _ = rb_2.get_batch(idxs=[3])
+        self.assertEqual(2, len(ss[0]))
+        assert_array_almost_equal(np.zeros(shape=(4, 4)) + 3, ss[0][0])
+        assert_array_almost_equal(np.zeros(shape=(3,)) - 3, ss[0][1])
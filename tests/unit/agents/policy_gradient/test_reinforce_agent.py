@@ -1,7 +1,10 @@
 import copy
 from typing import List
+from unittest.mock import patch
 
+import gym
 import numpy as np
+import tensorflow as tf
 from numpy.testing import assert_array_almost_equal
 
 from rlk.agents.components.helpers.virtual_gpu import VirtualGPU
@@ -22,6 +25,22 @@ class TestReinforceAgent(TestRandomAgent):
         # This is inside the play episode function, which is still 0 here as it's called in .train
         self._expected_model_update_after_playing_episode: int = 0
 
+    def _ready_agent(self) -> ReinforceAgent:
+        """
+        Agent with all hidden ReLUs active.
+
+        The cart pole model's second hidden layer is a single unit. If it's dead for every state in the short test
+        episodes, no gradient reaches any layer before the output and the tests checking every layer changes would fail
+        at random. Positive hidden kernels and biases keep the units active for the small cart pole observations.
+        """
+        agent = super()._ready_agent()
+        for layer in agent._model.layers:
+            if (layer.name != 'output') and (len(layer.get_weights()) == 2):
+                kernel, bias = layer.get_weights()
+                layer.set_weights([np.abs(kernel), np.ones_like(bias)])
+
+        return agent
+
     @staticmethod
     def _checkpoint_model(agent: ReinforceAgent) -> List[np.ndarray]:
         """Get coefs from each model"""
@@ -52,6 +71,8 @@ class TestReinforceAgent(TestRandomAgent):
         self.assertFalse(agent.ready)
 
     def _assert_agent_ready(self, agent: ReinforceAgent) -> None:
+        # Accessing .env builds it if it hasn't been yet
+        self.assertIsInstance(agent.env_builder.env, gym.Env)
         self.assertIsNotNone(agent.env_builder._env)
         self.assertIsNotNone(agent._model)
         self.assertTrue(agent.ready)
@@ -67,6 +88,62 @@ class TestReinforceAgent(TestRandomAgent):
         # Assert
         self._assert_relevant_after_play_episode_change(agent, checkpoint)
 
+    def test_repeated_model_updates_do_not_add_ops_to_graph(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        agent.train(n_episodes=1, max_episode_steps=self._n_step, render=False, checkpoint_every=0, verbose=False)
+        n_ops = len(tf.compat.v1.get_default_graph().get_operations())
+
+        # Act
+        agent.train(n_episodes=self._n_episodes, max_episode_steps=self._n_step, render=False, checkpoint_every=0,
+                    verbose=False)
+
+        # Assert
+        self.assertEqual(n_ops, len(tf.compat.v1.get_default_graph().get_operations()))
+
+    def test_update_model_with_batch_size_streams_backlog_in_minibatches(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        agent.update_batch_size = 3
+        for _ in range(self._n_episodes):
+            agent.play_episode(max_episode_steps=self._n_step, training=True, render=False)
+        n_steps = sum([len(a) for a in agent._buffer_actions.values()])
+
+        # Act
+        with patch.object(agent._model, 'train_on_batch') as mocked_train_on_batch:
+            agent.update_model()
+
+        # Assert
+        batch_sizes = [len(c[0][0]) for c in mocked_train_on_batch.call_args_list]
+        self.assertEqual(int(np.ceil(n_steps / 3)), mocked_train_on_batch.call_count)
+        self.assertTrue(all([bs <= 3 for bs in batch_sizes]))
+        self.assertEqual(n_steps, sum(batch_sizes))
+
+    def test_update_model_with_batch_size_updates_model(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        agent.update_batch_size = 2
+        checkpoint = self._checkpoint_model(agent)
+
+        # Act
+        agent.train(n_episodes=self._n_episodes, max_episode_steps=self._n_step, render=False, checkpoint_every=0,
+                    verbose=False)
+
+        # Assert
+        self._assert_model_changed(agent, checkpoint)
+
+    def test_non_positive_update_batch_size_raises_error(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        agent.play_episode(max_episode_steps=self._n_step, training=True, render=False)
+
+        for batch_size in (0, -1):
+            with self.subTest(batch_size=batch_size):
+                # Act/Assert
+                self.assertRaises(ValueError, lambda: self._sut(**self._config.build(), update_batch_size=batch_size))
+                agent.update_batch_size = batch_size
+                self.assertRaises(ValueError, agent.update_model)
+
 
 # Prevent parent test from being collected again
 del TestRandomAgent
@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 import numpy as np
@@ -118,3 +119,75 @@ class TestEpsilonGreedy(unittest.TestCase):
 
         # Assert
         self.assertFalse(np.all(np.diff(future) <= 0))
+
+    def test_schedule_matches_eps_from_stepping_with_perturbation(self):
+        # Arrange
+        eps = self._sut(eps_initial=1, decay=0.01, decay_schedule='compound', perturb_increase_every=100,
+                        perturb_increase_mag=0.5, actions_pool=self._actions_pool)
+        schedule = eps.schedule(start=1, steps=1000)
+
+        # Act
+        stepped = []
+        for _ in range(1000):
+            _ = eps.select(state=None, greedy_option=self._greedy_action, training=True)
+            stepped.append(eps.eps_current)
+
+        # Assert
+        np.testing.assert_array_almost_equal(schedule, stepped)
+        self.assertAlmostEqual(stepped[-1], eps.eps_at(1000))
+
+    def test_simulate_doesnt_modify_eps(self):
+        # Arrange
+        eps = self._sut(eps_initial=1, decay=0.0002, decay_schedule='linear', actions_pool=self._actions_pool)
+
+        # Act
+        future = eps.simulate(steps=1000000)
+
+        # Assert
+        self.assertEqual(1000000, len(future))
+        self.assertAlmostEqual(eps.eps_min, future[-1])
+        self.assertEqual(1, eps.eps_current)
+
+    def test_explore_mask_decays_eps_for_each_selection(self):
+        # Arrange
+        eps = self._sut(eps_initial=1, decay=0.001, decay_schedule='linear', actions_pool=self._actions_pool)
+
+        # Act
+        mask = eps.explore_mask(n=100)
+
+        # Assert
+        self.assertEqual((100,), mask.shape)
+        self.assertAlmostEqual(0.9, eps.eps_current)
+
+    def test_eps_current_is_read_only(self):
+        # Arrange
+        eps = self._sut(eps_initial=1, actions_pool=self._actions_pool)
+
+        # Act/Assert
+        with self.assertRaises(AttributeError):
+            eps.eps_current = 0
+        self.assertEqual(1, eps.eps_current)
+
+    def test_pickling_excludes_blocks_and_continues_sequence(self):
+        # Arrange
+        eps = self._sut(eps_initial=0.5, decay=0.001, decay_schedule='linear', actions_pool=self._actions_pool)
+        for _ in range(10):
+            _ = eps.select(state=None, greedy_option=self._greedy_action, training=True)
+
+        # Act
+        state = eps.__getstate__()
+        eps_2 = pickle.loads(pickle.dumps(eps))
+
+        # Assert
+        self.assertEqual([], state['_eps_block'])
+        self.assertEqual([], state['_random_block'])
+        self.assertAlmostEqual(eps.eps_current, eps_2.eps_current)
+        np.testing.assert_array_equal([eps._random() for _ in range(5000)], [eps_2._random() for _ in range(5000)])
+        np.testing.assert_array_almost_equal(eps.simulate(100), eps_2.simulate(100))
+
+    def test_future_value_accepts_array_of_steps(self):
+        # Act
+        future = self._sut.future_value(eps=1, decay=0.1, steps=np.arange(3), decay_schedule='compound')
+
+        # Assert
+        np.testing.assert_array_almost_equal([1, 0.9, 0.81], future)
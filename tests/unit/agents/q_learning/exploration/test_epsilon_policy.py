@@ -13,7 +13,7 @@ class TestEpsilonPolicy(unittest.TestCase):
 
     def test_always_returns_greedy_option_with_epsilon_0(self):
         # Arrange
-        self._sut.eps_current = 0
+        self._sut = EpsilonPolicy(actions_pool=[0, 1], policy=self._mock_policy, eps_initial=0, eps_min=0)
 
         # Act
         actions = []
@@ -25,7 +25,7 @@ class TestEpsilonPolicy(unittest.TestCase):
 
     def test_always_returns_policy_option_with_epsilon_1(self):
         # Arrange
-        self._sut.eps_current = 1
+        self._sut = EpsilonPolicy(actions_pool=[0, 1], policy=self._mock_policy, eps_initial=1, eps_min=1)
 
         # Act
         actions = []
@@ -1,4 +1,5 @@
 import copy
+import pickle
 from typing import List
 from unittest.mock import patch
 
@@ -106,5 +107,52 @@ class TestDeepQAgent(TestRandomAgent):
         self.assertEqual(self._expected_model_update_after_training_episode, mocked_update_value_model.call_count)
         self.assertEqual(self._n_step, agent.env_builder._env._max_episode_steps)
 
+    def test_get_actions_when_training_decays_eps_once_per_state(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        vector_env = self._vector_env(agent, num_envs=4)
+        step = agent.eps._step
+
+        # Act
+        actions = agent.get_actions(vector_env.reset(), training=True)
+
+        # Assert
+        self.assertEqual((4,), actions.shape)
+        self.assertEqual(step + 4, agent.eps._step)
+        self.assertAlmostEqual(agent.eps.eps_at(step + 4), agent.eps.eps_current)
+        vector_env.close()
+
+    def test_get_actions_when_not_training_matches_get_action(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        vector_env = self._vector_env(agent, num_envs=3)
+        obs = vector_env.reset()
+
+        # Act
+        actions = agent.get_actions(obs, training=False)
+
+        # Assert
+        self.assertListEqual([agent.get_action(s, training=False) for s in obs], list(actions))
+        vector_env.close()
+
+    def test_unpickled_agent_has_current_weights_not_saved_ones(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        agent.play_episode(max_episode_steps=self._n_step, training=True, render=False)
+        with self._in_tmp_dir():
+            agent.save()
+            agent.set_weights([w + 1 for w in agent.get_weights()])
+            checkpoint = self._checkpoint_model(agent)
+
+            # Act
+            new_agent = pickle.loads(pickle.dumps(agent))
+            new_agent.check_ready()
+
+        # Assert
+        self._assert_model_unchanged(new_agent, checkpoint)
+        self.assertIsNot(agent.replay_buffer, new_agent.replay_buffer)
+        self.assertGreater(new_agent.replay_buffer.n, 0)
+        self.assertEqual(agent.replay_buffer.n, new_agent.replay_buffer.n)
+
 
 del TestRandomAgent
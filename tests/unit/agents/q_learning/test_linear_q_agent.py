@@ -1,6 +1,7 @@
 import copy
 from typing import List
 
+import gym
 import numpy as np
 from numpy.testing import assert_array_almost_equal
 
@@ -42,6 +43,8 @@ class TestLinearQAgent(TestRandomAgent):
         self._assert_model_changed(agent, checkpoint)
 
     def _assert_agent_ready(self, agent: LinearQAgent) -> None:
+        # Accessing .env builds it if it hasn't been yet
+        self.assertIsInstance(agent.env_builder.env, gym.Env)
         self.assertIsNotNone(agent.env_builder._env)
 
     def test_model_set_during_init(self) -> None:
@@ -1,8 +1,15 @@
+import contextlib
+import os
+import pickle
+import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+
+import gym
 
 from rlk.agents.agent_base import AgentBase
 from rlk.agents.components.history.episode_report import EpisodeReport
+from rlk.agents.components.history.metrics_sink import MetricsSink
 from rlk.agents.random.random_agent import RandomAgent
 from rlk.agents.random.random_model import RandomModel
 from rlk.environments.cart_pole.cart_pole_config import CartPoleConfig
@@ -40,6 +47,18 @@ class TestRandomAgent(unittest.TestCase):
     def _ready_agent(self) -> RandomAgent:
         return self._sut(**self._config.build())
 
+    @staticmethod
+    @contextlib.contextmanager
+    def _in_tmp_dir():
+        """Agents save to the working directory, run in a temporary one so nothing is left behind."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                yield tmp_dir
+            finally:
+                os.chdir(cwd)
+
     @staticmethod
     def _checkpoint_model(agent: AgentBase) -> None:
         """No model to checkpoint."""
@@ -72,15 +91,18 @@ class TestRandomAgent(unittest.TestCase):
         pass
 
     def _assert_agent_ready(self, agent: RandomAgent) -> None:
+        # Accessing .env builds it if it hasn't been yet
+        self.assertIsInstance(agent.env_builder.env, gym.Env)
         self.assertIsNotNone(agent.env_builder._env)
         self.assertIsInstance(agent.model, RandomModel)
 
-    def test_env_set_during_init(self) -> None:
+    def test_env_available_after_init(self) -> None:
         # Act
         agent = self._ready_agent()
+        env = agent.env
 
         # Assert
-        self.assertIsNotNone(agent.env_builder._env)
+        self.assertIs(env, agent.env_builder._env)
 
     def test_model_set_during_init(self) -> None:
         # Act
@@ -100,8 +122,9 @@ class TestRandomAgent(unittest.TestCase):
         # Arrange
         agent = self._ready_agent()
 
-        # Act
-        agent.unready()
+        with self._in_tmp_dir():
+            # Act
+            agent.unready()
 
         # Assert
         self._assert_agent_unready(agent)
@@ -110,10 +133,12 @@ class TestRandomAgent(unittest.TestCase):
         # Arrange
         agent = self._ready_agent()
         checkpoint = self._checkpoint_model(agent)
-        agent.unready()
 
-        # Act
-        agent.check_ready()
+        with self._in_tmp_dir():
+            agent.unready()
+
+            # Act
+            agent.check_ready()
 
         # Assert
         self._assert_agent_ready(agent)
@@ -129,6 +154,77 @@ class TestRandomAgent(unittest.TestCase):
         # Assert
         self.assertIsInstance(reward, EpisodeReport)
 
+    @staticmethod
+    def _vector_env(agent: AgentBase, num_envs: int = 2, max_episode_steps: int = 3) -> gym.vector.VectorEnv:
+        """Local vector env of the agent's env, with a short time limit."""
+        builder = agent.env_builder
+
+        def env_fn() -> gym.Env:
+            # Set on the TimeLimit from gym.make, wrapping in a new TimeLimit would also change the registered spec
+            env = gym.make(builder.env_spec, **builder.env_kwargs)
+            env._max_episode_steps = max_episode_steps
+            for wrapper in builder.env_wrappers:
+                env = wrapper(env)
+
+            return env
+
+        return gym.vector.SyncVectorEnv([env_fn] * num_envs)
+
+    def test_get_actions_returns_action_for_each_state(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        vector_env = self._vector_env(agent, num_envs=3)
+
+        # Act
+        actions = agent.get_actions(vector_env.reset(), training=False)
+
+        # Assert
+        self.assertEqual((3,), actions.shape)
+        self.assertTrue(all(agent.env.action_space.contains(int(a)) for a in actions))
+        vector_env.close()
+
+    def test_play_vector_episodes_plays_same_number_of_episodes_in_each_env(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        vector_env = self._vector_env(agent, num_envs=2, max_episode_steps=3)
+
+        # Act
+        with patch.object(agent, 'update_model') as mocked_update_model:
+            reports = agent.play_vector_episodes(vector_env, n_episodes_per_env=2)
+
+        # Assert
+        self.assertEqual(4, len(reports))
+        self.assertTrue(all(isinstance(r, EpisodeReport) for r in reports))
+        self.assertTrue(all(r.frames <= 2 for r in reports))
+        self.assertEqual(0, mocked_update_model.call_count)
+        vector_env.close()
+
+    def test_play_vector_episodes_cuts_episodes_at_max_episode_steps(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        vector_env = self._vector_env(agent, num_envs=2, max_episode_steps=50)
+
+        # Act
+        reports = agent.play_vector_episodes(vector_env, n_episodes_per_env=2, max_episode_steps=2)
+
+        # Assert
+        self.assertEqual(4, len(reports))
+        self.assertTrue(all(r.frames == 1 for r in reports))
+        vector_env.close()
+
+    def test_play_vector_episodes_sets_max_episode_steps_on_vector_envs_that_support_it(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        vector_env = self._vector_env(agent, num_envs=2, max_episode_steps=2)
+        vector_env.set_max_episode_steps = MagicMock()
+
+        # Act
+        _ = agent.play_vector_episodes(vector_env, n_episodes_per_env=1, max_episode_steps=2)
+
+        # Assert
+        vector_env.set_max_episode_steps.assert_called_once_with(2)
+        vector_env.close()
+
     def test_play_episode_steps_does_not_call_update_models_when_not_training(self) -> None:
         # Arrange
         agent = self._ready_agent()
@@ -223,3 +319,130 @@ class TestRandomAgent(unittest.TestCase):
         self.assertEqual(self._n_episodes, len(agent.training_history.history))
         self.assertEqual(self._n_episodes, mocked_play_episode.call_count)
         self.assertEqual(2, after_ep_update.call_count)
+
+    def test_train_steps_runs_until_frame_budget_reached(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        total_frames = self._n_step * 2 + 1
+
+        # Act
+        with patch.object(agent, '_after_episode_update') as after_ep_update:
+            scheduler = agent.train_steps(total_frames=total_frames, max_episode_steps=self._n_step, render=False,
+                                          verbose=False)
+
+        # Assert
+        self.assertEqual(total_frames, scheduler.frame)
+        self.assertEqual(total_frames, agent.training_history.total_frames + len(agent.training_history.history))
+        self.assertEqual(len(agent.training_history.history), after_ep_update.call_count)
+        self.assertEqual(after_ep_update.call_count, scheduler.costs['update']['n_calls'])
+        self.assertIn('play_episode', scheduler.costs)
+
+    def test_train_steps_runs_scheduled_evaluations(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+
+        # Act
+        scheduler = agent.train_steps(total_frames=self._n_step * 3, max_episode_steps=self._n_step, render=False,
+                                      verbose=False, schedule={'evaluate': {'every_frames': 1}})
+
+        # Assert
+        self.assertEqual(scheduler.costs['evaluate']['n_calls'], len(agent.training_history.evaluation_history))
+        self.assertGreater(len(agent.training_history.evaluation_history), 0)
+
+    def test_train_with_metrics_sink_sends_all_episodes(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        sink = MetricsSink(print_every=0)
+        sink.start()
+
+        # Act
+        agent.train(n_episodes=self._n_episodes, max_episode_steps=self._n_step, render=False, checkpoint_every=0,
+                    metrics_sink=sink)
+        sink.close()
+
+        # Assert
+        self.assertEqual(self._n_episodes, sink.stats.n_episodes)
+        self.assertEqual(self._n_episodes, len(agent.training_history.history))
+
+    def test_train_steps_with_metrics_sink_sends_all_episodes(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        sink = MetricsSink(print_every=0)
+
+        # Act
+        with sink:
+            scheduler = agent.train_steps(total_frames=self._n_step * 3, max_episode_steps=self._n_step, render=False,
+                                          metrics_sink=sink)
+
+        # Assert
+        self.assertEqual(len(agent.training_history.history), sink.stats.n_episodes)
+        self.assertEqual(agent.training_history.total_frames, sink.stats.total_frames)
+        self.assertNotIn('history', scheduler.costs)
+
+    def test_train_steps_raises_error_with_unknown_task(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+
+        # Act/Assert
+        self.assertRaises(ValueError, lambda: agent.train_steps(total_frames=1, schedule={'unknown': {}}))
+
+    def test_lazy_attribute_loaded_on_first_access(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        agent._set_lazy('lazy_value', lambda: 'loaded')
+
+        # Act
+        value = agent.lazy_value
+
+        # Assert
+        self.assertEqual('loaded', value)
+        self.assertEqual({}, agent._lazy_loaders)
+
+    def test_attribute_errors_raised_in_properties_are_not_hidden(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        agent.env_builder = None
+
+        # Act/Assert
+        with self.assertRaisesRegex(AttributeError, "'NoneType' object has no attribute 'env'"):
+            _ = agent.env
+
+    def test_pickling_does_not_modify_agent(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        env = agent.env
+        checkpoint = self._checkpoint_model(agent)
+
+        # Act
+        _ = pickle.dumps(agent)
+
+        # Assert
+        self._assert_agent_ready(agent)
+        self.assertIs(env, agent.env_builder._env)
+        self._assert_model_unchanged(agent, checkpoint)
+
+    def test_pickling_does_not_write_files(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+
+        with self._in_tmp_dir() as tmp_dir:
+            # Act
+            _ = pickle.dumps(agent)
+
+            # Assert
+            self.assertEqual([], os.listdir(tmp_dir))
+
+    def test_unpickled_agent_is_unready_until_check_ready(self) -> None:
+        # Arrange
+        agent = self._ready_agent()
+        checkpoint = self._checkpoint_model(agent)
+
+        # Act
+        new_agent = pickle.loads(pickle.dumps(agent))
+        unready_env = new_agent.env_builder._env
+        new_agent.check_ready()
+
+        # Assert
+        self.assertIsNone(unready_env)
+        self._assert_agent_ready(new_agent)
+        self._assert_model_unchanged(new_agent, checkpoint)
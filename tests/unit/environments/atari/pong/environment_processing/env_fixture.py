@@ -1,6 +1,7 @@
 from typing import Any, Tuple, Dict, Union
 from unittest.mock import MagicMock
 
+import gym
 import numpy as np
 
 
@@ -45,3 +46,54 @@ class EnvFixture:
             reward += 1
 
         return obs, reward, done, info
+
+
+class ALEFixture:
+    """Minimal emulator; screen values are the frame number, with some pixels varying so max is meaningful."""
+
+    def __init__(self, game_over_at: int = 1000) -> None:
+        self.game_over_at = game_over_at
+        self.frame = 0
+        self.n_screens = 0
+
+    def act(self, action: int) -> float:
+        self.frame += 1
+        return float(action)
+
+    def game_over(self) -> bool:
+        return self.frame >= self.game_over_at
+
+    def lives(self) -> int:
+        return 3
+
+    def getScreenRGB2(self, screen_data: np.ndarray = None) -> np.ndarray:
+        if screen_data is None:
+            screen_data = np.empty((210, 160, 3), dtype=np.uint8)
+        self.n_screens += 1
+        screen_data[:] = self.frame
+        screen_data[self.frame % 210] = 255 - self.frame
+
+        return screen_data
+
+
+class AtariEnvFixture(gym.Env):
+    """Mimics the parts of gym's AtariEnv without frameskip."""
+    frameskip = 1
+    _obs_type = 'image'
+    _action_set = [0, 3]
+    observation_space = gym.spaces.Box(low=0, high=255, shape=(210, 160, 3), dtype=np.uint8)
+    action_space = gym.spaces.Discrete(2)
+
+    def __init__(self, game_over_at: int = 1000) -> None:
+        self.ale = ALEFixture(game_over_at=game_over_at)
+
+    def step(self, action: int):
+        reward = self.ale.act(self._action_set[action])
+        return self.ale.getScreenRGB2(), reward, self.ale.game_over(), {"ale.lives": self.ale.lives()}
+
+    def reset(self) -> np.ndarray:
+        self.ale.frame = 0
+        return self.ale.getScreenRGB2()
+
+    def render(self, mode='human'):
+        pass
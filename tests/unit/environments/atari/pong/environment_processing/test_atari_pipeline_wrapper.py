@@ -0,0 +1,82 @@
+import unittest
+from functools import reduce
+
+import gym
+import numpy as np
+from gym.wrappers import TimeLimit
+
+from rlk.environments.atari.environment_processing.atari_pipeline_wrapper import AtariPipelineWrapper
+from rlk.environments.preprocessing.lazy_frames import LazyFrames
+from tests.unit.environments.atari.pong.environment_processing.env_fixture import AtariEnvFixture
+
+
+class TestAtariPipelineWrapper(unittest.TestCase):
+    _sut = AtariPipelineWrapper
+
+    @staticmethod
+    def _run(env: gym.Env, n_steps: int = 12, n_resets: int = 2):
+        outputs = []
+        for _ in range(n_resets):
+            outputs.append((np.asarray(env.reset()).copy(), 0.0, False))
+            for step in range(n_steps):
+                obs, reward, done, _ = env.step(step % 2)
+                outputs.append((np.asarray(obs).copy(), reward, done))
+                if done:
+                    break
+
+        return outputs
+
+    def _assert_matches_chain(self, make_env, **options):
+        # Arrange
+        chained_env = reduce(lambda env, wrapper: wrapper(env), self._sut.chained_wrappers(**options), make_env())
+        sut = self._sut(make_env(), **options)
+
+        # Act
+        chained_outputs = self._run(chained_env)
+        outputs = self._run(sut)
+
+        # Assert
+        self.assertEqual(len(chained_outputs), len(outputs))
+        for (chained_obs, chained_reward, chained_done), (obs, reward, done) in zip(chained_outputs, outputs):
+            self.assertEqual(chained_obs.shape, obs.shape)
+            self.assertEqual(chained_obs.dtype, obs.dtype)
+            np.testing.assert_array_equal(chained_obs, obs)
+            self.assertEqual(chained_reward, reward)
+            self.assertEqual(chained_done, done)
+
+    def test_output_matches_chained_wrappers_with_ale_path(self):
+        for options in [{}, {'buffer_length': 2, 'buffer_function': 'diff'}, {'dtype': np.uint8},
+                        {'fast': False, 'fire_start': False}, {'frame_buffer_length': 4, 'lazy': True}]:
+            with self.subTest(**options):
+                self._assert_matches_chain(lambda: TimeLimit(AtariEnvFixture(game_over_at=30), max_episode_steps=100),
+                                           **options)
+
+    def test_output_matches_chained_wrappers_without_ale_path(self):
+        self._assert_matches_chain(lambda: gym.Wrapper(AtariEnvFixture(game_over_at=30)))
+
+    def test_observation_space_matches_output(self):
+        for options in [{'buffer_length': 4}, {'buffer_length': 2, 'buffer_function': 'diff', 'dtype': np.uint8}]:
+            with self.subTest(**options):
+                # Arrange
+                sut = self._sut(AtariEnvFixture(), **options)
+
+                # Act
+                obs = sut.reset()
+
+                # Assert
+                self.assertEqual(sut.observation_space.shape, obs.shape)
+                self.assertEqual(sut.observation_space.dtype, obs.dtype)
+
+    def test_lazy_frames_are_not_overwritten_by_later_steps(self):
+        # Arrange
+        sut = self._sut(AtariEnvFixture(), lazy=True)
+        obs = sut.reset()
+        obs_copy = np.asarray(obs).copy()
+
+        # Act
+        for _ in range(4):
+            sut.step(0)
+
+        # Assert
+        self.assertIsInstance(obs, LazyFrames)
+        np.testing.assert_array_equal(obs_copy, np.asarray(obs))
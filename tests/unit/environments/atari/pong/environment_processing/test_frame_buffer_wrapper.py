@@ -1,10 +1,11 @@
 import unittest
 
+import gym
 import numpy as np
 from numpy.testing import assert_array_almost_equal
 
-from rlk.environments.atari.environment_processing.frame_buffer_wrapper import \
-    FrameBufferWrapper
+from rlk.environments.atari.environment_processing.frame_buffer_wrapper import FrameBufferWrapper
+from rlk.environments.preprocessing.lazy_frames import LazyFrames
 from tests.unit.environments.atari.pong.environment_processing.env_fixture import EnvFixture
 
 
@@ -70,3 +71,94 @@ class TestFrameBufferWrapper(unittest.TestCase):
         self.assertEqual(0, np.unique(obs2[:, :]))
         self.assertIsInstance(reward, float)
         self.assertIsInstance(done, bool)
+
+    def _random_frame_env(self, n_frames: int = 6) -> EnvFixture:
+        """Fixture env returning a new random frame each step."""
+        frames = [np.random.RandomState(i).rand(*self._env.obs_shape).astype(np.float32) for i in range(n_frames)]
+        env = self._env_fixture(obs_shape=self._env.obs_shape)
+        env.reset = lambda: frames[0]
+        frames_iter = iter(frames[1:])
+        env.step = lambda action: (next(frames_iter), 1.0, False, {})
+
+        return env
+
+    def test_stack_op_matches_stacking_last_frames_over_several_steps(self):
+        # Arrange
+        frames = [np.random.RandomState(i).rand(*self._env.obs_shape).astype(np.float32) for i in range(6)]
+        env = self._sut(self._random_frame_env(), obs_shape=self._env.obs_shape)
+
+        # Act
+        obss = [env.reset()] + [env.step(0)[0] for _ in range(5)]
+
+        # Assert
+        for step, obs in enumerate(obss[2:], start=2):
+            self.assertEqual(np.float32, obs.dtype)
+            assert_array_almost_equal(np.stack(frames[step - 2:step + 1], axis=2), obs)
+
+    def test_lazy_frames_match_eager_obs(self):
+        for buffer_length, buffer_function in [(3, 'stack'), (2, 'diff')]:
+            # Arrange
+            env = self._sut(self._random_frame_env(), obs_shape=self._env.obs_shape, buffer_length=buffer_length,
+                            buffer_function=buffer_function)
+            env_lazy = self._sut(self._random_frame_env(), obs_shape=self._env.obs_shape,
+                                 buffer_length=buffer_length, buffer_function=buffer_function, lazy=True)
+
+            # Act
+            obss = [env.reset()] + [env.step(0)[0] for _ in range(5)]
+            obss_lazy = [env_lazy.reset()] + [env_lazy.step(0)[0] for _ in range(5)]
+
+            # Assert
+            for obs, obs_lazy in zip(obss, obss_lazy):
+                self.assertIsInstance(obs_lazy, LazyFrames)
+                self.assertEqual(obs.shape, obs_lazy.shape)
+                self.assertEqual(obs.dtype, obs_lazy.dtype)
+                assert_array_almost_equal(obs, np.asarray(obs_lazy))
+            assert_array_almost_equal(np.stack(obss), np.stack(obss_lazy))
+
+    def test_lazy_frames_share_frames_between_steps(self):
+        # Arrange
+        env = self._sut(self._random_frame_env(), obs_shape=self._env.obs_shape, lazy=True)
+
+        # Act
+        obs_1 = env.reset()
+        obs_2, _, _, _ = env.step(0)
+
+        # Assert
+        self.assertIs(obs_1._frames[2], obs_2._frames[1])
+
+    def test_diff_op_with_unsigned_frames_is_signed(self):
+        # Arrange
+        env = self._sut(self._env_fixture(obs_shape=(2, 2)), obs_shape=(2, 2), buffer_length=2,
+                        buffer_function='diff')
+        env.env.reset = lambda: np.full((2, 2), 10, dtype=np.uint8)
+        env.env.step = lambda action: (np.full((2, 2), 5, dtype=np.uint8), 1.0, False, {})
+
+        # Act
+        env.reset()
+        obs, _, _, _ = env.step(0)
+
+        # Assert
+        self.assertEqual(-5, obs.min())
+
+    def test_observation_space_matches_output(self):
+        for buffer_length, buffer_function, low, high in [(3, 'stack', 0, 255), (2, 'diff', -255, 255)]:
+            # Arrange
+            inner_env = self._env_fixture(obs_shape=(2, 2))
+            inner_env.observation_space = gym.spaces.Box(low=0, high=255, shape=(2, 2), dtype=np.uint8)
+            inner_env.reset = lambda: np.full((2, 2), 10, dtype=np.uint8)
+            env = self._sut(inner_env, obs_shape=(2, 2), buffer_length=buffer_length,
+                            buffer_function=buffer_function)
+
+            # Act
+            obs = env.reset()
+
+            # Assert
+            self.assertEqual(env.observation_space.shape, obs.shape)
+            self.assertEqual(env.observation_space.dtype, obs.dtype)
+            self.assertEqual(low, env.observation_space.low.min())
+            self.assertEqual(high, env.observation_space.high.max())
+            self.assertTrue(env.observation_space.contains(obs))
+
+    def test_unknown_buffer_function_raises_error(self):
+        self.assertRaises(ValueError, lambda: self._sut(self._env, buffer_function='unknown'))
+        self.assertRaises(ValueError, lambda: self._sut(self._env, buffer_length=3, buffer_function='diff'))
@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from rlk.environments.atari.environment_processing.image_process_wrapper import \
     ImageProcessWrapper
 from tests.unit.environments.atari.pong.environment_processing.env_fixture import EnvFixture
@@ -39,3 +41,49 @@ class TestImageProcessWrapper(unittest.TestCase):
 
         # Act
         self.assertRaises(ValueError, lambda: env.step(0))
+
+    def test_fast_processing_output_within_tolerance_of_default(self):
+        # Arrange
+        frames = [np.random.RandomState(0).randint(0, 256, size=shape).astype(np.uint8)
+                  for shape in [(210, 160, 3), (250, 160, 3)]]
+        env = self._sut(self._env)
+        env_fast = self._sut(self._env, fast=True)
+
+        for frame in frames:
+            # Act
+            obs = env.process(frame)
+            obs_fast = env_fast.process(frame)
+
+            # Assert
+            self.assertEqual((84, 84), obs_fast.shape)
+            self.assertEqual(np.float32, obs_fast.dtype)
+            np.testing.assert_allclose(obs, obs_fast, atol=1 / 255)
+
+    def test_fast_processing_returns_new_array_each_frame(self):
+        # Arrange
+        env = self._sut(self._env, fast=True)
+        frame = np.full((210, 160, 3), fill_value=100, dtype=np.uint8)
+
+        # Act
+        obs_1 = env.process(frame)
+        obs_2 = env.process(frame * 2)
+
+        # Assert
+        self.assertFalse(np.shares_memory(obs_1, obs_2))
+        self.assertFalse(np.allclose(obs_1, obs_2))
+
+    def test_uint8_output_dtype(self):
+        # Arrange
+        frame = np.random.RandomState(0).randint(0, 256, size=(210, 160, 3)).astype(np.uint8)
+        env = self._sut(self._env, dtype=np.uint8)
+        env_fast = self._sut(self._env, dtype=np.uint8, fast=True)
+
+        # Act
+        obs = env.process(frame)
+        obs_fast = env_fast.process(frame)
+
+        # Assert
+        self.assertEqual(np.uint8, obs.dtype)
+        self.assertEqual(np.uint8, obs_fast.dtype)
+        self.assertEqual(255, env_fast.observation_space.high.max())
+        self.assertLessEqual(np.abs(obs.astype(int) - obs_fast.astype(int)).max(), 1)
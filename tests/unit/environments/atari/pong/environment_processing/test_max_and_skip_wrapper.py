@@ -1,10 +1,12 @@
 import unittest
 from unittest.mock import call, Mock
 
+import gym
 import numpy as np
+from gym.wrappers import TimeLimit
 
 from rlk.environments.atari.environment_processing.max_and_skip_wrapper import MaxAndSkipWrapper
-from tests.unit.environments.atari.pong.environment_processing.env_fixture import EnvFixture
+from tests.unit.environments.atari.pong.environment_processing.env_fixture import AtariEnvFixture, EnvFixture
 
 
 class TestMaxAndSkipWrapper(unittest.TestCase):
@@ -71,3 +73,75 @@ class TestMaxAndSkipWrapper(unittest.TestCase):
         self.assertEqual(True, done)
         env.env.action_indicator.assert_has_calls(calls=[call(1) for _ in range(3)])
         self.assertEqual(4, len(env._frame_buffer))  # 3 + 1 from the rest call, not 5
+
+    def _run_atari_fixture(self, env: gym.Env, n_steps: int = 5, **kwargs):
+        sut = self._sut(env, **kwargs)
+        obss, rewards, dones = [sut.reset().copy()], [], []
+        for _ in range(n_steps):
+            obs, reward, done, _ = sut.step(1)
+            obss.append(obs.copy())
+            rewards.append(reward)
+            dones.append(done)
+            if done:
+                break
+
+        return sut, obss, rewards, dones
+
+    def test_ale_path_matches_stepping_env_and_fetches_fewer_screens(self):
+        for frame_buffer_length in [2, 3]:
+            # Arrange
+            env = TimeLimit(AtariEnvFixture(), max_episode_steps=1000)
+            # Any other wrapper disables the ALE path
+            env_no_ale = gym.Wrapper(TimeLimit(AtariEnvFixture(), max_episode_steps=1000))
+
+            # Act
+            sut, obss, rewards, dones = self._run_atari_fixture(env, frame_buffer_length=frame_buffer_length,
+                                                                reuse_obs=True)
+            sut_no_ale, obss_no_ale, rewards_no_ale, dones_no_ale = self._run_atari_fixture(
+                env_no_ale, frame_buffer_length=frame_buffer_length)
+
+            # Assert
+            self.assertIsNotNone(sut._ale)
+            self.assertIsNone(sut_no_ale._ale)
+            for obs, obs_no_ale in zip(obss, obss_no_ale):
+                np.testing.assert_array_equal(obs_no_ale, obs)
+            self.assertEqual(rewards_no_ale, rewards)
+            self.assertEqual(dones_no_ale, dones)
+            self.assertEqual(1 + 5 * frame_buffer_length, env.unwrapped.ale.n_screens)
+            self.assertEqual(1 + 5 * 4, env_no_ale.unwrapped.ale.n_screens)
+            self.assertEqual(20, env._elapsed_steps)
+
+    def test_ale_path_stops_on_game_over(self):
+        # Arrange
+        env = AtariEnvFixture(game_over_at=6)
+
+        # Act
+        _, obss, rewards, dones = self._run_atari_fixture(env)
+
+        # Assert
+        self.assertEqual([False, True], dones)
+        self.assertEqual([12.0, 6.0], rewards)
+        self.assertEqual(6, env.ale.frame)
+        self.assertEqual(255 - 6, obss[-1][6, 0, 0])
+
+    def test_ale_path_applies_time_limit(self):
+        # Arrange
+        env = TimeLimit(AtariEnvFixture(), max_episode_steps=8)
+
+        # Act
+        _, _, _, dones = self._run_atari_fixture(env)
+
+        # Assert
+        self.assertEqual([False, True], dones)
+
+    def test_reuse_obs_returns_same_array(self):
+        # Arrange
+        env = self._sut(self._env, reuse_obs=True)
+        env.reset()
+
+        # Act
+        obs_1, _, _, _ = env.step(0)
+        obs_2, _, _, _ = env.step(0)
+
+        # Assert
+        self.assertIs(obs_1, obs_2)
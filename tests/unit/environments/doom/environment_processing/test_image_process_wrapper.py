@@ -1,4 +1,8 @@
+import sys
 import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
 
 from rlk.environments.doom.environment_processing.image_process_wrapper import \
     ImageProcessWrapper
@@ -33,3 +37,81 @@ class TestImageProcessWrapper(unittest.TestCase):
         # Assert
         self.assertEqual((128, 90), obs.shape)
         self.assertLess(obs[0, 0], 1)
+
+    def test_fast_processing_output_within_tolerance_of_default(self):
+        # Arrange
+        frame = np.random.RandomState(0).randint(0, 256, size=(3, 320, 225)).astype(np.uint8)
+        # Channels last, but not contiguous, as returned by vizdoomgym
+        frame = np.transpose(frame, (1, 2, 0))
+        env = self._sut(self._env)
+        env_fast = self._sut(self._env, fast=True)
+
+        # Act
+        obs = env.process(frame)
+        obs_fast = env_fast.process(frame)
+
+        # Assert
+        self.assertEqual((128, 90), obs_fast.shape)
+        self.assertEqual(np.float32, obs_fast.dtype)
+        np.testing.assert_allclose(obs, obs_fast, atol=1 / 255)
+
+    def test_fast_processing_returns_new_array_each_frame(self):
+        # Arrange
+        env = self._sut(self._env, fast=True)
+        frame = np.full((320, 225, 3), fill_value=100, dtype=np.uint8)
+
+        # Act
+        obs_1 = env.process(frame)
+        obs_2 = env.process(frame * 2)
+
+        # Assert
+        self.assertFalse(np.shares_memory(obs_1, obs_2))
+        self.assertFalse(np.allclose(obs_1, obs_2))
+
+    def test_uint8_output_dtype(self):
+        # Arrange
+        frame = np.random.RandomState(0).randint(0, 256, size=(320, 225, 3)).astype(np.uint8)
+        env = self._sut(self._env, dtype=np.uint8)
+        env_fast = self._sut(self._env, dtype=np.uint8, fast=True)
+
+        # Act
+        obs = env.process(frame)
+        obs_fast = env_fast.process(frame)
+
+        # Assert
+        self.assertEqual(np.uint8, obs.dtype)
+        self.assertEqual(np.uint8, obs_fast.dtype)
+        self.assertEqual(255, env_fast.observation_space.high.max())
+        self.assertLessEqual(np.abs(obs.astype(int) - obs_fast.astype(int)).max(), 1)
+
+    def test_resize_skipped_when_frames_are_target_shape(self):
+        # Arrange
+        frame = np.random.RandomState(0).randint(0, 256, size=(320, 225, 3)).astype(np.uint8)
+        env = self._sut(self._env, fast=True, target_shape=(320, 225))
+
+        # Act
+        with patch('rlk.environments.doom.environment_processing.image_process_wrapper.cv2.resize') as mock_resize:
+            obs = env.process(frame)
+
+        # Assert
+        mock_resize.assert_not_called()
+        self.assertEqual((320, 225), obs.shape)
+        np.testing.assert_allclose(frame.mean(axis=2) / 255, obs, atol=1e-6)
+
+    def test_screen_resolution_restarts_game_at_resolution(self):
+        # Arrange
+        self._env.unwrapped = self._env
+        self._env.game = MagicMock()
+        self._env.game.get_screen_height.return_value = 120
+        self._env.game.get_screen_width.return_value = 160
+        mock_vizdoom = MagicMock()
+
+        # Act
+        with patch.dict(sys.modules, {'vizdoom': mock_vizdoom}):
+            env = self._sut(self._env, screen_resolution='RES_160X120', target_shape=(96, 128))
+
+        # Assert
+        self._env.game.set_screen_resolution.assert_called_once_with(mock_vizdoom.ScreenResolution.RES_160X120)
+        self._env.game.init.assert_called_once()
+        self.assertEqual((120, 160, 3), self._env.observation_space.shape)
+        self.assertEqual((96, 128), env.observation_space.shape)
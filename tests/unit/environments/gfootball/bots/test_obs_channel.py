@@ -0,0 +1,112 @@
+import os
+import unittest
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from rlk.environments.gfootball.bots.obs_channel import ObsChannel
+
+
+class TestObsChannel(unittest.TestCase):
+    def setUp(self):
+        self._name = f"rlk_test_obs_{os.getpid()}"
+
+    def tearDown(self):
+        ObsChannel._channels.pop(self._name, None)
+
+    def test_get_returns_none_when_empty(self):
+        # Arrange
+        sut = ObsChannel.get_channel(self._name)
+
+        # Act
+        obs = sut.get()
+
+        # Assert
+        self.assertIsNone(obs)
+
+    def test_get_channel_returns_same_channel_by_name(self):
+        # Act
+        channel_1 = ObsChannel.get_channel(self._name)
+        channel_2 = ObsChannel.get_channel(self._name)
+
+        # Assert
+        self.assertIs(channel_1, channel_2)
+
+    def test_in_process_put_and_get_passes_same_object(self):
+        # Arrange
+        sut = ObsChannel.get_channel(self._name)
+        obs = {'players_raw': [{'ball': np.array([0.1, 0.2, 0.0])}]}
+
+        # Act
+        sut.put(obs)
+
+        # Assert
+        self.assertIs(obs, ObsChannel.get_channel(self._name).get())
+
+    def test_shared_put_and_get_round_trip_between_instances(self):
+        # Arrange
+        writer = ObsChannel(name=self._name, shared=True, size=2 ** 12)
+        reader = ObsChannel(name=self._name, shared=True, size=2 ** 12)
+        obs = {'players_raw': [{'ball': np.array([0.1, 0.2, 0.0]), 'steps_left': 100}]}
+
+        try:
+            # Act
+            empty = reader.get()
+            writer.put(obs)
+            received = reader.get()
+            writer.put({'players_raw': [{'steps_left': 99}]})
+            received_2 = reader.get()
+        finally:
+            reader.close()
+            writer.close()
+
+        # Assert
+        self.assertIsNone(empty)
+        np.testing.assert_array_equal(obs['players_raw'][0]['ball'], received['players_raw'][0]['ball'])
+        self.assertEqual(100, received['players_raw'][0]['steps_left'])
+        self.assertEqual(99, received_2['players_raw'][0]['steps_left'])
+
+    def test_shared_put_raises_if_obs_too_large(self):
+        # Arrange
+        sut = ObsChannel(name=self._name, shared=True, size=64)
+
+        try:
+            # Act/Assert
+            with self.assertRaises(ValueError):
+                sut.put(np.zeros(100))
+        finally:
+            sut.close()
+
+    def test_shared_get_raises_if_put_never_finishes(self):
+        # Arrange
+        sut = ObsChannel(name=self._name, shared=True, size=2 ** 12)
+        sut._max_read_attempts = 3
+        # Odd sequence number, as left by a writer that stopped during a put
+        sut._header.pack_into(sut._shm.buf, 0, 1, 0)
+
+        try:
+            # Act/Assert
+            with self.assertRaises(TimeoutError):
+                sut.get()
+        finally:
+            sut.close()
+
+    def test_only_creating_channel_frees_shared_block(self):
+        # Arrange
+        owner = ObsChannel(name=self._name, shared=True, size=2 ** 12)
+        attached = ObsChannel(name=self._name, shared=True, size=2 ** 12)
+        owner.put({'steps_left': 100})
+
+        try:
+            # Act
+            attached.close()
+            reattached = ObsChannel(name=self._name, shared=True, size=2 ** 12)
+            received = reattached.get()
+            reattached.close()
+        finally:
+            owner.close()
+
+        # Assert
+        self.assertEqual({'steps_left': 100}, received)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=self._name)
@@ -0,0 +1,111 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from rlk.environments.remote import protocol
+from rlk.environments.remote.env_server import ThreadingHTTPServer
+
+
+class RemoteServerFixture:
+    """
+    Local stand in for the GFootball env server, serving the original JSON (GET) API, and, with protocol_version=2,
+    the binary (POST) API.
+
+    Envs return (SMM, s115) observations with values from the step number. Use as a context manager.
+    """
+
+    def __init__(self, protocol_version: int = protocol.PROTOCOL_VERSION, done_at: int = 5) -> None:
+        self.protocol_version = protocol_version
+        self.done_at = done_at
+        self.n_connections = 0
+        self.requests: List[Tuple[str, str]] = []
+        self.envs: Dict[int, Dict[str, Any]] = {}
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                                        daemon=True)
+
+    def __enter__(self) -> "RemoteServerFixture":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    @staticmethod
+    def obs(step: int) -> Tuple[np.ndarray, np.ndarray]:
+        smm = np.zeros((1, 72, 96, 4), dtype=np.uint8)
+        smm[0, step % 72, step % 96, :] = 255
+        return smm, np.full(115, fill_value=step / 10, dtype=np.float32)
+
+    def _handle(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if path == '/create':
+            env_id = len(self.envs)
+            self.envs[env_id] = {'step': 0, 'compress': bool(int(params.get('compress', 0)))}
+            resp = {'id': env_id}
+            if self.protocol_version >= 2:
+                resp['protocol_version'] = min(self.protocol_version, int(params.get('protocol_version', 1)))
+            return resp
+
+        env = self.envs[int(params['env_id'])]
+        if path == '/reset':
+            env['step'] = 0
+            return {'obs': self.obs(0)}
+        if path == '/step':
+            env['step'] += 1
+            return {'obs': self.obs(env['step']), 'reward': float(params['action']), 'done': env['step'] >= self.done_at,
+                    'info': {'step': env['step']}}
+        if path == '/kill':
+            return {'closed': True}
+
+        raise KeyError(path)
+
+    def _make_handler(self) -> type:
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections alive
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                fixture.n_connections += 1
+                super().setup()
+
+            def _send(self, body: bytes, content_type: str) -> None:
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                fixture.requests.append(('GET', url.path))
+                resp = fixture._handle(url.path, {k: v[0] for k, v in parse_qs(url.query).items()})
+                if 'obs' in resp:
+                    # Original API returns obs as a JSON string of nested lists
+                    resp['obs'] = json.dumps([o.tolist() for o in resp['obs']])
+                self._send(json.dumps(resp).encode('utf-8'), 'application/json')
+
+            def do_POST(self) -> None:
+                fixture.requests.append(('POST', self.path))
+                if fixture.protocol_version < 2:
+                    self.send_error(405)
+                    return
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                params = protocol.decode(body)
+                resp = fixture._handle(self.path, params)
+                compress = fixture.envs[int(params['env_id'])]['compress']
+                self._send(protocol.encode(resp, compress=compress), protocol.CONTENT_TYPE)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+
+from rlk.environments.gfootball.environment_processing.gf_remote_wrapper import GFRemoteWrapper
+from tests.unit.environments.gfootball.environment_processing.fixtures.remote_server_fixture import \
+    RemoteServerFixture
+
+
+class TestGFRemoteWrapper(unittest.TestCase):
+    _sut = GFRemoteWrapper
+    _env_name = "GFootball-academy_empty_goal_close-v0"
+
+    def _run_episode(self, env: GFRemoteWrapper):
+        obs = env.reset()
+        self.assertIsInstance(obs, list)
+        for expected, o in zip(RemoteServerFixture.obs(0), obs):
+            np.testing.assert_array_equal(expected, o)
+
+        obs, reward, done, info = env.step(2)
+        smm, s115 = obs
+        self.assertEqual((1, 72, 96, 4), smm.shape)
+        self.assertEqual(255, smm[0, 1, 1, 0])
+        np.testing.assert_allclose(np.full(115, fill_value=0.1), s115, rtol=1e-6)
+        self.assertEqual(2.0, reward)
+        self.assertFalse(done)
+        self.assertEqual({'step': 1}, info)
+
+        return smm, s115
+
+    def test_negotiates_binary_protocol_with_server_supporting_it(self):
+        with RemoteServerFixture(protocol_version=2) as server:
+            # Arrange
+            env = self._sut(self._env_name, ip='127.0.0.1', port=server.port)
+
+            # Act
+            smm, s115 = self._run_episode(env)
+            env.close()
+
+            # Assert
+            self.assertEqual(2, env.protocol_version)
+            self.assertEqual(np.uint8, smm.dtype)
+            self.assertEqual(np.float32, s115.dtype)
+            self.assertListEqual([('GET', '/create'), ('POST', '/reset'), ('POST', '/step'), ('POST', '/kill')],
+                                 server.requests)
+
+    def test_uses_json_protocol_with_original_server(self):
+        with RemoteServerFixture(protocol_version=1) as server:
+            # Arrange
+            env = self._sut(self._env_name, ip='127.0.0.1', port=server.port)
+
+            # Act
+            self._run_episode(env)
+
+            # Assert
+            self.assertEqual(1, env.protocol_version)
+            self.assertTrue(all(method == 'GET' for method, _ in server.requests))
+
+    def test_uses_json_protocol_if_requested(self):
+        with RemoteServerFixture(protocol_version=2) as server:
+            # Arrange
+            env = self._sut(self._env_name, ip='127.0.0.1', port=server.port, protocol_version=1)
+
+            # Act
+            self._run_episode(env)
+
+            # Assert
+            self.assertEqual(1, env.protocol_version)
+            self.assertTrue(all(method == 'GET' for method, _ in server.requests))
+
+    def test_compressed_observations(self):
+        with RemoteServerFixture(protocol_version=2) as server:
+            # Arrange
+            env = self._sut(self._env_name, ip='127.0.0.1', port=server.port, compress=True)
+
+            # Act
+            self._run_episode(env)
+
+            # Assert
+            self.assertTrue(server.envs[0]['compress'])
+
+    def test_connection_is_reused_across_steps(self):
+        with RemoteServerFixture(protocol_version=2, done_at=50) as server:
+            # Arrange
+            env = self._sut(self._env_name, ip='127.0.0.1', port=server.port)
+
+            # Act
+            env.reset()
+            for _ in range(20):
+                env.step(0)
+
+            # Assert
+            self.assertEqual(22, len(server.requests))
+            self.assertEqual(1, server.n_connections)
@@ -1,5 +1,8 @@
+import copy
 import unittest
 
+import numpy as np
+
 from tests.unit.environments.gfootball.environment_processing.fixtures.raw_obs_fixture import RawObsFixture
 
 try:
@@ -54,11 +57,15 @@ class TestRawObs(unittest.TestCase):
         # Assert
         self.assertEqual(self.sut.shape, raw_obs.shape)
 
-    def test__add_distance_to_ball(self):
+    def test_process_custom_feature_key(self):
         # Act
-        distance_to_ball = self.sut._add_distance_to_ball()
+        distance_to_ball = self.sut.process_key('distance_to_ball')
 
+        # Assert
         self.assertEqual((1, self.sut.distance_to_ball_n), distance_to_ball.shape)
+        np.testing.assert_array_equal(
+            RawObs(using=[], using_custom=['distance_to_ball']).set_obs(self._raw_obs_fixture.data).process(),
+            distance_to_ball)
 
     def test_with_obs_indexed_out_of_list(self):
         # Arrange
@@ -86,3 +93,56 @@ class TestRawObs(unittest.TestCase):
         self.assertEqual((1, 0), ro.shape)
         self.assertIsNone(raw_obs)
 
+
+    def test_process_writes_to_given_output(self):
+        # Arrange
+        out = np.zeros(self.sut.shape[1] + 2, dtype=np.float32)
+
+        # Act
+        raw_obs = self.sut.process(out=out[1:-1])
+
+        # Assert
+        self.assertEqual(np.float32, raw_obs.dtype)
+        self.assertTrue(np.shares_memory(out, raw_obs))
+        np.testing.assert_array_equal(np.concatenate([self.sut.process_key(k) for k in self.sut.using], axis=1)[0],
+                                      out[1:-1])
+        self.assertEqual(0, out[0])
+        self.assertEqual(0, out[-1])
+
+    def test_distance_to_ball_custom_feature(self):
+        # Arrange
+        ro = RawObs(using=['ball'], using_custom=['distance_to_ball']).set_obs(self._raw_obs_fixture.data)
+        data = self._raw_obs_fixture.data[0]
+        players = np.array(data['left_team'] + data['right_team'])
+        expected = np.sqrt((players[:, 0] - data['ball'][0]) ** 2 + (players[:, 1] - data['ball'][1]) ** 2)
+
+        # Act
+        raw_obs = ro.process()
+
+        # Assert
+        self.assertEqual(ro.shape, raw_obs.shape)
+        np.testing.assert_allclose(expected, raw_obs[0, RawObs.ball_n:], rtol=1e-6)
+
+    def test_process_batch_matches_process(self):
+        # Arrange
+        ro = RawObs(using=RawObs.standard_keys, using_custom=['distance_to_ball'])
+        obs = [self._raw_obs_fixture.data, copy.deepcopy(self._raw_obs_fixture.data[0])]
+        obs[1]['ball'][0] = 0.5
+
+        # Act
+        batch = ro.process_batch(obs)
+
+        # Assert
+        self.assertEqual((2, ro.shape[1]), batch.shape)
+        for obs_i, single_obs in enumerate(obs):
+            np.testing.assert_allclose(ro.set_obs(single_obs).process()[0], batch[obs_i], rtol=1e-6)
+
+    def test_get_returns_cached_instance(self):
+        # Act
+        ro_1 = RawObs.get(using=['ball', 'score'])
+        ro_2 = RawObs.get(using=['ball', 'score'])
+        ro_3 = RawObs.get(using=['ball'])
+
+        # Assert
+        self.assertIs(ro_1, ro_2)
+        self.assertIsNot(ro_1, ro_3)
@@ -0,0 +1,97 @@
+import copy
+import unittest
+
+import numpy as np
+
+from rlk.environments.gfootball.environment_processing.simple115_obs import Simple115Obs
+from tests.unit.environments.gfootball.environment_processing.fixtures.raw_obs_fixture import RawObsFixture
+
+try:
+    from gfootball.env.wrappers import Simple115StateWrapper
+
+    GFOOTBALL_AVAILABLE = True
+except ImportError:
+    GFOOTBALL_AVAILABLE = False
+
+
+def reference_s115(observation, fixed_positions):
+    """One observation at a time, as in gfootball's Simple115StateWrapper."""
+    final_obs = []
+    for obs in observation:
+        o = []
+        for i, name in enumerate(['left_team', 'left_team_direction', 'right_team', 'right_team_direction']):
+            o.extend(np.array(obs[name]).flatten())
+            if fixed_positions and len(o) < (i + 1) * 22:
+                o.extend([-1] * ((i + 1) * 22 - len(o)))
+        if len(o) < 88:
+            o.extend([-1] * (88 - len(o)))
+        o.extend(obs['ball'])
+        o.extend(obs['ball_direction'])
+        o.extend([[1, 0, 0], [0, 1, 0], [0, 0, 1]][obs['ball_owned_team'] + 1])
+        active = [0] * 11
+        if obs['active'] != -1:
+            active[obs['active']] = 1
+        o.extend(active)
+        game_mode = [0] * 7
+        game_mode[obs['game_mode']] = 1
+        o.extend(game_mode)
+        final_obs.append(o)
+
+    return np.array(final_obs, dtype=np.float32)
+
+
+class TestSimple115Obs(unittest.TestCase):
+    _raw_obs_fixture = RawObsFixture()
+    _sut = Simple115Obs
+
+    def setUp(self):
+        obs = self._raw_obs_fixture.data[0]
+        self._observations = []
+        for i, (owned_team, active, game_mode) in enumerate([(-1, 1, 0), (0, -1, 3), (1, 10, 6)]):
+            o = copy.deepcopy(obs)
+            o.update({'ball_owned_team': owned_team, 'active': active, 'game_mode': game_mode})
+            o['ball'][0] = i / 10
+            o['left_team'][2][1] = -i / 10
+            self._observations.append(o)
+
+    def test_convert_observation_matches_reference(self):
+        for fixed_positions in [False, True]:
+            # Act
+            s115 = self._sut.convert_observation(self._raw_obs_fixture.data, fixed_positions=fixed_positions)
+
+            # Assert
+            self.assertEqual((1, 115), s115.shape)
+            self.assertEqual(np.float32, s115.dtype)
+            np.testing.assert_array_equal(reference_s115(self._raw_obs_fixture.data, fixed_positions), s115)
+
+    def test_convert_observations_batch_matches_reference(self):
+        # Act
+        s115 = self._sut.convert_observations(self._observations)
+
+        # Assert
+        self.assertEqual((3, 115), s115.shape)
+        np.testing.assert_array_equal(reference_s115(self._observations, fixed_positions=False), s115)
+
+    def test_convert_observations_with_smaller_teams_matches_reference(self):
+        # Arrange
+        observations = copy.deepcopy(self._observations)
+        for key in ['left_team', 'left_team_direction', 'right_team', 'right_team_direction']:
+            observations[1][key] = observations[1][key][0:3]
+            observations[2][key] = observations[2][key][0:5]
+
+        for fixed_positions in [False, True]:
+            # Act
+            s115 = self._sut.convert_observations(observations, fixed_positions=fixed_positions)
+
+            # Assert
+            np.testing.assert_array_equal(reference_s115(observations, fixed_positions=fixed_positions), s115)
+
+    def test_convert_no_observations(self):
+        self.assertEqual((0, 115), self._sut.convert_observations([]).shape)
+
+    @unittest.skipUnless(GFOOTBALL_AVAILABLE, "GFootball not available in this env.")
+    def test_matches_gfootball(self):
+        for fixed_positions in [False, True]:
+            np.testing.assert_array_equal(
+                Simple115StateWrapper.convert_observation(self._observations, fixed_positions=fixed_positions),
+                self._sut.convert_observation(self._observations, fixed_positions=fixed_positions))
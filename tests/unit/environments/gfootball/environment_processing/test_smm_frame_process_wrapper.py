@@ -0,0 +1,81 @@
+import unittest
+
+import numpy as np
+
+from rlk.environments.gfootball.environment_processing.smm_frame_process_wrapper import SMMFrameProcessWrapper
+from tests.unit.environments.atari.pong.environment_processing.env_fixture import EnvFixture
+
+
+class TestSMMFrameProcessWrapper(unittest.TestCase):
+    _sut = SMMFrameProcessWrapper
+
+    def setUp(self):
+        self._obs_shape = (72, 96, 4)
+        self._frames = [np.random.RandomState(i).randint(0, 256, size=self._obs_shape).astype(np.uint8)
+                        for i in range(3)]
+
+    def test_output_is_normalised_float32_diff_of_last_two_frames(self):
+        # Arrange
+        buffer = self._sut(obs_shape=self._obs_shape)
+
+        # Act
+        obs = [buffer.process(frame) for frame in self._frames]
+
+        # Assert
+        self.assertEqual(np.float32, obs[-1].dtype)
+        np.testing.assert_allclose(self._frames[0] / 255.0, obs[0], atol=1e-6)
+        np.testing.assert_allclose((self._frames[2].astype(float) - self._frames[1]) / 255.0, obs[2], atol=1e-6)
+
+    def test_int16_output_is_unnormalised_diff(self):
+        # Arrange
+        buffer = self._sut(obs_shape=self._obs_shape, dtype=np.int16)
+
+        # Act
+        obs = [buffer.process(frame) for frame in self._frames]
+
+        # Assert
+        self.assertEqual(np.int16, obs[-1].dtype)
+        np.testing.assert_array_equal(self._frames[2].astype(np.int16) - self._frames[1], obs[2])
+
+    def test_tuple_input_passes_other_obs_through(self):
+        # Arrange
+        buffer = self._sut(obs_shape=self._obs_shape)
+        other = np.arange(115)
+
+        # Act
+        obs = buffer.process((self._frames[0], other, 'more'))
+
+        # Assert
+        self.assertIsInstance(obs, tuple)
+        self.assertEqual(3, len(obs))
+        self.assertEqual(self._obs_shape, obs[0].shape)
+        self.assertIs(other, obs[1])
+        self.assertEqual('more', obs[2])
+
+    def test_returns_new_array_each_step_unless_reusing_output(self):
+        # Arrange
+        buffer = self._sut(obs_shape=self._obs_shape)
+        reusing_buffer = self._sut(obs_shape=self._obs_shape, reuse_output=True)
+
+        # Act
+        obs_1, obs_2 = buffer.process(self._frames[0]), buffer.process(self._frames[1])
+        reused_1, reused_2 = reusing_buffer.process(self._frames[0]), reusing_buffer.process(self._frames[1])
+
+        # Assert
+        self.assertFalse(np.shares_memory(obs_1, obs_2))
+        self.assertIs(reused_1, reused_2)
+        np.testing.assert_allclose(obs_2, reused_2)
+
+    def test_reset_clears_buffer(self):
+        # Arrange
+        env = EnvFixture(obs_shape=self._obs_shape)
+        env._obs = self._frames[0]
+        wrapper = self._sut(env, obs_shape=self._obs_shape)
+        wrapper.reset()
+        wrapper.step(0)
+
+        # Act
+        obs = wrapper.reset()
+
+        # Assert
+        np.testing.assert_allclose(self._frames[0] / 255.0, obs, atol=1e-6)
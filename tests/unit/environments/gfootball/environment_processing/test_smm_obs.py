@@ -0,0 +1,119 @@
+import copy
+import unittest
+
+import numpy as np
+
+from rlk.environments.gfootball.environment_processing.smm_obs import SMMObs
+from tests.unit.environments.gfootball.environment_processing.fixtures.raw_obs_fixture import RawObsFixture
+
+try:
+    from gfootball.env import observation_preprocessing
+
+    GFOOTBALL_AVAILABLE = True
+except ImportError:
+    GFOOTBALL_AVAILABLE = False
+
+
+def reference_smm(observation, channel_dimensions=(96, 72)):
+    """One point at a time, as in gfootball's observation_preprocessing.generate_smm."""
+    layers = ['left_team', 'right_team', 'ball', 'active']
+    frame = np.zeros((len(observation), channel_dimensions[1], channel_dimensions[0], len(layers)), dtype=np.uint8)
+
+    def mark_points(layer_frame, points):
+        for p in range(len(points) // 2):
+            x = int((points[p * 2] - -1.0) / (1.0 - -1.0) * layer_frame.shape[1])
+            y = int((points[p * 2 + 1] - -1.0 / 2.25) / (1.0 / 2.25 - -1.0 / 2.25) * layer_frame.shape[0])
+            x = max(0, min(layer_frame.shape[1] - 1, x))
+            y = max(0, min(layer_frame.shape[0] - 1, y))
+            layer_frame[y, x] = 255
+
+    for o_i, o in enumerate(observation):
+        for index, layer in enumerate(layers):
+            if layer == 'active':
+                if o['active'] == -1:
+                    continue
+                mark_points(frame[o_i, :, :, index], np.array(o['left_team'][o['active']]).reshape(-1))
+            else:
+                mark_points(frame[o_i, :, :, index], np.array(o[layer]).reshape(-1))
+
+    return frame
+
+
+class TestSMMObs(unittest.TestCase):
+    _raw_obs_fixture = RawObsFixture()
+    _sut = SMMObs
+
+    def setUp(self):
+        state = np.random.RandomState(0)
+        self._observations = []
+        for i, active in enumerate([-1, 0, 4, 10]):
+            o = copy.deepcopy(self._raw_obs_fixture.data[0])
+            o['active'] = active
+            # Include points off the pitch, which are clipped to the edges
+            o['left_team'] = (state.uniform(-1.2, 1.2, size=(11, 2)) * [1, 0.5]).tolist()
+            o['right_team'] = (state.uniform(-1.2, 1.2, size=(11, 2)) * [1, 0.5]).tolist()
+            o['ball'] = [i / 4 - 0.5, -i / 10, 0.1]
+            self._observations.append(o)
+
+    def test_generate_smm_matches_reference(self):
+        # Act
+        smm = self._sut.generate_smm(self._raw_obs_fixture.data)
+
+        # Assert
+        self.assertEqual((1, 72, 96, 4), smm.shape)
+        self.assertEqual(np.uint8, smm.dtype)
+        np.testing.assert_array_equal(reference_smm(self._raw_obs_fixture.data), smm)
+
+    def test_generate_smm_batch_matches_reference(self):
+        # Act
+        smm = self._sut.generate_smm(self._observations)
+
+        # Assert
+        self.assertEqual((4, 72, 96, 4), smm.shape)
+        np.testing.assert_array_equal(reference_smm(self._observations), smm)
+        self.assertEqual(0, smm[0, ..., 3].max())
+
+    def test_generate_smm_with_different_team_sizes_matches_reference(self):
+        # Arrange
+        observations = copy.deepcopy(self._observations)
+        observations[1]['left_team'] = observations[1]['left_team'][0:3]
+        observations[2]['right_team'] = observations[2]['right_team'][0:5]
+
+        # Act
+        smm = self._sut.generate_smm(observations, channel_dimensions=(48, 36))
+
+        # Assert
+        np.testing.assert_array_equal(reference_smm(observations, channel_dimensions=(48, 36)), smm)
+
+    def test_generate_smm_reuses_and_clears_given_output(self):
+        # Arrange
+        out = np.full((1, 72, 96, 4), fill_value=7, dtype=np.uint8)
+
+        # Act
+        smm = self._sut.generate_smm(self._observations[1], out=out)
+
+        # Assert
+        self.assertIs(out, smm)
+        np.testing.assert_array_equal(reference_smm(self._observations[1:2]), smm)
+
+    def test_generate_smm_raises_with_wrong_output_shape(self):
+        with self.assertRaises(ValueError):
+            self._sut.generate_smm(self._observations, out=np.zeros((1, 72, 96, 4), dtype=np.uint8))
+
+    def test_index_cache_is_capped_for_varying_batch_lengths(self):
+        # Arrange
+        self._sut._base_indexes.cache_clear()
+        observations = self._observations * 10
+
+        # Act
+        for n in range(1, len(observations) + 1):
+            smm = self._sut.generate_smm(observations[0:n])
+
+        # Assert
+        np.testing.assert_array_equal(reference_smm(observations), smm)
+        self.assertLess(self._sut._base_indexes.cache_info().currsize, len(observations))
+
+    @unittest.skipUnless(GFOOTBALL_AVAILABLE, "GFootball not available in this env.")
+    def test_matches_gfootball(self):
+        np.testing.assert_array_equal(observation_preprocessing.generate_smm(self._observations),
+                                      self._sut.generate_smm(self._observations))
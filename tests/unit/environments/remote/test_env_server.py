@@ -0,0 +1,134 @@
+import socket
+import unittest
+
+import gym
+import numpy as np
+
+from rlk.agents.components.helpers.env_builder import EnvBuilder
+from rlk.environments.cart_pole.environment_processing.clipepr_wrapper import ClipperWrapper
+from rlk.environments.remote.env_server import EnvServer, pickle_builder
+
+
+class TestEnvServer(unittest.TestCase):
+    _sut = EnvServer
+
+    def setUp(self):
+        self._server = self._sut(port=0, env_builders={'clipped': EnvBuilder('CartPole-v0',
+                                                                             env_wrappers=[ClipperWrapper])})
+
+    def tearDown(self):
+        self._server.shutdown()
+
+    def test_create_from_spec_and_step(self):
+        # Act
+        env_id = self._server.handle('/create', {'env_spec': 'CartPole-v0', 'protocol_version': 2})['env_id']
+        obs = self._server.handle('/reset', {'env_id': env_id})['obs']
+        resp = self._server.handle('/step', {'env_id': env_id, 'action': 1})
+
+        # Assert
+        self.assertEqual((4,), obs.shape)
+        self.assertEqual((4,), resp['obs'].shape)
+        self.assertEqual(1.0, resp['reward'])
+        self.assertFalse(resp['done'])
+
+    def test_create_from_named_builder_builds_new_env(self):
+        # Act
+        env_ids = [self._server.handle('/create', {'env_spec': 'clipped'})['env_id'] for _ in range(2)]
+        spaces = self._server.handle('/spaces', {'env_id': env_ids[0]})
+
+        # Assert
+        self.assertEqual(2, self._server.n_envs)
+        self.assertIsNot(self._server._envs[env_ids[0]].env, self._server._envs[env_ids[1]].env)
+        self.assertIsNot(self._server.env_builders['clipped'].env, self._server._envs[env_ids[0]].env)
+        self.assertEqual(1.0, spaces['observation_space']['high'][0])
+
+    def test_pickled_builder_only_accepted_with_allow_pickle(self):
+        # Arrange
+        message = {'env_spec': 'CartPole-v0', 'builder': pickle_builder(EnvBuilder('CartPole-v0',
+                                                                                   env_wrappers=[ClipperWrapper]))}
+
+        # Act
+        with self.assertRaises(PermissionError):
+            self._server.handle('/create', message)
+        self._server.allow_pickle = True
+        env_id = self._server.handle('/create', message)['env_id']
+        obs = self._server.handle('/reset', {'env_id': env_id})['obs']
+
+        # Assert
+        self.assertTrue(np.all(np.abs(obs) <= 1))
+
+    def test_reset_sets_max_episode_steps_on_time_limit_under_other_wrappers(self):
+        # Arrange
+        self._server.env_builders['wrapped'] = EnvBuilder('CartPole-v0', env_wrappers=[gym.Wrapper])
+        env_id = self._server.handle('/create', {'env_spec': 'wrapped'})['env_id']
+
+        # Act
+        self._server.handle('/reset', {'env_id': env_id, 'max_episode_steps': 1})
+        resp = self._server.handle('/step', {'env_id': env_id, 'action': 0})
+
+        # Assert
+        self.assertTrue(resp['done'])
+        self.assertNotIn('_max_episode_steps', vars(self._server._envs[env_id].env))
+
+    def test_reset_with_max_episode_steps_raises_without_time_limit(self):
+        # Arrange
+        self._server.env_builders['unlimited'] = EnvBuilder('CartPole-v0', env_wrappers=[lambda env: env.unwrapped])
+        env_id = self._server.handle('/create', {'env_spec': 'unlimited'})['env_id']
+
+        # Act/Assert
+        with self.assertRaises(ValueError):
+            self._server.handle('/reset', {'env_id': env_id, 'max_episode_steps': 1})
+        self._server.handle('/reset', {'env_id': env_id})
+
+    def test_close_removes_env(self):
+        # Arrange
+        env_id = self._server.handle('/create', {'env_spec': 'CartPole-v0'})['env_id']
+
+        # Act
+        self._server.handle('/close', {'env_id': env_id})
+
+        # Assert
+        self.assertEqual(0, self._server.n_envs)
+        with self.assertRaises(KeyError):
+            self._server.handle('/reset', {'env_id': env_id})
+
+    def test_step_batch_steps_all_envs_and_resets_done_envs(self):
+        # Arrange
+        env_ids = [self._server.handle('/create', {'env_spec': 'CartPole-v0'})['env_id'] for _ in range(3)]
+        self._server.handle('/reset_batch', {'env_ids': env_ids})
+        self._server._envs[env_ids[1]].env._max_episode_steps = 1
+
+        # Act
+        resp = self._server.handle('/step_batch', {'env_ids': env_ids, 'actions': [0, 1, 0]})
+
+        # Assert
+        self.assertEqual(3, len(resp['obs']))
+        np.testing.assert_array_equal([1.0, 1.0, 1.0], resp['rewards'])
+        np.testing.assert_array_equal([False, True, False], resp['dones'])
+        self.assertIn('terminal_observation', resp['infos'][1])
+        self.assertNotIn('terminal_observation', resp['infos'][0])
+
+    def test_step_batch_raises_for_wrong_number_of_actions(self):
+        # Arrange
+        env_ids = [self._server.handle('/create', {'env_spec': 'CartPole-v0'})['env_id'] for _ in range(2)]
+        self._server.handle('/reset_batch', {'env_ids': env_ids})
+
+        # Act/Assert
+        with self.assertRaises(ValueError):
+            self._server.handle('/step_batch', {'env_ids': env_ids, 'actions': [0]})
+
+    def test_create_with_unknown_builder_name_raises(self):
+        with self.assertRaises(KeyError):
+            self._server.handle('/create', {'env_spec': 'CartPole-v0', 'builder_name': 'unknown'})
+
+    def test_request_without_content_length_returns_error(self):
+        # Arrange
+        self._server.start()
+
+        # Act
+        with socket.create_connection((self._server.host, self._server.port), timeout=5) as sock:
+            sock.sendall(b"POST /create HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            resp = sock.recv(1024)
+
+        # Assert
+        self.assertTrue(resp.startswith(b"HTTP/1.1 500"))
@@ -0,0 +1,84 @@
+import unittest
+
+import gym
+import numpy as np
+
+from rlk.environments.remote import protocol
+
+
+class TestProtocol(unittest.TestCase):
+    def setUp(self):
+        self._message = {'obs': (np.arange(24, dtype=np.uint8).reshape(2, 3, 4), np.linspace(0, 1, 5)),
+                         'reward': np.float32(1.5), 'done': False, 'info': {'lives': 3, 'ids': [1, 2]},
+                         'scalar': np.array(7, dtype=np.int16)}
+
+    def _assert_message_equal(self, decoded):
+        self.assertIsInstance(decoded['obs'], tuple)
+        for expected, obs in zip(self._message['obs'], decoded['obs']):
+            self.assertEqual(expected.dtype, obs.dtype)
+            np.testing.assert_array_equal(expected, obs)
+        self.assertEqual(1.5, decoded['reward'])
+        self.assertFalse(decoded['done'])
+        self.assertEqual({'lives': 3, 'ids': [1, 2]}, decoded['info'])
+        self.assertEqual((), decoded['scalar'].shape)
+        self.assertEqual(7, decoded['scalar'])
+
+    def test_round_trip(self):
+        # Act
+        decoded = protocol.decode(protocol.encode(self._message))
+
+        # Assert
+        self._assert_message_equal(decoded)
+
+    def test_round_trip_compressed(self):
+        # Arrange
+        message = {'obs': np.zeros((72, 96, 4), dtype=np.uint8)}
+
+        # Act
+        encoded = protocol.encode(message, compress=True)
+        decoded = protocol.decode(encoded)
+
+        # Assert
+        self.assertLess(len(encoded), 1000)
+        np.testing.assert_array_equal(message['obs'], decoded['obs'])
+        self._assert_message_equal(protocol.decode(protocol.encode(self._message, compress=True)))
+
+    def test_decoded_arrays_are_writable(self):
+        # Act
+        decoded = protocol.decode(protocol.encode(self._message))
+        decoded['obs'][0][0, 0, 0] = 100
+
+        # Assert
+        self.assertEqual(100, decoded['obs'][0][0, 0, 0])
+
+    def test_non_contiguous_arrays(self):
+        # Arrange
+        arr = np.arange(24).reshape(4, 6)[:, ::2]
+
+        # Act
+        decoded = protocol.decode(protocol.encode({'obs': arr}))
+
+        # Assert
+        np.testing.assert_array_equal(arr, decoded['obs'])
+
+    def test_decode_raises_for_unknown_data(self):
+        with self.assertRaises(ValueError):
+            protocol.decode(b'{"obs": [1, 2, 3]}')
+
+    def test_space_descriptions_round_trip_through_messages(self):
+        # Arrange
+        spaces = [gym.spaces.Box(low=-np.arange(6.0).reshape(2, 3), high=np.arange(1.0, 7.0).reshape(2, 3),
+                                 dtype=np.float32),
+                  gym.spaces.Box(low=0, high=255, shape=(4, 4), dtype=np.uint8),
+                  gym.spaces.Discrete(5), gym.spaces.MultiBinary(3), gym.spaces.MultiDiscrete([2, 3]),
+                  gym.spaces.Tuple((gym.spaces.Discrete(2), gym.spaces.Box(low=0, high=1, shape=(2,),
+                                                                           dtype=np.float32))),
+                  gym.spaces.Dict({'a': gym.spaces.Discrete(3)})]
+
+        for space in spaces:
+            # Act
+            decoded = protocol.decode(protocol.encode({'space': protocol.space_to_description(space)}))
+            space_from_description = protocol.space_from_description(decoded['space'])
+
+            # Assert
+            self.assertEqual(space, space_from_description)
@@ -0,0 +1,116 @@
+import unittest
+from functools import partial
+
+import gym
+import numpy as np
+from gym.wrappers import TimeLimit
+
+from rlk.agents.components.helpers.env_builder import EnvBuilder
+from rlk.environments.cart_pole.environment_processing.clipepr_wrapper import ClipperWrapper
+from rlk.environments.remote.env_server import EnvServer
+from rlk.environments.remote.remote_env import RemoteEnv
+
+
+class TestRemoteEnv(unittest.TestCase):
+    _sut = RemoteEnv
+
+    def setUp(self):
+        self._server = EnvServer(port=0, allow_pickle=True).start()
+
+    def tearDown(self):
+        self._server.shutdown()
+
+    def test_remote_env_matches_local_env(self):
+        # Arrange
+        local_env = gym.make('CartPole-v0')
+        local_env.seed(0)
+        env = self._sut('CartPole-v0', port=self._server.port)
+        self._server._envs[env._remote_env_id].env.seed(0)
+
+        # Act
+        local_obs, obs = local_env.reset(), env.reset()
+        local_step, step = local_env.step(0), env.step(np.int64(0))
+
+        # Assert
+        self.assertIsInstance(env, gym.Env)
+        self.assertEqual(local_env.observation_space, env.observation_space)
+        self.assertEqual(local_env.action_space, env.action_space)
+        np.testing.assert_array_equal(local_obs, obs)
+        np.testing.assert_array_equal(local_step[0], step[0])
+        self.assertEqual(local_step[1:3], step[1:3])
+        env.close()
+
+    def test_wrappers_are_applied_on_server(self):
+        # Act
+        env = self._sut('CartPole-v0', env_wrappers=[ClipperWrapper], port=self._server.port, send_pickle=True)
+        obs = env.reset()
+
+        # Assert
+        self.assertEqual(1, env.observation_space.high[0])
+        self.assertEqual((1, 4), obs.shape)
+        env.close()
+
+    def test_wrappers_use_named_builder_by_default(self):
+        # Arrange
+        env_wrappers = [partial(TimeLimit, max_episode_steps=2)]
+        server = EnvServer(port=0, env_builders={'CartPole-v0': EnvBuilder('CartPole-v0', env_wrappers=env_wrappers),
+                                                 'CartPole-short': EnvBuilder('CartPole-v0',
+                                                                              env_wrappers=env_wrappers)}).start()
+
+        try:
+            # Act
+            envs = [self._sut('CartPole-v0', env_wrappers=env_wrappers, port=server.port),
+                    EnvBuilder('CartPole-v0', env_wrappers=env_wrappers, remote=True, port=server.port,
+                               remote_name='CartPole-short').env]
+            dones = []
+            for env in envs:
+                env.reset()
+                dones.append([env.step(0)[2] for _ in range(2)])
+                env.close()
+        finally:
+            server.shutdown()
+
+        # Assert
+        self.assertEqual([[False, True], [False, True]], dones)
+
+    def test_wrappers_without_named_builder_raise_rather_than_being_dropped(self):
+        with self.assertRaisesRegex(RuntimeError, "404"):
+            self._sut('CartPole-v0', env_wrappers=[partial(TimeLimit, max_episode_steps=2)], port=self._server.port)
+
+    def test_max_episode_steps_is_set_on_server(self):
+        # Arrange
+        env = self._sut('CartPole-v0', port=self._server.port)
+        env._max_episode_steps = 2
+
+        # Act
+        env.reset()
+        dones = [env.step(0)[2] for _ in range(2)]
+
+        # Assert
+        self.assertEqual([False, True], dones)
+        env.close()
+
+    def test_close_removes_env_from_server(self):
+        # Arrange
+        envs = [self._sut('CartPole-v0', port=self._server.port) for _ in range(2)]
+
+        # Act
+        envs[0].close()
+
+        # Assert
+        self.assertEqual(1, self._server.n_envs)
+        envs[1].close()
+
+    def test_server_errors_are_raised(self):
+        with self.assertRaises(RuntimeError):
+            self._sut('NotAnEnv-v0', port=self._server.port)
+
+    def test_env_builder_builds_remote_env(self):
+        # Act
+        env_builder = EnvBuilder('CartPole-v0', env_wrappers=[ClipperWrapper], remote=True, port=self._server.port,
+                                 remote_pickle=True)
+
+        # Assert
+        self.assertIsInstance(env_builder.env, RemoteEnv)
+        self.assertEqual((1, 4), env_builder.env.reset().shape)
+        env_builder.close()
@@ -0,0 +1,116 @@
+import unittest
+
+import gym
+import numpy as np
+
+from rlk.environments.remote.env_server import EnvServer
+from rlk.environments.remote.remote_vector_env import RemoteVectorEnv
+
+
+class TestRemoteVectorEnv(unittest.TestCase):
+    _sut = RemoteVectorEnv
+
+    def setUp(self):
+        self._server = EnvServer(port=0).start()
+
+    def tearDown(self):
+        self._server.shutdown()
+
+    def test_reset_and_step_return_batches(self):
+        # Arrange
+        env = self._sut('CartPole-v0', num_envs=4, port=self._server.port)
+
+        # Act
+        obs = env.reset()
+        next_obs, rewards, dones, infos = env.step(np.array([0, 1, 0, 1]))
+
+        # Assert
+        self.assertIsInstance(env, gym.vector.VectorEnv)
+        self.assertEqual(gym.spaces.Discrete(2), env.single_action_space)
+        self.assertEqual((4, 4), obs.shape)
+        self.assertEqual((4, 4), next_obs.shape)
+        np.testing.assert_array_equal(np.ones(4), rewards)
+        self.assertEqual((4,), dones.shape)
+        self.assertEqual(4, len(infos))
+        env.close()
+
+    def test_step_matches_local_envs(self):
+        # Arrange
+        env = self._sut('CartPole-v0', num_envs=2, port=self._server.port)
+        local_envs = [gym.make('CartPole-v0') for _ in range(2)]
+        for seed, (local_env, env_id) in enumerate(zip(local_envs, env._env_ids)):
+            local_env.seed(seed)
+            self._server._envs[env_id].env.seed(seed)
+
+        # Act
+        obs = env.reset()
+        next_obs, _, _, _ = env.step([1, 0])
+
+        # Assert (batched to the float32 observation space, as gym's vector envs)
+        local_obs = np.stack([local_env.reset() for local_env in local_envs])
+        local_next_obs = np.stack([local_env.step(a)[0] for local_env, a in zip(local_envs, [1, 0])])
+        np.testing.assert_array_equal(local_obs.astype(np.float32), obs)
+        np.testing.assert_array_equal(local_next_obs.astype(np.float32), next_obs)
+        env.close()
+
+    def test_steps_use_one_request_for_all_envs(self):
+        # Arrange
+        env = self._sut('CartPole-v0', num_envs=8, port=self._server.port)
+        env.reset()
+        calls = []
+        handle = self._server.handle
+        self._server.handle = lambda path, message: calls.append(path) or handle(path, message)
+
+        # Act
+        for _ in range(3):
+            env.step(np.zeros(8, dtype=int))
+
+        # Assert
+        self.assertEqual(['/step_batch'] * 3, calls)
+        env.close()
+
+    def test_done_envs_are_reset(self):
+        # Arrange
+        env = self._sut('CartPole-v0', num_envs=2, port=self._server.port)
+        env.reset()
+
+        # Act
+        dones = np.zeros(2, dtype=bool)
+        for _ in range(200):
+            _, _, step_dones, _ = env.step([0, 1])
+            dones |= step_dones
+            if np.all(dones):
+                break
+
+        # Assert
+        self.assertTrue(np.all(dones))
+        self.assertEqual(2, self._server.n_envs)
+        env.close()
+        self.assertEqual(0, self._server.n_envs)
+
+    def test_reset_sets_max_episode_steps_on_server_envs(self):
+        # Arrange
+        env = self._sut('CartPole-v0', num_envs=2, port=self._server.port)
+        env.set_max_episode_steps(2)
+
+        # Act
+        env.reset()
+        _, _, first_dones, _ = env.step([0, 1])
+        _, _, second_dones, _ = env.step([0, 1])
+
+        # Assert
+        self.assertFalse(np.any(first_dones))
+        self.assertTrue(np.all(second_dones))
+        env.close()
+
+    def test_reuse_obs_writes_into_same_array(self):
+        # Arrange
+        env = self._sut('CartPole-v0', num_envs=2, port=self._server.port, reuse_obs=True)
+
+        # Act
+        obs = env.reset()
+        next_obs = env.step([0, 0])[0]
+
+        # Assert
+        self.assertIs(obs, next_obs)
+        env.close()